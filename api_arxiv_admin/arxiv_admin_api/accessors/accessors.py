@@ -2,10 +2,14 @@
 # The number of classes here are a bit too many. Having a class for each file type is not a good
 # design. There is a room for redesign.
 
+import asyncio
+import base64
+import hashlib
 import os.path
 import shutil
 import typing
 import urllib.parse
+import uuid
 from abc import abstractmethod
 from pathlib import Path
 from typing import Any, BinaryIO, TextIO
@@ -13,7 +17,10 @@ from logging import getLogger
 
 # from typing_extensions import TypedDict
 from arxiv.identifier import Identifier as arXivID
+import google_crc32c
+from google.api_core.exceptions import NotFound
 from google.cloud import storage as cloud_storage
+from google.cloud.storage import transfer_manager
 from google.cloud.storage.fileio import BlobReader, BlobWriter
 
 from .path_mapper import (
@@ -31,6 +38,34 @@ def make_subpath(path_str: str) -> str:
     return path_str[1:] if path_str.startswith("/") else path_str
 
 
+class UploadDigest:
+    """MD5 and CRC32C of an upload, computed as the bytes pass through.
+
+    The base64 forms match what GCS reports on Blob.md5_hash and Blob.crc32c, so the upload
+    can be verified against the object metadata without reading the bytes again.
+    """
+
+    size: int
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._md5 = hashlib.md5()
+        self._crc32c = google_crc32c.Checksum()
+
+    def update(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._md5.update(chunk)
+        self._crc32c.update(chunk)
+
+    @property
+    def md5_base64(self) -> str:
+        return base64.b64encode(self._md5.digest()).decode("ascii")
+
+    @property
+    def crc32c_base64(self) -> str:
+        return base64.b64encode(self._crc32c.digest()).decode("ascii")
+
+
 # noinspection Pylint
 class ArxivIdentified:
     """Thing identified by arXiv ID."""
@@ -118,6 +153,11 @@ class BaseAccessor(AccessorFlavor):
         """Object byte size, if applicable."""
         return None
 
+    @property
+    async def generation(self) -> str | None:
+        """Token that changes whenever the content is replaced. None if the object does not exist."""
+        return None
+
     @property
     @abstractmethod
     def basename(self) -> str:
@@ -173,6 +213,47 @@ class GCPBlobAccessor(BaseAccessor):
         """Upload the file to the storage."""
         return self.blob.upload_from_file(fd)
 
+    async def upload_large_from_filename(self, filename: str, digest: UploadDigest,
+                                         part_size: int = 32 * 1024 * 1024, max_workers: int = 8) -> None:
+        """Upload a spooled file, in parallel parts when it is larger than part_size.
+
+        Small files go up in a single request. Large files use the XML multipart upload from the
+        transfer manager; the parts are composed by GCS, which keeps the CRC32C of the whole object
+        but not the MD5, so the CRC32C from the digest is what the result is checked against.
+
+        The file goes to a staging object next to the blob first, and is rewritten into place only
+        when its CRC32C matches. On a mismatch, ValueError is raised and the live object is untouched.
+        The staging object is deleted either way.
+        """
+        staging = self.bucket.blob(f"{self.blob_name}.upload-{uuid.uuid4().hex}")
+        try:
+            if digest.size <= part_size:
+                await asyncio.to_thread(staging.upload_from_filename, filename,
+                                        content_type=self.content_type, timeout=self.timeout, checksum="crc32c")
+            else:
+                logger.debug(f"upload_large_from_filename: {filename} to {staging.name} "
+                             f"in {part_size} byte parts, {max_workers} workers")
+                await asyncio.to_thread(transfer_manager.upload_chunks_concurrently, filename, staging,
+                                        content_type=self.content_type, chunk_size=part_size,
+                                        max_workers=max_workers, worker_type=transfer_manager.THREAD)
+            await asyncio.to_thread(staging.reload, client=self.gcp_storage.client)
+            if staging.crc32c != digest.crc32c_base64:
+                raise ValueError(f"CRC32C mismatch for {self.canonical_name}: "
+                                 f"uploaded {digest.crc32c_base64}, stored {staging.crc32c}")
+            # Large objects take more than one rewrite call
+            token = None
+            while True:
+                token, _rewritten, _total = await asyncio.to_thread(
+                    self.blob.rewrite, staging, token=token, client=self.gcp_storage.client, timeout=self.timeout)
+                if token is None:
+                    break
+        finally:
+            try:
+                await asyncio.to_thread(staging.delete, client=self.gcp_storage.client)
+            except NotFound:
+                pass
+            except Exception:
+                logger.warning(f"upload_large_from_filename: failed to delete {staging.name}", exc_info=True)
 
     @property
     def bucket(self) -> cloud_storage.Bucket:
@@ -203,6 +284,14 @@ class GCPBlobAccessor(BaseAccessor):
             return self.blob.size  # type: ignore
         return None
 
+    @property
+    async def generation(self) -> str | None:
+        try:
+            await asyncio.to_thread(self.blob.reload, client=self.gcp_storage.client)
+        except NotFound:
+            return None
+        return str(self.blob.generation)
+
 
 class LocalFileAccessor(BaseAccessor):
     """Local file accessor for a given arXiv ID. This is an abstract class."""
@@ -253,6 +342,14 @@ class LocalFileAccessor(BaseAccessor):
             return po.stat().st_size
         return None
 
+    @property
+    async def generation(self) -> str | None:
+        po = Path(self.local_path)
+        if po.exists():
+            stat = po.stat()
+            return f"{stat.st_mtime_ns}-{stat.st_size}"
+        return None
+
     @property
     def blob_name(self) -> str | None:
         return None
@@ -436,6 +533,13 @@ class LocalPathAccessor(BaseAccessor):
         """Object byte size, if applicable."""
         return self.path.stat().st_size
 
+    @property
+    async def generation(self) -> str | None:
+        if self.path.exists():
+            stat = self.path.stat()
+            return f"{stat.st_mtime_ns}-{stat.st_size}"
+        return None
+
     @property
     def basename(self) -> str:
         """Base name of the file."""
@@ -101,9 +101,17 @@ def blob_orig_root(yymm: str | None = None) -> str:
     return GCPORIGROOT
 
 
+def blob_ftp_root(yymm: str | None = None) -> str:
+    if yymm:
+        id = arXivID(f"{yymm}.00001")
+        return dirname(local_path_to_blob_key(arxiv_id_to_local_paper(id))) + "/"
+    return GCPFTPROOT
+
+
 # weird
 GCPPDFROOT = dirname(blob_pdf_root("2301")[:-1]) + "/"
 GCPORIGROOT = dirname(blob_orig_root("2301")[:-1]) + "/"
+GCPFTPROOT = dirname(blob_ftp_root("2301")[:-1]) + "/"
 
 
 def arxiv_id_to_pdf_url(host: str, arxiv_id: arXivID) -> str:
@@ -1,6 +1,8 @@
 
+from arxiv.db.models import TapirAdminAudit
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from arxiv_bizlogic.audit_event import (admin_audit, AdminAuditEvent, AdminAudit_SetBanned, AdminAudit_SetEditUsers,
                                         AdminAudit_SetEditSystem, AdminAudit_SetSuspect, AdminAudit_SetEmailVerified,
                                         AdminAudit_AddPaperOwner, AdminAudit_AddPaperOwner2, AdminAudit_ChangePassword,
@@ -137,6 +139,25 @@ user_prop_audit_registry = {
 }
 
 
+def make_user_prop_audit_event(admin_id: str, session_id: str, prop_name: str, user_id: str,
+                               old_value: Any, new_value: Any,
+                               comment: Optional[str] = None,
+                               remote_ip: Optional[str] = None,
+                               remote_hostname: Optional[str] = None,
+                               tracking_cookie: Optional[str] = None,
+                               ) -> AdminAuditEvent:
+    """The audit event for a change of a user property. See record_user_prop_admin_action."""
+    auditor = user_prop_audit_registry.get(prop_name)
+    assert auditor is not None, f"Unknown admin action: {prop_name}"
+
+    if len(auditor) == 2:
+        audit_class, maker = auditor  # type: ignore
+        return maker(audit_class, admin_id, session_id, prop_name, user_id, old_value, new_value, comment=comment, remote_ip=remote_ip, remote_hostname=remote_hostname, tracking_cookie=tracking_cookie)  # type: ignore
+    else:
+        audit_class, maker, arg_name = auditor  # type: ignore
+        return maker(audit_class, admin_id, session_id, prop_name, user_id, old_value, new_value, comment=comment, remote_ip=remote_ip, remote_hostname=remote_hostname, tracking_cookie=tracking_cookie, arg_name=arg_name)  # type: ignore
+
+
 def record_user_prop_admin_action(session: Session,
                                   admin_id: str = "",
                                   session_id: str = "",
@@ -172,14 +193,66 @@ def record_user_prop_admin_action(session: Session,
     Raises:
         None
     """
-    auditor = user_prop_audit_registry.get(prop_name)
-    assert auditor is not None, f"Unknown admin action: {prop_name}"
+    audit_event = make_user_prop_audit_event(admin_id, session_id, prop_name, user_id, old_value, new_value,
+                                             comment=comment, remote_ip=remote_ip, remote_hostname=remote_hostname,
+                                             tracking_cookie=tracking_cookie)
+    admin_audit(session, audit_event)
 
-    if len(auditor) == 2:
-        audit_class, maker = auditor  # type: ignore
-        audit_event = maker(audit_class, admin_id, session_id, prop_name, user_id, old_value, new_value, comment=comment, remote_ip=remote_ip, remote_hostname=remote_hostname, tracking_cookie=tracking_cookie)  # type: ignore
-    else:
-        audit_class, maker, arg_name = auditor  # type: ignore
-        audit_event = maker(audit_class, admin_id, session_id, prop_name, user_id, old_value, new_value, comment=comment, remote_ip=remote_ip, remote_hostname=remote_hostname, tracking_cookie=tracking_cookie, arg_name=arg_name)  # type: ignore
 
-    admin_audit(session, audit_event)
+# The tapir_admin_audit columns, and the AdminAuditEvent attributes admin_audit() writes them from
+_AUDIT_EVENT_COLUMNS = {
+    "log_date": "timestamp",
+    "session_id": "session_id",
+    "ip_addr": "remote_ip",
+    "remote_host": "remote_hostname",
+    "admin_user": "admin_user",
+    "affected_user": "affected_user",
+    "tracking_cookie": "tracking_cookie",
+    "action": "action",
+    "data": "data",
+    "comment": "comment",
+}
+
+
+def admin_audit_row(audit_event: AdminAuditEvent) -> Dict[str, Any]:
+    """
+    The tapir_admin_audit row for an audit event, from the event's attributes.
+
+    The attributes that are None are left out, so the column defaults apply.
+
+    Args:
+        audit_event (AdminAuditEvent): The event, e.g. from make_user_prop_audit_event.
+
+    Returns:
+        Dict[str, Any]: The column values
+    """
+    row: Dict[str, Any] = {}
+    for column, attribute in _AUDIT_EVENT_COLUMNS.items():
+        value = getattr(audit_event, attribute)
+        if value is not None:
+            row[column] = value
+    return row
+
+
+def record_admin_audit_events(session: Session, audit_events: List[AdminAuditEvent]) -> int:
+    """
+    Writes the records of many audit events with multi-row INSERTs, instead of one INSERT per
+    admin_audit() call.
+
+    The columns a record leaves unset are left out of its row, so the column defaults apply. Rows
+    with the same columns go in one INSERT.
+
+    Args:
+        session (Session): The active database session.
+        audit_events (List[AdminAuditEvent]): The events, e.g. from make_user_prop_audit_event.
+
+    Returns:
+        int: The number of records written
+    """
+    rows_by_keys: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for audit_event in audit_events:
+        row = admin_audit_row(audit_event)
+        rows_by_keys.setdefault(tuple(row.keys()), []).append(row)
+    for rows in rows_by_keys.values():
+        session.execute(insert(TapirAdminAudit), rows)
+    return len(audit_events)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare throughput of the StreamingResponse and FileResponse paths for local document files.
+
+Usage:
+    python bench_file_serving.py --size-mb 256 --rounds 5
+
+Run it under the same Python as the API. It builds a throwaway app with the two response styles
+used by documents.download_document_file and reads a temporary file through each of them.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the parent directories to the path so we can import arxiv_admin_api modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import httpx
+from fastapi import FastAPI
+from starlette.responses import StreamingResponse, FileResponse
+
+
+def create_bench_app(path: str) -> FastAPI:
+    """App with one endpoint per response style."""
+    app = FastAPI()
+
+    @app.get("/streaming")
+    async def streaming() -> StreamingResponse:
+        return StreamingResponse(open(path, "rb"), media_type="application/gzip")
+
+    @app.get("/file")
+    async def file() -> FileResponse:
+        return FileResponse(path, media_type="application/gzip", filename=os.path.basename(path),
+                            content_disposition_type="attachment")
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, url: str, rounds: int) -> tuple[float, float]:
+    """Return (seconds, CPU seconds) spent reading the URL `rounds` times."""
+    wall_0 = time.perf_counter()
+    cpu_0 = time.process_time()
+    for _ in range(rounds):
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for _chunk in response.aiter_raw():
+                pass
+    return time.perf_counter() - wall_0, time.process_time() - cpu_0
+
+
+async def run(size_mb: int, rounds: int) -> None:
+    with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as fd:
+        block = os.urandom(1024 * 1024)
+        for _ in range(size_mb):
+            fd.write(block)
+        path = fd.name
+
+    try:
+        transport = httpx.ASGITransport(app=create_bench_app(path))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            total_mb = size_mb * rounds
+            for name in ["streaming", "file"]:
+                wall, cpu = await measure(client, f"/{name}", rounds)
+                print(f"{name:>10}: {total_mb / wall:8.1f} MB/s  wall {wall:6.2f}s  cpu {cpu:6.2f}s")
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=128, help="Size of the test file in MB")
+    parser.add_argument("--rounds", type=int, default=3, help="Number of downloads per response style")
+    args = parser.parse_args()
+    asyncio.run(run(args.size_mb, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
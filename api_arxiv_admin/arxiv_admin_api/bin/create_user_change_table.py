@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Standalone CLI script to create the user change feed table."""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directories to the path so we can import arxiv_admin_api modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arxiv.base import logging
+from arxiv.config import Settings
+from arxiv_bizlogic.database import Database
+
+from arxiv_admin_api.biz.user_changes import ensure_user_change_table, USER_CHANGES_TABLE
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create the user change feed table')
+    parser.add_argument('--db-url', help='Database URL (optional, uses environment if not provided)')
+
+    args = parser.parse_args()
+
+    db_uri = args.db_url or os.environ.get('CLASSIC_DB_URI')
+    if not db_uri:
+        logger.error("Database URI not provided. Use --db-url or set CLASSIC_DB_URI environment variable")
+        sys.exit(1)
+
+    try:
+        settings = Settings(
+            CLASSIC_DB_URI=db_uri,
+            LATEXML_DB_URI=None
+        )
+        database = Database(settings)
+        database.set_to_global()
+
+        from arxiv_bizlogic.fastapi_helpers import get_db
+        db_session = next(get_db())
+        try:
+            ensure_user_change_table(db_session)
+            db_session.commit()
+        finally:
+            db_session.close()
+
+    except Exception as e:
+        logger.error(f"Failed to create {USER_CHANGES_TABLE}: {e}")
+        sys.exit(1)
+
+    logger.info(f"{USER_CHANGES_TABLE} is ready")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Standalone CLI script to find likely duplicate accounts and store them for the admin UI."""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directories to the path so we can import arxiv_admin_api modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arxiv.base import logging
+from arxiv.config import Settings
+from arxiv_bizlogic.database import Database
+
+from arxiv_admin_api.biz.duplicate_accounts import detect_duplicate_accounts, DUPLICATE_CANDIDATES_TABLE
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find likely duplicate accounts')
+    parser.add_argument('--db-url', help='Database URL (optional, uses environment if not provided)')
+    parser.add_argument('--max-bucket-size', type=int, default=20,
+                        help='Skip blocking keys shared by more users than this (default: 20)')
+
+    args = parser.parse_args()
+
+    db_uri = args.db_url or os.environ.get('CLASSIC_DB_URI')
+    if not db_uri:
+        logger.error("Database URI not provided. Use --db-url or set CLASSIC_DB_URI environment variable")
+        sys.exit(1)
+
+    try:
+        settings = Settings(
+            CLASSIC_DB_URI=db_uri,
+            LATEXML_DB_URI=None
+        )
+        database = Database(settings)
+        database.set_to_global()
+
+        from arxiv_bizlogic.fastapi_helpers import get_db
+        db_session = next(get_db())
+        try:
+            count = detect_duplicate_accounts(db_session, max_bucket_size=args.max_bucket_size)
+        finally:
+            db_session.close()
+
+    except Exception as e:
+        logger.error(f"Failed to find duplicate accounts: {e}")
+        sys.exit(1)
+
+    logger.info(f"{count} candidate pairs written to {DUPLICATE_CANDIDATES_TABLE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Standalone CLI script to create and fill the free-text user search index."""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directories to the path so we can import arxiv_admin_api modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arxiv.base import logging
+from arxiv.config import Settings
+from arxiv_bizlogic.database import Database
+
+from arxiv_admin_api.biz.user_search_index import rebuild_user_search_index
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create and fill the free-text user search index')
+    parser.add_argument('--db-url', help='Database URL (optional, uses environment if not provided)')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Users per batch (default: 5000)')
+
+    args = parser.parse_args()
+
+    db_uri = args.db_url or os.environ.get('CLASSIC_DB_URI')
+    if not db_uri:
+        logger.error("Database URI not provided. Use --db-url or set CLASSIC_DB_URI environment variable")
+        sys.exit(1)
+
+    start_time = time.time()
+
+    try:
+        settings = Settings(
+            CLASSIC_DB_URI=db_uri,
+            LATEXML_DB_URI=None
+        )
+        database = Database(settings)
+        database.set_to_global()
+
+        from arxiv_bizlogic.fastapi_helpers import get_db
+        db_session = next(get_db())
+        try:
+            count = rebuild_user_search_index(db_session, batch_size=args.batch_size)
+        finally:
+            db_session.close()
+
+    except Exception as e:
+        logger.error(f"Failed to rebuild the user search index: {e}")
+        sys.exit(1)
+
+    logger.info(f"Indexed {count} users in {time.time() - start_time:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Standalone CLI script to report missing and extra document artifacts in the document bucket."""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directories to the path so we can import arxiv_admin_api modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arxiv.base import logging
+from arxiv.config import Settings
+from arxiv_bizlogic.database import Database
+from google.cloud import storage as gcs
+
+from arxiv_admin_api.biz.storage_consistency import scan_yymm
+
+logger = logging.getLogger(__name__)
+
+
+def yymm_range(first: str, last: str) -> list[str]:
+    """Months from first to last inclusive, as yymm strings."""
+    months = []
+    year, month = int(first[:2]), int(first[2:])
+    while f"{year:02d}{month:02d}" <= last:
+        months.append(f"{year:02d}{month:02d}")
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report missing and extra document artifacts in GCS')
+    parser.add_argument('--from-yymm', required=True, help='First month to scan (yymm, new-style IDs only)')
+    parser.add_argument('--to-yymm', help='Last month to scan (default: same as --from-yymm)')
+    parser.add_argument('--output', help='Output JSON file path (default: stdout)')
+    parser.add_argument('--db-url', help='Database URL (optional, uses environment if not provided)')
+    parser.add_argument('--project', help='GCP project (default: GCP_PROJECT)')
+    parser.add_argument('--bucket', help='Document bucket (default: ARXIV_DOCUMENT_BUCKET_NAME)')
+
+    args = parser.parse_args()
+
+    db_uri = args.db_url or os.environ.get('CLASSIC_DB_URI')
+    if not db_uri:
+        logger.error("Database URI not provided. Use --db-url or set CLASSIC_DB_URI environment variable")
+        sys.exit(1)
+
+    bucket_name = args.bucket or os.environ.get('ARXIV_DOCUMENT_BUCKET_NAME')
+    if not bucket_name:
+        logger.error("Bucket not provided. Use --bucket or set ARXIV_DOCUMENT_BUCKET_NAME environment variable")
+        sys.exit(1)
+
+    months = yymm_range(args.from_yymm, args.to_yymm or args.from_yymm)
+    start_time = time.time()
+
+    try:
+        settings = Settings(
+            CLASSIC_DB_URI=db_uri,
+            LATEXML_DB_URI=None
+        )
+        database = Database(settings)
+        database.set_to_global()
+
+        bucket = gcs.Client(project=args.project or os.environ.get('GCP_PROJECT')).bucket(bucket_name)
+
+        from arxiv_bizlogic.fastapi_helpers import get_db
+        db_session = next(get_db())
+        try:
+            reports = [scan_yymm(db_session, bucket, yymm).model_dump() for yymm in months]
+        finally:
+            db_session.close()
+
+    except Exception as e:
+        logger.error(f"Failed to scan the document storage: {e}")
+        sys.exit(1)
+
+    logger.info(f"Scanned {len(months)} months in {time.time() - start_time:.3f}s")
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(reports, fd, indent=2)
+    else:
+        json.dump(reports, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
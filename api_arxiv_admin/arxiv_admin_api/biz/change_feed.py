@@ -0,0 +1,71 @@
+"""One poller per worker, fanned out to any number of subscribers.
+
+The first subscriber starts a task on the event loop that calls poll(watermark) in a thread every
+interval seconds, and hands each non-empty batch of changes to every subscriber's queue. When
+the last subscriber leaves, the task stops, so an idle worker does not query anything. N open
+streams cost one query per interval.
+
+A subscriber that falls behind by more than max_pending batches gets None and is dropped. It
+should reload and subscribe again.
+"""
+import asyncio
+from typing import Any, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+from arxiv.base import logging
+
+logger = logging.getLogger(__name__)
+
+W = TypeVar("W")
+
+# poll(watermark) -> (changes, next watermark). The first call gets None and should return no
+# changes and the current watermark.
+PollFunction = Callable[[Optional[W]], Tuple[List[Any], W]]
+
+
+class ChangeFeed(Generic[W]):
+
+    def __init__(self, name: str, interval: float = 5.0, max_pending: int = 100):
+        self.name = name
+        self.interval = interval
+        self.max_pending = max_pending
+        self.watermark: Optional[W] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, poll: PollFunction) -> asyncio.Queue:
+        """A queue of change batches. Starts the poller if it is not running."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(poll), name=f"{self.name}_poller")
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _publish(self, changes: List[Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(changes)
+            except asyncio.QueueFull:
+                self._subscribers.discard(queue)
+                # Make room for the sentinel - the subscriber reloads anyway
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _run(self, poll: PollFunction) -> None:
+        self.watermark = None
+        while self._subscribers:
+            try:
+                changes, self.watermark = await asyncio.to_thread(poll, self.watermark)
+                if changes:
+                    self._publish(changes)
+            except Exception:
+                logger.warning("%s: poll failed", self.name, exc_info=True)
+            await asyncio.sleep(self.interval)
+        self.watermark = None
@@ -0,0 +1,243 @@
+"""Find likely duplicate accounts without comparing every pair of users.
+
+Each user gets a few blocking keys:
+
+- email: the canonical email (lower case, "+tag" dropped, dots dropped for gmail)
+- name: Soundex of the last name, first initial and the normalized affiliation
+- cookie: the tracking cookie the account was created with
+
+Users sharing a key land in the same bucket, and pairs are only formed inside a bucket. Buckets
+larger than max_bucket_size (a shared cookie of a public terminal, a very common name with an
+empty affiliation) are skipped, as they say nothing about any one pair. A pair matched by several
+keys scores higher.
+
+The results replace the contents of arXiv_admin_duplicate_candidates, which the admin UI pages
+through. The job is run by bin/find_duplicate_accounts.py, which also creates the table.
+"""
+import itertools
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from arxiv.base import logging
+from arxiv.db.models import Demographic, TapirUser
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..helpers.db_compat import cast_for_encoding
+from ..helpers.provisioned_table import ProvisionedTable
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_CANDIDATES_TABLE = "arXiv_admin_duplicate_candidates"
+
+_metadata = MetaData()
+
+duplicate_candidates_table = Table(
+    DUPLICATE_CANDIDATES_TABLE, _metadata,
+    Column("candidate_id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, nullable=False),
+    Column("other_user_id", Integer, nullable=False),
+    Column("score", Integer, nullable=False),
+    Column("reasons", String(64), nullable=False),
+    Column("detected_at", DateTime, nullable=False),
+    Index("ix_duplicate_candidates_score", "score"),
+    Index("ix_duplicate_candidates_user_id", "user_id"),
+    Index("ix_duplicate_candidates_other_user_id", "other_user_id"),
+)
+
+_table = ProvisionedTable.from_metadata(DUPLICATE_CANDIDATES_TABLE, _metadata, "duplicate_candidates_available")
+
+
+def ensure_duplicate_candidates_table(session: Session) -> None:
+    """Create the results table if it is not there."""
+    _table.ensure(session)
+
+
+def duplicate_candidates_available(session: Session) -> bool:
+    """True when the results table exists. The answer is cached for a few minutes."""
+    return _table.available(session)
+
+
+# How much each kind of match adds to the score of a pair
+KEY_WEIGHTS = {
+    "email": 4,
+    "name": 2,
+    "cookie": 1,
+}
+
+_GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+def canonical_email(email: Optional[str]) -> Optional[str]:
+    """user+tag@Example.ORG -> user@example.org. For gmail, dots in the local part are dropped too."""
+    if not email or "@" not in email:
+        return None
+    local, _, domain = email.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in _GMAIL_DOMAINS:
+        domain = "gmail.com"
+        local = local.replace(".", "")
+    if not local or not domain:
+        return None
+    return f"{local}@{domain}"
+
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def ascii_fold(value: str) -> str:
+    """Lower case ASCII letters and digits only, with accents removed."""
+    folded = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9 ]+", "", folded)
+
+
+def soundex(name: str) -> Optional[str]:
+    """American Soundex code of the name, e.g. Robert -> R163. None when there are no letters."""
+    letters = [ch for ch in ascii_fold(name) if ch.isalpha()]
+    if not letters:
+        return None
+    first = letters[0]
+    code = [first.upper()]
+    previous = _SOUNDEX_CODES.get(first, "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        if ch not in "hw":
+            # h and w do not separate letters with the same code; vowels do
+            previous = digit
+    return "".join(code).ljust(4, "0")
+
+
+def name_key(first_name: Optional[str], last_name: Optional[str], affiliation: Optional[str]) -> Optional[str]:
+    phonetic = soundex(last_name or "")
+    initial = ascii_fold(first_name or "").strip()[:1]
+    if phonetic is None or not initial:
+        return None
+    return f"{phonetic}:{initial}:{' '.join(ascii_fold(affiliation or '').split())}"
+
+
+class UserKeySource(NamedTuple):
+    user_id: int
+    email: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    affiliation: Optional[str]
+    tracking_cookie: Optional[str]
+
+
+def blocking_keys(user: UserKeySource) -> List[Tuple[str, str]]:
+    keys = []
+    email = canonical_email(user.email)
+    if email:
+        keys.append(("email", email))
+    name = name_key(user.first_name, user.last_name, user.affiliation)
+    if name:
+        keys.append(("name", name))
+    if user.tracking_cookie and user.tracking_cookie.strip():
+        keys.append(("cookie", user.tracking_cookie.strip()))
+    return keys
+
+
+class DuplicateCandidate(NamedTuple):
+    user_id: int
+    other_user_id: int  # always > user_id
+    score: int
+    reasons: Tuple[str, ...]
+
+
+def find_candidates(users: Iterator[UserKeySource], max_bucket_size: int = 20) -> List[DuplicateCandidate]:
+    """Bucket the users by blocking key and pair them up inside each bucket. Best score first."""
+    buckets: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for user in users:
+        for key in blocking_keys(user):
+            buckets[key].append(user.user_id)
+
+    pair_reasons: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+    skipped = 0
+    for (kind, _value), user_ids in buckets.items():
+        if len(user_ids) < 2:
+            continue
+        if len(user_ids) > max_bucket_size:
+            skipped += 1
+            continue
+        for user_id, other_user_id in itertools.combinations(sorted(set(user_ids)), 2):
+            pair_reasons[(user_id, other_user_id)].add(kind)
+    if skipped:
+        logger.info("duplicate accounts: skipped %d buckets larger than %d", skipped, max_bucket_size)
+
+    candidates = [
+        DuplicateCandidate(user_id, other_user_id, sum(KEY_WEIGHTS[reason] for reason in reasons),
+                           tuple(sorted(reasons)))
+        for (user_id, other_user_id), reasons in pair_reasons.items()
+    ]
+    candidates.sort(key=lambda candidate: (-candidate.score, candidate.user_id, candidate.other_user_id))
+    return candidates
+
+
+def _decode(value: bytes | str | None) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def iter_user_key_sources(session: Session, batch_size: int = 10000) -> Iterator[UserKeySource]:
+    """Every live user, walking user_id in batches."""
+    last_user_id = 0
+    while True:
+        rows = session.execute(
+            select(
+                TapirUser.user_id,
+                cast_for_encoding(TapirUser.email, session).label("email"),
+                cast_for_encoding(TapirUser.first_name, session).label("first_name"),
+                cast_for_encoding(TapirUser.last_name, session).label("last_name"),
+                cast_for_encoding(Demographic.affiliation, session).label("affiliation"),
+                TapirUser.tracking_cookie,
+            )
+            .outerjoin(Demographic, Demographic.user_id == TapirUser.user_id)
+            .where(TapirUser.user_id > last_user_id, TapirUser.flag_deleted == 0)
+            .order_by(TapirUser.user_id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            yield UserKeySource(row.user_id, _decode(row.email), _decode(row.first_name), _decode(row.last_name),
+                                _decode(row.affiliation), row.tracking_cookie)
+        last_user_id = rows[-1].user_id
+
+
+def write_candidates(session: Session, candidates: List[DuplicateCandidate], batch_size: int = 5000) -> None:
+    """Replace the contents of the results table, in one transaction."""
+    session.execute(delete(duplicate_candidates_table))
+    detected_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    for offset in range(0, len(candidates), batch_size):
+        session.execute(insert(duplicate_candidates_table), [
+            {"user_id": candidate.user_id, "other_user_id": candidate.other_user_id, "score": candidate.score,
+             "reasons": ",".join(candidate.reasons), "detected_at": detected_at}
+            for candidate in candidates[offset:offset + batch_size]])
+    session.commit()
+
+
+def detect_duplicate_accounts(session: Session, max_bucket_size: int = 20) -> int:
+    """Run the whole job. Returns the number of candidate pairs written."""
+    ensure_duplicate_candidates_table(session)
+    session.commit()
+    start = time.monotonic()
+    candidates = find_candidates(iter_user_key_sources(session), max_bucket_size=max_bucket_size)
+    logger.info("duplicate accounts: %d candidate pairs in %.1fs", len(candidates), time.monotonic() - start)
+    write_candidates(session, candidates)
+    return len(candidates)
@@ -0,0 +1,135 @@
+"""Find documents whose PDF, abs or source is missing from the document bucket, and blobs that
+belong to no document version.
+
+A month (yymm) is scanned with one listing per storage root instead of one exists() call per
+object. Both sides are turned into sorted Artifact keys and merge-joined.
+"""
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from arxiv.base import logging
+from arxiv.db.models import Document, Metadata
+from google.cloud import storage as cloud_storage
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..accessors import blob_pdf_root, blob_orig_root, blob_ftp_root
+
+logger = logging.getLogger(__name__)
+
+
+class Artifact(NamedTuple):
+    """One stored file of a document version.
+
+    version is 0 for the abs and source of the latest version, which live under /ftp without the
+    version suffix.
+    """
+    paper_id: str
+    kind: str  # pdf, abs or source
+    version: int
+
+
+class StorageScanReport(BaseModel):
+    yymm: str
+    expected_count: int
+    listed_count: int
+    missing: List[str]
+    extra: List[str]
+
+
+_blob_basename_re = re.compile(r"^(?P<paper_id>\d{4}\.\d{4,5})(v(?P<version>\d+))?(?P<ext>\..+)$")
+
+
+def parse_blob_name(root: str, name: str) -> Optional[Artifact]:
+    """Artifact for a blob listed under one of the roots. None for things the scan does not track."""
+    matched = _blob_basename_re.match(name[len(root):])
+    if not matched:
+        return None
+    paper_id = matched.group("paper_id")
+    version = int(matched.group("version") or 0)
+    ext = matched.group("ext")
+    if root.startswith("ps_cache/"):
+        # The outcome tarball sits next to the PDF, and it is optional
+        return Artifact(paper_id, "pdf", version) if ext == ".pdf" and version else None
+    return Artifact(paper_id, "abs" if ext == ".abs" else "source", version)
+
+
+def list_artifacts(bucket: cloud_storage.Bucket, yymm: str) -> List[Artifact]:
+    """Every tracked blob of the month, sorted."""
+    artifacts = []
+    for root in [blob_pdf_root(yymm), blob_ftp_root(yymm), blob_orig_root(yymm)]:
+        for blob in bucket.list_blobs(prefix=root, fields="items(name),nextPageToken"):
+            artifact = parse_blob_name(root, blob.name)
+            if artifact is not None:
+                artifacts.append(artifact)
+    artifacts.sort()
+    return artifacts
+
+
+def expected_artifacts(session: Session, yymm: str) -> List[Artifact]:
+    """Every artifact the metadata of the month says should exist, sorted."""
+    rows = (
+        session.query(Metadata.paper_id, Metadata.version, Metadata.source_format)
+        .join(Document, Document.document_id == Metadata.document_id)
+        .filter(Document.paper_id.between(f"{yymm}.0000", f"{yymm}.99999"))
+        .order_by(Metadata.paper_id, Metadata.version)
+        .all()
+    )
+    latest_versions: dict[str, int] = {}
+    for paper_id, version, _source_format in rows:
+        latest_versions[paper_id] = max(version, latest_versions.get(paper_id, 0))
+
+    artifacts = []
+    for paper_id, version, source_format in rows:
+        located_version = 0 if latest_versions[paper_id] == version else version
+        artifacts.append(Artifact(paper_id, "abs", located_version))
+        if source_format == "withdrawn":
+            # A withdrawal has neither a source nor a PDF
+            continue
+        artifacts.append(Artifact(paper_id, "source", located_version))
+        artifacts.append(Artifact(paper_id, "pdf", version))
+    artifacts.sort()
+    return artifacts
+
+
+def merge_join(expected: Iterable[Artifact], listed: Iterable[Artifact]) -> Tuple[List[Artifact], List[Artifact]]:
+    """(missing, extra) of two sorted artifact sequences, in one pass over each."""
+    missing: List[Artifact] = []
+    extra: List[Artifact] = []
+    exp_iter: Iterator[Artifact] = iter(expected)
+    lst_iter: Iterator[Artifact] = iter(listed)
+    exp = next(exp_iter, None)
+    lst = next(lst_iter, None)
+    while exp is not None or lst is not None:
+        if lst is None or (exp is not None and exp < lst):
+            missing.append(exp)  # type: ignore
+            exp = next(exp_iter, None)
+        elif exp is None or lst < exp:
+            extra.append(lst)
+            lst = next(lst_iter, None)
+        else:
+            exp = next(exp_iter, None)
+            lst = next(lst_iter, None)
+    return missing, extra
+
+
+def _artifact_label(artifact: Artifact) -> str:
+    if artifact.version:
+        return f"{artifact.paper_id}v{artifact.version} {artifact.kind}"
+    return f"{artifact.paper_id} {artifact.kind}"
+
+
+def scan_yymm(session: Session, bucket: cloud_storage.Bucket, yymm: str) -> StorageScanReport:
+    """Compare the bucket against the database for one month of new-style IDs."""
+    expected = expected_artifacts(session, yymm)
+    listed = list_artifacts(bucket, yymm)
+    missing, extra = merge_join(expected, listed)
+    logger.info("Storage scan %s: %d expected, %d listed, %d missing, %d extra",
+                yymm, len(expected), len(listed), len(missing), len(extra))
+    return StorageScanReport(
+        yymm=yymm,
+        expected_count=len(expected),
+        listed_count=len(listed),
+        missing=[_artifact_label(artifact) for artifact in missing],
+        extra=[_artifact_label(artifact) for artifact in extra],
+    )
@@ -0,0 +1,95 @@
+"""Listing of the members of a source tarball, built from one streaming read."""
+import asyncio
+import tarfile
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional
+
+from pydantic import BaseModel
+
+from ..accessors import BaseAccessor
+from ..helpers.bounded_cache import BoundedCache
+
+
+class TarballMemberModel(BaseModel):
+    name: str
+    size: int
+    type: str  # file, dir, symlink, hardlink or other
+    mtime: Optional[datetime] = None
+    linkname: Optional[str] = None
+
+
+class TarballManifestModel(BaseModel):
+    id: str  # canonical name of the tarball
+    generation: str
+    member_count: int
+    total_size: int
+    members: List[TarballMemberModel]
+
+
+def _member_type(info: tarfile.TarInfo) -> str:
+    if info.isfile():
+        return "file"
+    if info.isdir():
+        return "dir"
+    if info.issym():
+        return "symlink"
+    if info.islnk():
+        return "hardlink"
+    return "other"
+
+
+def read_tarball_members(fd: BinaryIO) -> List[TarballMemberModel]:
+    """Walk the tarball headers in stream mode.
+
+    "r|*" never seeks, so this works on a GCS BlobReader as well as on a local file, and the
+    archive is read exactly once. Member contents are skipped, not extracted.
+    """
+    members = []
+    with tarfile.open(fileobj=fd, mode="r|*") as tar:
+        for info in tar:
+            members.append(TarballMemberModel(
+                name=info.name,
+                size=info.size,
+                type=_member_type(info),
+                mtime=datetime.fromtimestamp(info.mtime, tz=timezone.utc) if info.mtime else None,
+                linkname=info.linkname or None,
+            ))
+    return members
+
+
+# Keyed by (canonical name, generation). A new upload gets a new generation, so entries never go stale
+# and only need to be bounded.
+tarball_manifest_cache: BoundedCache[tuple[str, str], TarballManifestModel] = \
+    BoundedCache("tarball_manifest", maxsize=1024, ttl=None)
+
+
+class TarballChangedError(Exception):
+    """The tarball was replaced while it was read."""
+
+
+def _read_accessor_members(accessor: BaseAccessor) -> List[TarballMemberModel]:
+    with accessor.open(mode="rb") as fd:
+        return read_tarball_members(fd)  # type: ignore
+
+
+async def get_tarball_manifest(accessor: BaseAccessor, generation: str) -> TarballManifestModel:
+    """Return the manifest of the tarball, reading it from storage only on a cache miss.
+
+    The generation is read again after the archive, and a manifest is only returned and cached
+    when it has not changed; otherwise TarballChangedError is raised.
+    """
+    key = (accessor.canonical_name, generation)
+    manifest: Optional[TarballManifestModel] = tarball_manifest_cache.get(key)
+    if manifest is None:
+        members = await asyncio.to_thread(_read_accessor_members, accessor)
+        if await accessor.generation != generation:
+            raise TarballChangedError(f"{accessor.canonical_name} changed while it was read")
+        manifest = TarballManifestModel(
+            id=accessor.canonical_name,
+            generation=generation,
+            member_count=len(members),
+            total_size=sum(member.size for member in members),
+            members=members,
+        )
+        tarball_manifest_cache.set(key, manifest)
+    return manifest
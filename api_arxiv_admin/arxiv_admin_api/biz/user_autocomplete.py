@@ -0,0 +1,265 @@
+"""Username and email prefix lookup for the user pickers, served from memory.
+
+The index is a sorted list of (normalized key, user_id), one key per username and one per email.
+A prefix search is a bisect plus a short walk, so a keystroke in the UI does not become a LIKE scan.
+
+tapir_users has no modification time, so the poller picks up changes from three watermarks: new
+user_ids, users named by tapir_admin_audit entries, and the admin API's user change feed. An id
+is handed out before its transaction commits, so the first two are re-read from REFRESH_LOOKBACK_IDS
+below the watermark; re-loading a user that has not changed is harmless. Changes made outside of
+the admin tools (e.g. a user changing their own email) show up at the next full rebuild.
+
+The poller keeps the user search index (user_search_index.py) current the same way: it re-indexes
+the users it reloads, and re-syncs the whole search index with each full rebuild.
+"""
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from arxiv.base import logging
+from arxiv.db.models import TapirUser, TapirNickname, TapirAdminAudit
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..helpers.db_compat import cast_for_encoding
+from .user_changes import latest_change_id, user_changes_since
+from .user_search_index import index_users, sync_user_search_index, user_search_index_available
+
+logger = logging.getLogger(__name__)
+
+FULL_REBUILD_SECONDS = 6 * 3600.0
+REFRESH_LOOKBACK_IDS = 100
+
+
+class UserAutocompleteModel(BaseModel):
+    id: int
+    username: Optional[str] = None
+    email: str
+    first_name: str
+    last_name: str
+    matched: str  # username or email
+
+
+class _UserRecord(NamedTuple):
+    usernames: Tuple[str, ...]
+    email: str
+    first_name: str
+    last_name: str
+
+
+def normalize_key(value: Optional[str]) -> str:
+    return value.strip().lower() if value else ""
+
+
+def _decode(value: bytes | str | None) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace").strip()
+    return value.strip() if value else ""
+
+
+def _record_keys(user_id: int, record: _UserRecord) -> List[Tuple[str, int, str]]:
+    keys = [(normalize_key(username), user_id, "username") for username in record.usernames if username]
+    if record.email:
+        keys.append((normalize_key(record.email), user_id, "email"))
+    return keys
+
+
+class UserAutocompleteIndex:
+    """Sorted in-memory index of usernames and emails."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, int, str]] = []  # (key, user_id, username|email), sorted
+        self._users: Dict[int, _UserRecord] = {}
+        self.last_user_id = 0
+        self.last_audit_entry_id = 0
+        self.last_change_id = 0
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _load_users(session: Session, user_ids: Optional[List[int]] = None) -> Dict[int, Optional[_UserRecord]]:
+        """Records of the users, or None for the ones that are gone or deleted."""
+        stmt = (
+            select(
+                TapirUser.user_id,
+                TapirUser.flag_deleted,
+                cast_for_encoding(TapirUser.email, session).label("email"),
+                cast_for_encoding(TapirUser.first_name, session).label("first_name"),
+                cast_for_encoding(TapirUser.last_name, session).label("last_name"),
+                TapirNickname.nickname,
+            )
+            .outerjoin(TapirNickname, TapirNickname.user_id == TapirUser.user_id)
+        )
+        users: Dict[int, Optional[_UserRecord]] = {}
+        if user_ids is not None:
+            stmt = stmt.where(TapirUser.user_id.in_(user_ids))
+            users = {user_id: None for user_id in user_ids}
+        for row in session.execute(stmt):
+            if row.flag_deleted:
+                continue
+            record = users.get(row.user_id)
+            nickname = (_decode(row.nickname),) if row.nickname else ()
+            if record is None:
+                users[row.user_id] = _UserRecord(nickname, _decode(row.email),
+                                                 _decode(row.first_name), _decode(row.last_name))
+            else:
+                users[row.user_id] = record._replace(usernames=record.usernames + nickname)
+        return users
+
+    def build(self, session: Session) -> None:
+        """Load every user and replace the index."""
+        start = time.monotonic()
+        last_user_id = session.execute(select(func.max(TapirUser.user_id))).scalar() or 0
+        last_audit_entry_id = session.execute(select(func.max(TapirAdminAudit.entry_id))).scalar() or 0
+        last_change_id = latest_change_id(session)
+        users = {user_id: record for user_id, record in self._load_users(session).items() if record is not None}
+        keys = sorted(key for user_id, record in users.items() for key in _record_keys(user_id, record))
+        with self._lock:
+            self._keys = keys
+            self._users = users
+            self.last_user_id = last_user_id
+            self.last_audit_entry_id = last_audit_entry_id
+            self.last_change_id = last_change_id
+            self.built_at = time.monotonic()
+        logger.info("user autocomplete: %d users, %d keys indexed in %.3fs",
+                    len(users), len(keys), time.monotonic() - start)
+
+    def update_users(self, session: Session, user_ids: Iterable[int]) -> None:
+        """Reload the users and replace their keys."""
+        ids = sorted(set(int(user_id) for user_id in user_ids))
+        if not ids:
+            return
+        loaded = self._load_users(session, ids)
+        with self._lock:
+            for user_id, record in loaded.items():
+                old_record = self._users.pop(user_id, None)
+                if old_record is not None:
+                    for key in _record_keys(user_id, old_record):
+                        index = bisect.bisect_left(self._keys, key)
+                        if index < len(self._keys) and self._keys[index] == key:
+                            del self._keys[index]
+                if record is not None:
+                    self._users[user_id] = record
+                    for key in _record_keys(user_id, record):
+                        bisect.insort(self._keys, key)
+
+    def refresh(self, session: Session) -> Optional[Set[int]]:
+        """Apply the changes since the last poll, or rebuild when the index is missing or old.
+
+        Returns the user_ids that were reloaded, or None after a rebuild.
+        """
+        if self.built_at is None or time.monotonic() - self.built_at > FULL_REBUILD_SECONDS:
+            self.build(session)
+            return None
+        new_user_ids = session.execute(
+            select(TapirUser.user_id)
+            .where(TapirUser.user_id > self.last_user_id - REFRESH_LOOKBACK_IDS)).scalars().all()
+        audits = session.execute(
+            select(TapirAdminAudit.entry_id, TapirAdminAudit.affected_user)
+            .where(TapirAdminAudit.entry_id > self.last_audit_entry_id - REFRESH_LOOKBACK_IDS)).all()
+        changed = set(new_user_ids) | {int(audit.affected_user) for audit in audits if audit.affected_user}
+        last_change_id = self.last_change_id
+        has_more = True
+        while has_more:
+            changes, last_change_id, has_more = user_changes_since(session, last_change_id, 10000)
+            changed.update(user_id for _change_id, user_id, _changed_at in changes)
+        self.update_users(session, changed)
+        if new_user_ids:
+            self.last_user_id = max(self.last_user_id, max(new_user_ids))
+        if audits:
+            self.last_audit_entry_id = max(self.last_audit_entry_id, max(audit.entry_id for audit in audits))
+        self.last_change_id = last_change_id
+        return changed
+
+    @classmethod
+    def search_database(cls, session: Session, prefix: str, limit: int = 10) -> List[UserAutocompleteModel]:
+        """The same search as search(), with two prefix queries. For when the index is not built yet."""
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        # LIKE is case-insensitive under the tables' collation (and for ASCII in SQLite), so the plain
+        # columns match the lower-cased key and the range scan can use their indexes
+        user_ids = set(session.execute(
+            select(TapirNickname.user_id)
+            .where(TapirNickname.nickname.startswith(key, autoescape=True))
+            .order_by(TapirNickname.nickname, TapirNickname.user_id).limit(limit)).scalars())
+        user_ids.update(session.execute(
+            select(TapirUser.user_id)
+            .where(TapirUser.email.startswith(key, autoescape=True))
+            .order_by(TapirUser.email, TapirUser.user_id).limit(limit)).scalars())
+        index = cls()
+        index._users = {user_id: record for user_id, record in cls._load_users(session, sorted(user_ids)).items()
+                        if record is not None}
+        index._keys = sorted(key for user_id, record in index._users.items() for key in _record_keys(user_id, record))
+        return index.search(prefix, limit)
+
+    def search(self, prefix: str, limit: int = 10) -> List[UserAutocompleteModel]:
+        """Up to limit users with a username or email starting with prefix, in key order."""
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        results: List[UserAutocompleteModel] = []
+        seen = set()
+        with self._lock:
+            index = bisect.bisect_left(self._keys, (key,))
+            while index < len(self._keys) and len(results) < limit:
+                entry_key, user_id, matched = self._keys[index]
+                if not entry_key.startswith(key):
+                    break
+                index += 1
+                if user_id in seen:
+                    continue
+                seen.add(user_id)
+                record = self._users[user_id]
+                results.append(UserAutocompleteModel(
+                    id=user_id,
+                    username=record.usernames[0] if record.usernames else None,
+                    email=record.email,
+                    first_name=record.first_name,
+                    last_name=record.last_name,
+                    matched=matched,
+                ))
+        return results
+
+
+user_autocomplete_index = UserAutocompleteIndex()
+
+_poller: Optional[threading.Thread] = None
+
+
+def _poll_forever(interval: float) -> None:
+    from arxiv_bizlogic.fastapi_helpers import get_db
+    while True:
+        db_session = next(get_db())
+        try:
+            changed = user_autocomplete_index.refresh(db_session)
+            # The search index follows the same changes, and is re-synced in full with each rebuild
+            if changed is None:
+                if user_search_index_available(db_session):
+                    sync_user_search_index(db_session)
+            else:
+                index_users(db_session, changed)
+                db_session.commit()
+        except Exception:
+            logger.warning("user autocomplete: refresh failed", exc_info=True)
+        finally:
+            db_session.close()
+        time.sleep(interval)
+
+
+def start_user_autocomplete_poller(interval: float = 60.0) -> None:
+    """Build the index in the background now, then poll for changes every interval seconds."""
+    global _poller
+    if _poller is None:
+        _poller = threading.Thread(target=_poll_forever, args=(interval,), name="user_autocomplete_poller",
+                                   daemon=True)
+        _poller.start()
@@ -0,0 +1,101 @@
+"""Change feed of users.
+
+tapir_users and tapir_demographics carry no modification time, so the admin API appends a row to
+arXiv_admin_user_changes in the same transaction as every user change it makes. change_id is
+auto-increment, which makes it the watermark: a consumer keeps the last change_id it has seen and
+asks for what came after, reading O(changes) rows instead of re-scanning the users.
+
+change_ids are handed out at insert and become visible at commit, so a lower id can show up after
+a higher one has been read. The feed only moves the watermark over changes older than
+SETTLE_SECONDS, and stops at the first newer one, so a transaction that commits within that
+window is not skipped.
+
+The table is created by bin/create_user_change_table.py. Until then, nothing is recorded and the
+feed is empty.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, Table, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..helpers.provisioned_table import ProvisionedTable
+
+USER_CHANGES_TABLE = "arXiv_admin_user_changes"
+SETTLE_SECONDS = 60
+
+_metadata = MetaData()
+
+user_changes_table = Table(
+    USER_CHANGES_TABLE, _metadata,
+    Column("change_id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("user_id", Integer, nullable=False),
+    Column("changed_at", DateTime, nullable=False),
+    Index("ix_user_changes_user_id", "user_id"),
+)
+
+_table = ProvisionedTable.from_metadata(USER_CHANGES_TABLE, _metadata, "user_changes_available")
+
+
+def ensure_user_change_table(session: Session) -> None:
+    """Create the change table if it is not there."""
+    _table.ensure(session)
+
+
+def user_change_table_available(session: Session) -> bool:
+    """True when the change table exists. The answer is cached for a few minutes."""
+    return _table.available(session)
+
+
+def record_user_changes(session: Session, user_ids: Iterable[int]) -> None:
+    """Append the users to the feed, in the caller's transaction, with one multi-row insert."""
+    ids = sorted(set(int(user_id) for user_id in user_ids))
+    if not ids or not user_change_table_available(session):
+        return
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    session.execute(insert(user_changes_table), [{"user_id": user_id, "changed_at": now} for user_id in ids])
+
+
+def _settle_cutoff() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=SETTLE_SECONDS)
+
+
+def latest_change_id(session: Session) -> int:
+    """The watermark to follow the feed from: the change before the first one that has not settled."""
+    if not user_change_table_available(session):
+        return 0
+    unsettled = session.execute(
+        select(func.min(user_changes_table.c.change_id))
+        .where(user_changes_table.c.changed_at > _settle_cutoff())).scalar()
+    if unsettled is not None:
+        return unsettled - 1
+    return session.execute(select(func.max(user_changes_table.c.change_id))).scalar() or 0
+
+
+def user_changes_since(session: Session, since: int,
+                       limit: int) -> Tuple[List[Tuple[int, int, datetime]], int, bool]:
+    """
+    (change_id, user_id, changed_at) after the watermark, oldest first, the next watermark, and
+    whether there are more. Stops at the first change that has not settled. A user changed more
+    than once in the window is listed at its latest change only.
+    """
+    if not user_change_table_available(session):
+        return [], since, False
+    rows = session.execute(
+        select(user_changes_table.c.change_id, user_changes_table.c.user_id, user_changes_table.c.changed_at)
+        .where(user_changes_table.c.change_id > since)
+        .order_by(user_changes_table.c.change_id)
+        .limit(limit + 1)
+    ).all()
+    cutoff = _settle_cutoff()
+    for index, row in enumerate(rows):
+        if row.changed_at > cutoff:
+            rows = rows[:index]
+            break
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    latest: dict[int, Tuple[int, int, datetime]] = {}
+    for change_id, user_id, changed_at in rows:
+        latest.pop(user_id, None)
+        latest[user_id] = (change_id, user_id, changed_at)
+    return list(latest.values()), rows[-1][0] if rows else since, has_more
@@ -0,0 +1,76 @@
+"""Counts for the user dashboard, one aggregate query per table."""
+from typing import Optional
+
+from arxiv.db.models import Document, PaperOwner, Submission, TapirAdminAudit, TapirSession, TapirUser
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+
+def _valid_paper_id_filter():
+    # Same as document_biz.document_summary: exclude rejected, pending, replace
+    return and_(
+        ~Document.paper_id.like('rejected/%'),
+        ~Document.paper_id.like('pending/%'),
+        ~Document.paper_id.like('replace/%')
+    )
+
+
+def dashboard_change_token(session: Session, user_id: int) -> Optional[str]:
+    """
+    A token that changes when the things the dashboard counts change, from one query of indexed
+    MAX/COUNT lookups. None when the user does not exist.
+    """
+    row = session.execute(select(
+        select(TapirUser.user_id).where(TapirUser.user_id == user_id).scalar_subquery().label("user_id"),
+        select(func.max(TapirAdminAudit.entry_id)).where(
+            TapirAdminAudit.affected_user == user_id).scalar_subquery().label("audit"),
+        select(func.max(Submission.submission_id)).where(
+            Submission.submitter_id == user_id).scalar_subquery().label("submission"),
+        select(func.count()).select_from(PaperOwner).where(
+            PaperOwner.user_id == user_id).scalar_subquery().label("owners"),
+    )).one()
+    if row.user_id is None:
+        return None
+    return f"{row.audit or 0}-{row.submission or 0}-{row.owners}"
+
+
+def activity_counts(session: Session, user_id: int) -> dict:
+    tapir_sessions_count = session.execute(
+        select(func.count()).select_from(TapirSession).where(TapirSession.user_id == user_id)).scalar()
+    admin_log_count = session.execute(
+        select(func.count()).select_from(TapirAdminAudit).where(
+            or_(TapirAdminAudit.admin_user == user_id, TapirAdminAudit.affected_user == user_id))).scalar()
+    return {
+        "tapir_sessions_count": tapir_sessions_count or 0,
+        "admin_log_count": admin_log_count or 0,
+    }
+
+
+def paper_counts(session: Session, user_id: int) -> dict:
+    """
+    Document summary (submitted/owns/authored, as in document_summary) and ownership summary
+    (valid ownerships, valid authorships), with one query on Document and one on PaperOwner.
+    """
+    submitted_count = session.execute(
+        select(func.count()).select_from(Document).where(
+            and_(Document.submitter_id == user_id, _valid_paper_id_filter()))).scalar()
+
+    valid_document = and_(Document.document_id.is_not(None), _valid_paper_id_filter())
+    owner_counts = session.execute(
+        select(
+            func.sum(case((valid_document, 1), else_=0)).label("owns"),
+            func.sum(case((and_(valid_document, PaperOwner.flag_author == 1), 1), else_=0)).label("authored"),
+            func.sum(case((PaperOwner.valid == 1, 1), else_=0)).label("valid"),
+            func.sum(case((and_(PaperOwner.valid == 1, PaperOwner.flag_author == 1), 1), else_=0)).label("valid_author"),
+        )
+        .select_from(PaperOwner)
+        .outerjoin(Document, PaperOwner.document_id == Document.document_id)
+        .where(PaperOwner.user_id == user_id)
+    ).one()
+    return {
+        "submitted_count": submitted_count or 0,
+        "owns_count": int(owner_counts.owns or 0),
+        "authored_count": int(owner_counts.authored or 0),
+        "ownership_total": int(owner_counts.valid or 0),
+        "ownership_author": int(owner_counts.valid_author or 0),
+    }
@@ -0,0 +1,226 @@
+"""Free-text search over user names, emails and usernames.
+
+arXiv_admin_user_search holds one normalized search text per user. MySQL indexes it with an ngram
+FULLTEXT index and SQLite (used by the tests) with an FTS5 trigram table, so a search for any part
+of a name or an email is an index lookup instead of a LIKE scan of tapir_users.
+
+The table is created and filled by bin/rebuild_user_search_index.py. Until then, the helpers
+here report the index as unavailable and list_users falls back to prefix matching.
+
+The admin API re-indexes the users it changes in the same transaction. The user autocomplete poller
+re-indexes the users it sees change (new users, audited changes and the user change feed), and
+re-syncs the whole index at each of its full rebuilds, which picks up edits made elsewhere (e.g. a
+user changing their own name) within FULL_REBUILD_SECONDS.
+
+On MySQL, a term shorter than the server's ngram_token_size can't be looked up in the index, so a
+search with one falls back to prefix matching.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from arxiv.base import logging
+from arxiv.db.models import TapirUser, TapirNickname
+from sqlalchemy import select, text, table, column, Select
+from sqlalchemy.orm import Session
+
+from ..helpers.bounded_cache import BoundedCache
+from ..helpers.db_compat import cast_for_encoding, get_dialect_name
+from ..helpers.provisioned_table import ProvisionedTable
+
+logger = logging.getLogger(__name__)
+
+USER_SEARCH_TABLE = "arXiv_admin_user_search"
+
+
+def _create_user_search_table(session: Session) -> None:
+    if get_dialect_name(session) == "sqlite":
+        # rowid is the user_id
+        session.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {USER_SEARCH_TABLE} "
+                             f"USING fts5(search_text, tokenize='trigram')"))
+    else:
+        session.execute(text(f"CREATE TABLE IF NOT EXISTS {USER_SEARCH_TABLE} ("
+                             f"user_id INT UNSIGNED NOT NULL PRIMARY KEY, "
+                             f"search_text TEXT NOT NULL, "
+                             f"FULLTEXT KEY ft_search_text (search_text) WITH PARSER ngram"
+                             f") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"))
+
+
+_table = ProvisionedTable(USER_SEARCH_TABLE, _create_user_search_table, "user_search_index_available")
+
+
+def ensure_user_search_index(session: Session) -> None:
+    """Create the search table if it is not there."""
+    _table.ensure(session)
+
+
+def user_search_index_available(session: Session) -> bool:
+    """True when the search table exists. The answer is cached for a few minutes."""
+    return _table.available(session)
+
+
+def _decode(value: bytes | str | None) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value or ""
+
+
+def user_search_text(*parts: bytes | str | None) -> str:
+    """The text that gets indexed: the parts, decoded and lower-cased, separated by spaces."""
+    return " ".join(part for part in (_decode(part).strip().lower() for part in parts) if part)
+
+
+def _select_user_search_texts(session: Session) -> Select:
+    return (
+        select(
+            TapirUser.user_id,
+            cast_for_encoding(TapirUser.first_name, session).label("first_name"),
+            cast_for_encoding(TapirUser.last_name, session).label("last_name"),
+            cast_for_encoding(TapirUser.suffix_name, session).label("suffix_name"),
+            cast_for_encoding(TapirUser.email, session).label("email"),
+            TapirNickname.nickname,
+        )
+        .outerjoin(TapirNickname, TapirNickname.user_id == TapirUser.user_id)
+        .order_by(TapirUser.user_id)
+    )
+
+
+def _rows_to_entries(rows: Iterable) -> List[Tuple[int, str]]:
+    entries: dict[int, List[str]] = {}
+    for row in rows:
+        if row.user_id in entries:
+            # More than one nickname - index all of them
+            entries[row.user_id].append(user_search_text(row.nickname))
+        else:
+            entries[row.user_id] = [user_search_text(row.first_name, row.last_name, row.suffix_name,
+                                                     row.email, row.nickname)]
+    return [(user_id, " ".join(texts)) for user_id, texts in entries.items()]
+
+
+def _write_entries(session: Session, entries: Sequence[Tuple[int, str]]) -> None:
+    if not entries:
+        return
+    params = [{"user_id": user_id, "search_text": search_text} for user_id, search_text in entries]
+    if get_dialect_name(session) == "sqlite":
+        session.execute(text(f"DELETE FROM {USER_SEARCH_TABLE} WHERE rowid = :user_id"), params)
+        session.execute(text(f"INSERT INTO {USER_SEARCH_TABLE} (rowid, search_text) VALUES (:user_id, :search_text)"),
+                        params)
+    else:
+        session.execute(text(f"REPLACE INTO {USER_SEARCH_TABLE} (user_id, search_text) VALUES (:user_id, :search_text)"),
+                        params)
+
+
+def index_users(session: Session, user_ids: Iterable[int]) -> None:
+    """Refresh the search entries of the users, in the caller's transaction.
+
+    Does nothing when the index has not been created.
+    """
+    ids = [int(user_id) for user_id in user_ids]
+    if not ids or not user_search_index_available(session):
+        return
+    rows = session.execute(_select_user_search_texts(session).where(TapirUser.user_id.in_(ids))).all()
+    _write_entries(session, _rows_to_entries(rows))
+
+
+def _read_entries(session: Session, first_user_id: int, last_user_id: int) -> Dict[int, str]:
+    id_column = "rowid" if get_dialect_name(session) == "sqlite" else "user_id"
+    rows = session.execute(text(f"SELECT {id_column}, search_text FROM {USER_SEARCH_TABLE} "
+                                f"WHERE {id_column} BETWEEN :first_user_id AND :last_user_id"),
+                           {"first_user_id": first_user_id, "last_user_id": last_user_id}).all()
+    return {row[0]: row[1] for row in rows}
+
+
+def _delete_entries(session: Session, user_ids: Sequence[int]) -> None:
+    if not user_ids:
+        return
+    id_column = "rowid" if get_dialect_name(session) == "sqlite" else "user_id"
+    session.execute(text(f"DELETE FROM {USER_SEARCH_TABLE} WHERE {id_column} = :user_id"),
+                    [{"user_id": user_id} for user_id in user_ids])
+
+
+def sync_user_search_index(session: Session, batch_size: int = 5000) -> Tuple[int, int]:
+    """Walk user_id in batches and write only the entries that differ from the users.
+
+    Reads every user and entry once, and writes O(changes) rows. Commits after each batch. Returns
+    the number of users walked and the number of entries written or deleted.
+    """
+    last_user_id = 0
+    count = 0
+    written = 0
+    while True:
+        id_batch = session.execute(
+            select(TapirUser.user_id).where(TapirUser.user_id > last_user_id)
+            .order_by(TapirUser.user_id).limit(batch_size)).scalars().all()
+        entries: List[Tuple[int, str]] = []
+        if id_batch:
+            first_id, last_id = last_user_id + 1, id_batch[-1]
+            entries = _rows_to_entries(session.execute(
+                _select_user_search_texts(session).where(TapirUser.user_id.between(first_id, last_id))).all())
+        else:
+            # Past the last user: only entries of deleted users are left
+            first_id, last_id = last_user_id + 1, 2 ** 32
+        existing = _read_entries(session, first_id, last_id)
+        changed = [(user_id, search_text) for user_id, search_text in entries
+                   if existing.get(user_id) != search_text]
+        gone = sorted(set(existing) - {user_id for user_id, _search_text in entries})
+        _write_entries(session, changed)
+        _delete_entries(session, gone)
+        session.commit()
+        count += len(entries)
+        written += len(changed) + len(gone)
+        if not id_batch:
+            break
+        last_user_id = id_batch[-1]
+        logger.info("user search index: %d users checked, %d entries written, up to user_id %d",
+                    count, written, last_user_id)
+    return count, written
+
+
+def rebuild_user_search_index(session: Session, batch_size: int = 5000) -> int:
+    """Create the index if needed and bring every user's entry up to date, walking user_id in batches.
+
+    Commits after each batch. Returns the number of users indexed.
+    """
+    ensure_user_search_index(session)
+    session.commit()
+    count, _written = sync_user_search_index(session, batch_size)
+    return count
+
+
+# The SQLite trigram tokenizer can't match a shorter term
+TRIGRAM_LENGTH = 3
+
+_ngram_token_size: BoundedCache[str, int] = BoundedCache("user_search_ngram_token_size", maxsize=8, ttl=300)
+
+
+def min_term_length(session: Session) -> int:
+    """The shortest term the index can look up: the trigram length, or MySQL's ngram_token_size."""
+    dialect = get_dialect_name(session)
+    if dialect == "sqlite":
+        return TRIGRAM_LENGTH
+    size = _ngram_token_size.get(dialect)
+    if size is None:
+        size = int(session.execute(text("SELECT @@ngram_token_size")).scalar() or 2)
+        _ngram_token_size.set(dialect, size)
+    return size
+
+
+def _search_terms(q: str) -> List[str]:
+    return [term.replace('"', '') for term in user_search_text(q).split() if term.replace('"', '')]
+
+
+def user_search_subquery(session: Session, q: str) -> Optional[Select]:
+    """user_ids whose entry contains every term of q.
+
+    None when q has no usable terms, or a term too short for the index (e.g. "Li", "Wu"), so the
+    caller falls back to prefix matching.
+    """
+    terms = _search_terms(q)
+    if not terms or any(len(term) < min_term_length(session) for term in terms):
+        return None
+    if get_dialect_name(session) == "sqlite":
+        # FTS5 ANDs the quoted terms. The trigram tokenizer matches substrings of 3+ characters.
+        match = " ".join(f'"{term}"' for term in terms)
+        return select(table(USER_SEARCH_TABLE, column("rowid")).c.rowid).where(
+            text(f"{USER_SEARCH_TABLE} MATCH :user_search_match").bindparams(user_search_match=match))
+    match = " ".join(f'+"{term}"' for term in terms)
+    return select(table(USER_SEARCH_TABLE, column("user_id")).c.user_id).where(
+        text("MATCH (search_text) AGAINST (:user_search_match IN BOOLEAN MODE)").bindparams(user_search_match=match))
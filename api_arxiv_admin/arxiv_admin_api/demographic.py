@@ -3,15 +3,17 @@ from arxiv.auth.user_claims import ArxivUserClaims
 from arxiv_bizlogic.fastapi_helpers import get_authn, get_authn_user
 from arxiv_bizlogic.user_status import UserVetoStatus
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from datetime import date
 from typing import Optional, List
 from arxiv.base import logging
-from arxiv.db.models import Demographic, OrcidIds, AuthorIds
-from sqlalchemy import LargeBinary, cast
+from arxiv.db.models import Demographic, OrcidIds, AuthorIds, TapirUser
+from sqlalchemy import LargeBinary, cast, func, select
 from sqlalchemy.orm import Session, Query as OrmQuery
 from pydantic import BaseModel, ConfigDict
 from arxiv_bizlogic.sqlalchemy_helper import sa_model_to_pydandic_model
 
-from . import get_db, is_any_user, gate_admin_user, get_current_user
+from . import get_db, is_any_user, gate_admin_user, get_current_user, datetime_to_epoch, VERY_OLDE
+from .helpers.bounded_cache import BoundedCache
 from .helpers.db_compat import cast_for_encoding
 
 logger = logging.getLogger(__name__)
@@ -134,6 +136,121 @@ async def list_demographics(
     return result
 
 
+class DemographicHistogramBucket(BaseModel):
+    value: Optional[str | int] = None
+    count: int
+
+
+class DemographicHistogram(BaseModel):
+    field: str
+    buckets: List[DemographicHistogramBucket]
+    other_count: int  # users in the groups past the limit
+
+
+class DemographicStatsModel(BaseModel):
+    total: int
+    histograms: List[DemographicHistogram]
+
+
+# Fields that can be grouped by. Text columns hold UTF-8 in latin1 columns and need the cast.
+DEMOGRAPHIC_STATS_FIELDS = {
+    "country": True,
+    "affiliation": True,
+    "type": False,
+    "archive": False,
+    "subject_class": False,
+    "veto_status": False,
+}
+
+demographic_stats_cache: BoundedCache[tuple, DemographicStatsModel] = \
+    BoundedCache("demographic_stats", maxsize=256, ttl=300)
+
+
+@router.get("/stats")
+def get_demographic_stats(
+        group_by: List[str] = Query(["country"], description="country, affiliation, type, archive, subject_class, veto_status"),
+        limit: int = Query(100, ge=1, le=10000, description="Buckets per histogram, largest first"),
+        country: Optional[str] = Query(None),
+        type: Optional[int] = Query(None, description="Career status"),
+        archive: Optional[str] = Query(None),
+        veto_status: Optional[str] = Query(None),
+        flag_suspect: Optional[bool] = Query(None),
+        flag_proxy: Optional[bool] = Query(None),
+        include_deleted: bool = Query(False),
+        start_joined_date: Optional[date] = Query(None, description="Start date for filtering"),
+        end_joined_date: Optional[date] = Query(None, description="End date for filtering"),
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        db: Session = Depends(get_db)
+    ) -> DemographicStatsModel:
+    """Histograms of users by demographic field, computed with GROUP BY.
+
+    The result is cached for a few minutes per combination of parameters.
+    """
+    gate_admin_user(current_user)
+    for field in group_by:
+        if field not in DEMOGRAPHIC_STATS_FIELDS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Invalid group_by field {field}")
+
+    cache_key = (tuple(group_by), limit, country, type, archive, veto_status, flag_suspect, flag_proxy,
+                 include_deleted, start_joined_date, end_joined_date)
+    stats = demographic_stats_cache.get(cache_key)
+    if stats is not None:
+        return stats
+
+    conditions = []
+    if country is not None:
+        conditions.append(Demographic.country == country)
+    if type is not None:
+        conditions.append(Demographic.type == type)
+    if archive is not None:
+        conditions.append(Demographic.archive == archive)
+    if veto_status is not None:
+        conditions.append(Demographic.veto_status == veto_status)
+    if flag_suspect is not None:
+        conditions.append(Demographic.flag_suspect == flag_suspect)
+    if flag_proxy is not None:
+        conditions.append(Demographic.flag_proxy == flag_proxy)
+    need_user = not include_deleted or start_joined_date or end_joined_date
+    if not include_deleted:
+        conditions.append(TapirUser.flag_deleted == 0)
+    if start_joined_date or end_joined_date:
+        t_begin = datetime_to_epoch(start_joined_date, VERY_OLDE)
+        t_end = datetime_to_epoch(end_joined_date, date.today(), hour=23, minute=59, second=59)
+        conditions.append(TapirUser.joined_date.between(t_begin, t_end))
+
+    def filtered(stmt):
+        if need_user:
+            stmt = stmt.join(TapirUser, TapirUser.user_id == Demographic.user_id)
+        return stmt.where(*conditions)
+
+    total = db.execute(filtered(select(func.count()).select_from(Demographic))).scalar() or 0
+
+    histograms = []
+    for field in group_by:
+        column = getattr(Demographic, field)
+        if DEMOGRAPHIC_STATS_FIELDS[field]:
+            column = cast_for_encoding(column, db)
+        count_column = func.count().label("n")
+        rows = db.execute(
+            filtered(select(column.label("value"), count_column).select_from(Demographic))
+            .group_by(column)
+            .order_by(count_column.desc(), column.asc())
+            .limit(limit)
+        ).all()
+        buckets = [DemographicHistogramBucket(
+            value=row.value.decode("utf-8") if isinstance(row.value, bytes) else row.value,
+            count=row.n) for row in rows]
+        histograms.append(DemographicHistogram(
+            field=field,
+            buckets=buckets,
+            other_count=total - sum(bucket.count for bucket in buckets)))
+
+    stats = DemographicStatsModel(total=total, histograms=histograms)
+    demographic_stats_cache.set(cache_key, stats)
+    return stats
+
+
 @router.get("/{id:int}")
 def get_demographic(id:int,
                     current_user: ArxivUserClaims = Depends(get_authn_user),
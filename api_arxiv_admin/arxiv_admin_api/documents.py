@@ -1,14 +1,16 @@
 """arXiv paper display routes."""
 from __future__ import annotations
 
+import asyncio
 import os
+import tempfile
 from enum import Enum, StrEnum
 from pathlib import Path
 
 from arxiv.auth.user_claims import ArxivUserClaims
 from arxiv_bizlogic.fastapi_helpers import get_authn, get_authn_user
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request, UploadFile, File, Form
-from typing import Optional, List, BinaryIO, TextIO, cast as type_cast
+from typing import Optional, List, Tuple, Dict, Iterable, BinaryIO, TextIO, cast as type_cast
 from arxiv.base import logging
 from arxiv.db.models import Document, Submission, Metadata, PaperOwner, Demographic, TapirUser
 from sqlalchemy import func, and_, desc, cast, LargeBinary, Row, text
@@ -17,19 +19,23 @@ from pydantic import BaseModel, ConfigDict
 from datetime import datetime, date, timedelta
 # from .models import CrossControlModel
 import re
+import tarfile
 import time
 from arxiv.identifier import Identifier as arXivID
 
 from arxiv_bizlogic.latex_helpers import convert_latex_accents
 from arxiv_bizlogic.sqlalchemy_helper import sa_model_to_pydandic_model
-from starlette.responses import RedirectResponse, FileResponse, StreamingResponse
+from starlette.responses import RedirectResponse, FileResponse, StreamingResponse, JSONResponse
 
 from . import get_db, datetime_to_epoch, VERY_OLDE, get_current_user
+from .helpers.bounded_cache import BoundedCache
 from .helpers.db_compat import cast_for_encoding
 from .accessors import LocalAbsAccessor, LocalTarballAccessor, LocalPDFAccessor, GCPAbsAccessor, GCPTarballAccessor, \
     GCPPDFAccessor, GCPStorage, BaseAccessor, LocalOutcomeAccessor, GCPOutcomeAccessor, GCPBlobAccessor, \
-    LocalFileAccessor, VersionedFlavor, LocalPathAccessor
+    LocalFileAccessor, VersionedFlavor, LocalPathAccessor, UploadDigest
+from .biz.tarball_manifest import TarballManifestModel, TarballChangedError, get_tarball_manifest
 from .helpers.mui_datagrid import MuiDataGridFilter
+from .helpers.sparse_fields import parse_fields, project_query, sparse_response, decode_bytes
 from .metadata import MetadataModel
 from .pubsub.event_schemas import BasePaperMessage
 from .pubsub.post_pubsub import post_pubsub_event
@@ -58,32 +64,11 @@ router = APIRouter(prefix="/documents")
 
 yymm_re = re.compile(r"^\d{4}\.\d{0,5}")
 
-class TimedCache:
-    def __init__(self, expiration_seconds=60):
-        self.cache = {}
-        self.expiration_seconds = expiration_seconds
+last_submission_cache: BoundedCache[int, int] = BoundedCache("last_submission_id", maxsize=10000, ttl=60)
 
-    def set(self, key, value):
-        self.cache[key] = (value, time.time() + self.expiration_seconds)
+# Fields of DocumentModel that populate_remaining_fields fills in
+DOCUMENT_REMAINING_FIELDS = ("last_submission_id", "abs_categories", "author_ids")
 
-    def get(self, key):
-        # Check if the key exists and is not expired
-        if key in self.cache:
-            value, expiry = self.cache[key]
-            if time.time() < expiry:
-                return value
-            else:
-                # Remove expired key
-                del self.cache[key]
-        return None  # Return None if not found or expired
-
-    def __contains__(self, key):
-        return self.get(key) is not None
-
-    def clear(self):
-        self.cache.clear()
-
-last_submission_cache = TimedCache()
 
 class DocumentModel(BaseModel):
     id: int # document_id
@@ -121,45 +106,90 @@ class DocumentModel(BaseModel):
 
     @staticmethod
     def to_model(session: Session, row: Row | dict | DocumentModel) -> DocumentModel:
-        if isinstance(row, Row):
-            data = sa_model_to_pydandic_model(row, DocumentModel, name_map={"document_id": "id"})
-        elif isinstance(row, dict):
-            data = row
-        else:
-            data = row.model_dump()
-        model_data = DocumentModel.model_validate(data)
-        return model_data.populate_remaining_fields(session)
-
+        return DocumentModel.to_models(session, [row])[0]
 
-    def populate_remaining_fields(self, session: Session) -> DocumentModel:
-        last_submission_id = last_submission_cache.get(self.id)
-        if last_submission_id is None:
-            last_submission_id = (
-                session.query(func.max(Submission.submission_id))
-                .filter(Submission.document_id == self.id)
-                .scalar()
-            )
-            if last_submission_id is None:
-                last_submission_id = 0
-            last_submission_cache.set(self.id, last_submission_id)
+    @staticmethod
+    def to_models(session: Session, rows: Iterable[Row | dict | DocumentModel]) -> List[DocumentModel]:
+        """to_model of each row, with the remaining fields looked up for all of the rows at once."""
+        models = []
+        for row in rows:
+            if isinstance(row, Row):
+                data = sa_model_to_pydandic_model(row, DocumentModel, name_map={"document_id": "id"})
+            elif isinstance(row, dict):
+                data = row
+            else:
+                data = row.model_dump()
+            models.append(DocumentModel.model_validate(data))
+        return DocumentModel.populate_remaining_fields_of(session, models)
 
-        if last_submission_id != 0:
-            self.last_submission_id = last_submission_id
 
-        metadata: Metadata | None = session.query(Metadata).filter(
-            and_(Metadata.document_id == self.id,
-                 Metadata.is_current == 1,
-                 Metadata.is_withdrawn == 0)).order_by(desc(Metadata.metadata_id)).first()
-        if metadata:
-            self.abs_categories = metadata.abs_categories
+    @staticmethod
+    def to_sparse_response(session: Session, rows: List[Row], fields: Tuple[str, ...], total: int) -> JSONResponse:
+        """
+        The rows of a projected base_select. The fields that are not columns are looked up only
+        when asked for.
+        """
+        data = [decode_bytes(row._asdict()) for row in rows]
+        remaining = [name for name in DOCUMENT_REMAINING_FIELDS if name in fields]
+        if remaining:
+            documents = DocumentModel.populate_remaining_fields_of(
+                session, [DocumentModel.model_construct(**row) for row in data])
+            for row, document in zip(data, documents):
+                for name in remaining:
+                    row[name] = getattr(document, name)
+        return sparse_response(DocumentModel, fields, data, total)
 
-        owner: PaperOwner
-        self.author_ids = [owner.user_id for owner in session.query(
-            PaperOwner).filter(PaperOwner.document_id == self.id).join(Demographic, and_(
-            Demographic.user_id == PaperOwner.user_id,
-            Demographic.flag_proxy == 0)).all()]
+    def populate_remaining_fields(self, session: Session) -> DocumentModel:
+        return DocumentModel.populate_remaining_fields_of(session, [self])[0]
 
-        return self
+    @staticmethod
+    def populate_remaining_fields_of(session: Session, documents: List[DocumentModel]) -> List[DocumentModel]:
+        """
+        Fill in last_submission_id, abs_categories and author_ids of the documents with one
+        query each, instead of three per document.
+        """
+        doc_ids = list({document.id for document in documents})
+        if not doc_ids:
+            return documents
+
+        last_submission_ids: Dict[int, int] = {}
+        misses = []
+        for doc_id in doc_ids:
+            last_submission_id = last_submission_cache.get(doc_id)
+            if last_submission_id is None:
+                misses.append(doc_id)
+            else:
+                last_submission_ids[doc_id] = last_submission_id
+        if misses:
+            found = dict(session.query(Submission.document_id, func.max(Submission.submission_id))
+                         .filter(Submission.document_id.in_(misses))
+                         .group_by(Submission.document_id).all())
+            for doc_id in misses:
+                last_submission_ids[doc_id] = found.get(doc_id) or 0
+                last_submission_cache.set(doc_id, last_submission_ids[doc_id])
+
+        # The latest current version of each document
+        abs_categories: Dict[int, Optional[str]] = {}
+        for doc_id, categories in session.query(Metadata.document_id, Metadata.abs_categories).filter(
+                and_(Metadata.document_id.in_(doc_ids),
+                     Metadata.is_current == 1,
+                     Metadata.is_withdrawn == 0)).order_by(desc(Metadata.metadata_id)).all():
+            abs_categories.setdefault(doc_id, categories)
+
+        author_ids: Dict[int, List[int]] = {doc_id: [] for doc_id in doc_ids}
+        for doc_id, user_id in session.query(PaperOwner.document_id, PaperOwner.user_id).filter(
+                PaperOwner.document_id.in_(doc_ids)).join(Demographic, and_(
+                Demographic.user_id == PaperOwner.user_id,
+                Demographic.flag_proxy == 0)).all():
+            author_ids[doc_id].append(user_id)
+
+        for document in documents:
+            if last_submission_ids[document.id] != 0:
+                document.last_submission_id = last_submission_ids[document.id]
+            if document.id in abs_categories:
+                document.abs_categories = abs_categories[document.id]
+            document.author_ids = list(author_ids[document.id])
+        return documents
 
     def current_version(self, session: Session) -> Optional[MetadataModel]:
         """Get the current version of the document"""
@@ -169,7 +199,7 @@ class DocumentModel(BaseModel):
         return MetadataModel.model_validate(sa_model_to_pydandic_model(metadata, MetadataModel, name_map={"metadata_id": "id"}))
 
 
-@router.get('/')
+@router.get('/', response_model=List[DocumentModel])
 async def list_documents(
         response: Response,
         _sort: Optional[str] = Query("id", description="sort by"),
@@ -185,8 +215,10 @@ async def list_documents(
         end_date: Optional[date] = Query(None, description="End date for filtering"),
         paper_id: Optional[str] = Query(None, description="arXiv ID"),
         title: Optional[str] = Query(None, description="Document title"),
+        _fields: Optional[str] = Query(None, description="Comma separated fields to return. All when not given."),
         db: Session = Depends(get_db)
-    ) -> List[DocumentModel]:
+    ) -> List[DocumentModel] | JSONResponse:
+    fields = parse_fields(_fields, DocumentModel)
     query = DocumentModel.base_select(db)
 
     if _start < 0 or _end < _start:
@@ -295,13 +327,18 @@ async def list_documents(
         _end = len(id)
         query = query.filter(Document.document_id.in_(id))
 
+    if fields is not None:
+        query = project_query(query, fields)
+
     count = query.count()
     response.headers['X-Total-Count'] = str(count)
     if _start is None:
         _start = 0
     if _end is None:
         _end = 100
-    result: List[DocumentModel] = [DocumentModel.to_model(db, item) for item in query.offset(_start).limit(_end - _start).all()]
+    if fields is not None:
+        return DocumentModel.to_sparse_response(db, query.offset(_start).limit(_end - _start).all(), fields, count)
+    result: List[DocumentModel] = DocumentModel.to_models(db, query.offset(_start).limit(_end - _start).all())
     return result
 
 
@@ -589,7 +626,7 @@ def get_local_source_accessor(xid: arXivID, metadata: Metadata, latest: bool = T
     raise ValueError(f"Unknown source format: {metadata.source_format}")
 
 
-def list_related_files(xid: arXivID, all_metadata: List[Metadata], doc_storage: GCPStorage) -> List[BaseAccessor]:
+def list_related_files(xid: arXivID, all_metadata: List[Metadata], doc_storage: Optional[GCPStorage]) -> List[BaseAccessor]:
     candidate_files: List[BaseAccessor] = []
     max_version = max([metadata.version for metadata in all_metadata])
 
@@ -666,13 +703,29 @@ def to_content_type(flavor: str ) -> str:
        "outcome": "application/gzip",
     }.get(flavor, "application/octet-stream")
 
+def local_file_response(blob: LocalFileAccessor | LocalPathAccessor, media_type: str, filename: str) -> FileResponse:
+    """Serve a file under /data or /cache without copying it through the worker.
+
+    FileResponse hands the path to the ASGI server when it supports the "http.response.pathsend"
+    extension, which lets the server sendfile(2) it. Otherwise, Starlette reads the file in a
+    worker thread, so the event loop is not blocked either way.
+    """
+    return FileResponse(
+        blob.local_path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="attachment",
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @router.get("/{id:str}/files/{blob_id:str}")
 async def download_document_file(
         id:int,
         blob_id: str,
         request: Request,
         current_user: ArxivUserClaims = Depends(get_authn_user),
-        session: Session = Depends(get_db)) -> StreamingResponse:
+        session: Session = Depends(get_db)) -> Response:
     """Regenerate document artifacts."""
     doc: Optional[Document] = session.query(Document).filter(Document.document_id == id).one_or_none()
     if not doc:
@@ -700,6 +753,10 @@ async def download_document_file(
 
             filename = os.path.basename(blob.local_path)
             media_type = to_content_type(blob.flavor)
+            if isinstance(blob, (LocalFileAccessor, LocalPathAccessor)):
+                # Local files skip the Python read loop - see local_file_response()
+                return local_file_response(blob, media_type, filename)
+
             headers = {
                 "Content-Type": media_type,
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -717,6 +774,65 @@ async def download_document_file(
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"File {doc.paper_id} {blob_id} not found")
 
 
+@router.get("/{id:str}/files/{blob_id:str}/manifest")
+async def get_document_file_manifest(
+        id:int,
+        blob_id: str,
+        request: Request,
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        session: Session = Depends(get_db)) -> TarballManifestModel:
+    """List the members of the latest source (or outcome) tarball of the document.
+
+    The manifest is cached by the object generation, so only the first request after an upload
+    reads the archive. 409 if the archive is replaced while it is read.
+    """
+    doc: Optional[Document] = session.query(Document).filter(Document.document_id == id).one_or_none()
+    if not doc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Document {id} not found")
+
+    if doc.submitter_id != current_user.user_id and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to see document files")
+
+    if blob_id not in ["tarball", "outcome"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{blob_id} is not a tarball")
+
+    latest_metadata: Optional[Metadata] = session.query(Metadata).filter(Metadata.document_id == id).order_by(desc(Metadata.version)).first()
+    if not latest_metadata:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Document metadata {id} not found")
+
+    doc_storage: Optional[GCPStorage] = request.app.extra.get("DOCUMENT_STORAGE")
+    blobs: list[BaseAccessor] = list_related_files(arXivID(doc.paper_id), [latest_metadata], doc_storage)
+
+    for blob in blobs:
+        if blob.flavor != blob_id:
+            continue
+        generation = await blob.generation
+        if generation is None:
+            continue
+        try:
+            return await get_tarball_manifest(blob, generation)
+        except TarballChangedError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                                detail=f"{blob.basename} was replaced while it was read. Try again.") from exc
+        except tarfile.TarError as exc:
+            logger.warning(f"Failed to read {blob.canonical_name}: {exc}")
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                detail=f"{blob.basename} is not a readable tarball")
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"File {doc.paper_id} {blob_id} not found")
+
+
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def copy_upload(uploading: UploadFile, fd_to: BinaryIO) -> UploadDigest:
+    """Copy the uploaded file to fd_to, computing its digest on the way."""
+    digest = UploadDigest()
+    while chunk := await uploading.read(UPLOAD_READ_CHUNK_SIZE):
+        digest.update(chunk)
+        fd_to.write(chunk)
+    return digest
+
+
 @router.post("/{id:str}/files")
 async def upload_document_file(
         id: int,
@@ -742,7 +858,7 @@ async def upload_document_file(
 
     xid = arXivID(doc.paper_id)
     # Determine which accessor to use based on file_type and available storage
-    accessor: Optional[BaseAccessor]
+    accessor: Optional[BaseAccessor] = None
 
     doc_storage: GCPStorage = request.app.extra.get("DOCUMENT_STORAGE")
 
@@ -779,14 +895,24 @@ async def upload_document_file(
             logger.warning(f"Failed to create parent directory for local file {accessor.local_path}: {e}")
             pass
 
-    # Stream the file directly to storage
     try:
-        with type_cast(BinaryIO, accessor.open(mode='wb')) as fd:
-            while chunk := await uploading.read(65536):  # 8KB chunks
-                fd.write(chunk)
+        if isinstance(accessor, GCPBlobAccessor):
+            # Spool once while hashing, then let GCS take the parts in parallel
+            with tempfile.NamedTemporaryFile(prefix="upload-", suffix=f".{file_type}") as spool:
+                digest = await copy_upload(uploading, type_cast(BinaryIO, spool))
+                spool.flush()
+                await accessor.upload_large_from_filename(
+                    spool.name, digest,
+                    part_size=request.app.extra.get("DOCUMENT_UPLOAD_PART_SIZE", 32 * 1024 * 1024),
+                    max_workers=request.app.extra.get("DOCUMENT_UPLOAD_MAX_WORKERS", 8))
+        else:
+            # Stream the file directly to storage
+            with type_cast(BinaryIO, accessor.open(mode='wb')) as fd:
+                digest = await copy_upload(uploading, fd)
 
         logger.info(f"Uploaded {file_type} file for document {id} ({doc.paper_id})",
-                   extra={"document_id": id, "paper_id": doc.paper_id, "file_type": file_type})
+                   extra={"document_id": id, "paper_id": doc.paper_id, "file_type": file_type,
+                          "size": digest.size, "md5": digest.md5_base64, "crc32c": digest.crc32c_base64})
 
     except Exception as e:
         logger.error(f"Failed to upload {file_type} file for document {id}: {e}",
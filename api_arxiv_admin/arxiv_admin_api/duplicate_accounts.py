@@ -0,0 +1,99 @@
+"""
+Candidate duplicate accounts found by bin/find_duplicate_accounts.py
+"""
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import Optional, List
+
+from sqlalchemy import ColumnElement, select, func
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict
+
+from arxiv.base import logging
+
+from . import get_db, is_admin_user
+from .biz.duplicate_accounts import duplicate_candidates_table, duplicate_candidates_available
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(is_admin_user)], prefix="/duplicate_accounts")
+
+
+class DuplicateAccountModel(BaseModel):
+    id: int
+    user_id: int
+    other_user_id: int
+    score: int
+    reasons: List[str]
+    detected_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @staticmethod
+    def from_row(row) -> "DuplicateAccountModel":
+        return DuplicateAccountModel(
+            id=row.candidate_id,
+            user_id=row.user_id,
+            other_user_id=row.other_user_id,
+            score=row.score,
+            reasons=row.reasons.split(",") if row.reasons else [],
+            detected_at=row.detected_at,
+        )
+
+
+@router.get('/')
+async def list_duplicate_accounts(
+        response: Response,
+        _sort: Optional[str] = Query("score", description="sort by"),
+        _order: Optional[str] = Query("DESC", description="sort order"),
+        _start: int = Query(0, alias="_start"),
+        _end: int = Query(100, alias="_end"),
+        user_id: Optional[int] = Query(None, description="Either user of the pair"),
+        min_score: Optional[int] = Query(None, description="Lowest score"),
+        reason: Optional[str] = Query(None, description="email, name or cookie"),
+        db: Session = Depends(get_db)
+    ) -> List[DuplicateAccountModel]:
+    if _start < 0 or _end < _start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid start or end index")
+    if not duplicate_candidates_available(db):
+        response.headers['X-Total-Count'] = "0"
+        return []
+
+    table = duplicate_candidates_table
+    conditions: List[ColumnElement[bool]] = []
+    if user_id is not None:
+        conditions.append((table.c.user_id == user_id) | (table.c.other_user_id == user_id))
+    if min_score is not None:
+        conditions.append(table.c.score >= min_score)
+    if reason:
+        conditions.append(table.c.reasons.like(f"%{reason}%"))
+
+    order_columns = []
+    for key in (_sort or "score").split(","):
+        if key == "id":
+            key = "candidate_id"
+        column = table.c.get(key)
+        if column is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Invalid sort key {key}")
+        order_columns.append(column.desc() if _order == "DESC" else column.asc())
+    # Stable pages
+    order_columns.append(table.c.candidate_id.asc())
+
+    count = db.execute(select(func.count()).select_from(table).where(*conditions)).scalar()
+    response.headers['X-Total-Count'] = str(count)
+    rows = db.execute(select(table).where(*conditions).order_by(*order_columns)
+                      .offset(_start).limit(_end - _start)).all()
+    return [DuplicateAccountModel.from_row(row) for row in rows]
+
+
+@router.get('/{id:int}')
+async def duplicate_account_data(id: int, db: Session = Depends(get_db)) -> DuplicateAccountModel:
+    if duplicate_candidates_available(db):
+        row = db.execute(select(duplicate_candidates_table)
+                         .where(duplicate_candidates_table.c.candidate_id == id)).one_or_none()
+        if row:
+            return DuplicateAccountModel.from_row(row)
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
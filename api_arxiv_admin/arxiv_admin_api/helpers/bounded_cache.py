@@ -0,0 +1,150 @@
+"""In-process cache with a size bound, TTL and counters.
+
+Every cache created here registers itself, so /system/caches can report all of them, and one
+daemon thread sweeps expired entries from all of them. The registry holds the caches weakly and
+by identity: two caches may share a name (e.g. one per app instance), and a cache that is gone
+drops out.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+SWEEP_INTERVAL_SECONDS = 30.0
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    ttl: Optional[float] = None
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class BoundedCache(Generic[K, V]):
+    """LRU cache with an optional TTL.
+
+    Entries past the TTL are dropped when read and by the background sweeper, and the least
+    recently used entry goes when the cache is full. on_invalidate hooks are called with the key
+    (or None for clear()) whenever an entry is dropped on purpose, so dependent state can follow.
+    The cache is safe to use from the threadpool that runs sync endpoints.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidation_hooks: List[Callable[[Optional[K]], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        register_cache(self)
+
+    def _expiry(self) -> float:
+        return time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if time.monotonic() < expiry:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = (value, self._expiry())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def on_invalidate(self, hook: Callable[[Optional[K]], None]) -> None:
+        """Call hook(key) after invalidate(key), and hook(None) after clear()."""
+        self._invalidation_hooks.append(hook)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+        for hook in self._invalidation_hooks:
+            hook(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+        for hook in self._invalidation_hooks:
+            hook(None)
+
+    def sweep(self) -> int:
+        """Drop the expired entries. Returns how many were dropped."""
+        if self.ttl is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_value, expiry) in self._data.items() if expiry <= now]
+            for key in expired:
+                del self._data[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(name=self.name, size=len(self._data), maxsize=self.maxsize, ttl=self.ttl,
+                          hits=self.hits, misses=self.misses, evictions=self.evictions,
+                          expirations=self.expirations, invalidations=self.invalidations)
+
+
+_caches: "weakref.WeakSet[BoundedCache[Any, Any]]" = weakref.WeakSet()
+_caches_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+
+
+def register_cache(cache: BoundedCache[Any, Any]) -> None:
+    global _sweeper
+    with _caches_lock:
+        _caches.add(cache)
+        # Under the lock, so caches created from several threads at once start one sweeper
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name="bounded_cache_sweeper", daemon=True)
+            _sweeper.start()
+
+
+def registered_caches() -> List[BoundedCache[Any, Any]]:
+    with _caches_lock:
+        return sorted(_caches, key=lambda cache: cache.name)
+
+
+def _sweep_forever() -> None:
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        for cache in registered_caches():
+            cache.sweep()
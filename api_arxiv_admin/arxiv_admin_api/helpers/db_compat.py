@@ -4,8 +4,8 @@ This module provides utilities to handle differences between MySQL and SQLite,
 allowing the codebase to work with both databases without MySQL-specific code.
 """
 
-from typing import Any, TYPE_CHECKING, Union, cast as type_cast
-from sqlalchemy import cast, func, LargeBinary
+from typing import Any, Iterable, TYPE_CHECKING, Union, cast as type_cast
+from sqlalchemy import cast, func, insert, text, Column, Integer, LargeBinary, MetaData, Table
 from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
@@ -98,3 +98,36 @@ def group_concat_compat(column: Union[ColumnElement[Any], InstrumentedAttribute[
     else:
         # Fallback to group_concat
         return func.group_concat(column, separator)
+
+
+ID_SET_INSERT_BATCH_SIZE = 10000
+
+
+def load_id_set(session: 'Session', table_name: str, ids: Iterable[int]) -> Table:
+    """Load integer ids into a session temporary table and return the table to join against.
+
+    A long IN (...) list makes a large statement and a poor plan on MySQL. A temporary table
+    with a primary key keeps the statement small and lets the join use the index. Both MySQL
+    and SQLite keep temporary tables per connection, so the table is private to the session's
+    transaction and emptied on every call.
+
+    Args:
+        session: SQLAlchemy session the filtered query runs in
+        table_name: Name of the temporary table
+        ids: The ids. Duplicates are dropped.
+
+    Returns:
+        Table with a single "id" column
+
+    Example:
+        >>> id_table = load_id_set(session, "tmp_user_ids", user_ids)
+        >>> query = query.join(id_table, id_table.c.id == TapirUser.user_id)
+    """
+    id_table = Table(table_name, MetaData(), Column("id", Integer, primary_key=True))
+    session.execute(text(f"CREATE TEMPORARY TABLE IF NOT EXISTS {table_name} (id INTEGER NOT NULL PRIMARY KEY)"))
+    session.execute(text(f"DELETE FROM {table_name}"))
+    sorted_ids = sorted(set(ids))
+    for offset in range(0, len(sorted_ids), ID_SET_INSERT_BATCH_SIZE):
+        session.execute(insert(id_table),
+                        [{"id": id_value} for id_value in sorted_ids[offset:offset + ID_SET_INSERT_BATCH_SIZE]])
+    return id_table
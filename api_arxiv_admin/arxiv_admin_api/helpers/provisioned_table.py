@@ -0,0 +1,43 @@
+"""Tables the admin API adds to the arXiv schema.
+
+They are created by a bin/ script rather than by the schema migrations, so the code that uses one
+first asks whether it is there and does without it until then. The answer is cached for a few
+minutes, so the check is not an information_schema query per request.
+"""
+from typing import Callable
+
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.orm import Session
+
+from .bounded_cache import BoundedCache
+from .db_compat import get_dialect_name
+
+AVAILABLE_TTL_SECONDS = 300
+
+
+class ProvisionedTable:
+    """A table created on demand by create(session), with a cached existence check."""
+
+    def __init__(self, name: str, create: Callable[[Session], None], cache_name: str):
+        self.name = name
+        self._create = create
+        self._available: BoundedCache[str, bool] = BoundedCache(cache_name, maxsize=8, ttl=AVAILABLE_TTL_SECONDS)
+
+    @classmethod
+    def from_metadata(cls, name: str, metadata: MetaData, cache_name: str) -> "ProvisionedTable":
+        """The table is created from its SQLAlchemy definition in metadata."""
+        return cls(name, lambda session: metadata.create_all(session.connection(), checkfirst=True), cache_name)
+
+    def ensure(self, session: Session) -> None:
+        """Create the table if it is not there."""
+        self._create(session)
+        self._available.clear()
+
+    def available(self, session: Session) -> bool:
+        """True when the table exists. The answer is cached for a few minutes."""
+        key = get_dialect_name(session)
+        available = self._available.get(key)
+        if available is None:
+            available = inspect(session.bind).has_table(self.name) if session.bind else False
+            self._available.set(key, available)
+        return available
@@ -6,7 +6,6 @@ from typing import Any, Callable, Optional
 
 import httpcore
 import httpx
-from cachetools import TTLCache
 from fastapi import Request, Response, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.applications import ASGIApp
@@ -3,16 +3,16 @@ import asyncio
 from datetime import datetime
 from dataclasses import dataclass
 
+from .bounded_cache import BoundedCache
+
 class UserSession:
     user_locks: Dict[str, asyncio.Lock]  # A dictionary to store locks for individual users
-    user_cookies: Dict[str, Any]          # Simulated storage of cookiess per user
-    cookies_expiration: Dict[str, datetime]  # Simulated storage of cookies expiry times per user
+    user_cookies: BoundedCache[str, Any]  # Refreshed cookies per user. Expires with the access token.
 
-    def __init__(self):
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600):
         self.global_lock = asyncio.Lock()
         self.user_locks = {}
-        self.user_cookies = {}
-        self.cookies_expiration = {}
+        self.user_cookies = BoundedCache("user_cookies", maxsize=maxsize, ttl=ttl)
 
     async def lock(self, user_id: str) -> None:
         user_lock = self.user_locks.get(user_id)
@@ -34,11 +34,11 @@ class UserSession:
 
     async def set_user_cookies_with_lock(self, user_id: str, cookies: Any) -> None:
         await self.lock(user_id)
-        self.user_cookies[user_id] = cookies
+        self.user_cookies.set(user_id, cookies)
         self.unlock(user_id)
 
     def set_user_cookies(self, user_id: str, cookies: Any) -> None:
-        self.user_cookies[user_id] = cookies
+        self.user_cookies.set(user_id, cookies)
 
     def get_user_cookies(self, user_id: str) -> Optional[Any]:
         return self.user_cookies.get(user_id)
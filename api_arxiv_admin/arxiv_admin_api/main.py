@@ -56,10 +56,12 @@ from arxiv_admin_api.email_patterns import router as email_patterns_router
 from arxiv_admin_api.endorsement_domains import router as endorsement_domains_router
 from arxiv_admin_api.system_status import router as system_status_router
 from arxiv_admin_api.bib_feeds import router as bib_feeds_router, bib_feed_updates_router
+from arxiv_admin_api.duplicate_accounts import router as duplicate_accounts_router
 
 # from arxiv_admin_api.frontend import router as frontend_router
 # from arxiv_admin_api.helpers.session_cookie_middleware import SessionCookieMiddleware
 from arxiv_admin_api.helpers.user_session import UserSession
+from arxiv_admin_api.biz.user_autocomplete import start_user_autocomplete_poller
 
 from arxiv_admin_api.public_users import router as public_users_router
 
@@ -245,12 +247,17 @@ def create_app(*args, **kwargs) -> FastAPI:
         GCP_SERVICE_REQUEST_SA=os.environ.get('GCP_SERVICE_REQUEST_SA'),
         GCP_SERVICE_REQUEST_ENDPOINT=os.environ.get('GCP_SERVICE_REQUEST_ENDPOINT', "localhost:8080"),
         DOCUMENT_STORAGE=document_storage,
+        DOCUMENT_UPLOAD_PART_SIZE=int(os.environ.get('DOCUMENT_UPLOAD_PART_SIZE', str(32 * 1024 * 1024))),
+        DOCUMENT_UPLOAD_MAX_WORKERS=int(os.environ.get('DOCUMENT_UPLOAD_MAX_WORKERS', "8")),
         USER_ACTION_SITE=USER_ACTION_SITE,
         USER_ACTION_URLS=USER_ACTION_URLS,
         ARXIV_CHECK_URL=ARXIV_CHECK_URL,
         **extra_options
     ) # type: ignore
 
+    if not TESTING:
+        start_user_autocomplete_poller(float(os.environ.get('USER_AUTOCOMPLETE_POLL_SECONDS', "60")))
+
     if ADMIN_APP_URL not in origins:
         origins.append(ADMIN_APP_URL)
 
@@ -319,6 +326,7 @@ def create_app(*args, **kwargs) -> FastAPI:
     app.include_router(endorsement_domains_router, prefix="/v1")
     app.include_router(bib_feeds_router, prefix="/v1")
     app.include_router(bib_feed_updates_router, prefix="/v1")
+    app.include_router(duplicate_accounts_router, prefix="/v1", dependencies=[Depends(gatekeep_users)])
 
     @app.middleware("http")
     async def apply_response_headers(request: Request, call_next: Callable) -> Response:
@@ -1,6 +1,7 @@
 """arXiv paper display routes."""
 from arxiv.db import Base
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import JSONResponse
 from typing import Optional, List
 from arxiv.base import logging
 from arxiv.db.models import Metadata, Document
@@ -17,6 +18,7 @@ from arxiv_bizlogic.sqlalchemy_helper import update_model_fields, sa_model_to_py
 
 from . import get_db, datetime_to_epoch, VERY_OLDE
 from .helpers.db_compat import cast_for_encoding
+from .helpers.sparse_fields import parse_fields, project_query, sparse_response, decode_bytes
 from .biz.metadata_biz import propagate_metadata_to_document
 
 logger = logging.getLogger(__name__)
@@ -93,7 +95,7 @@ class MetadataModel(BaseModel):
         )
 
 
-@router.get('/')
+@router.get('/', response_model=List[MetadataModel])
 async def list_metadatas(
         response: Response,
         _sort: Optional[str] = Query("id", description="sort by"),
@@ -106,8 +108,10 @@ async def list_metadatas(
         end_date: Optional[date] = Query(None, description="End date for filtering"),
         document_id: Optional[str] = Query(None, description="Document ID"),
         paper_id: Optional[str] = Query(None, description="arXiv ID"),
+        _fields: Optional[str] = Query(None, description="Comma separated fields to return. All when not given."),
         db: Session = Depends(get_db)
-) -> List[MetadataModel]:
+) -> List[MetadataModel] | JSONResponse:
+    fields = parse_fields(_fields, MetadataModel)
     query = MetadataModel.base_select(db)
 
     if _start < 0 or _end < _start:
@@ -165,8 +169,15 @@ async def list_metadatas(
     else:
         query = query.filter(Metadata.metadata_id.in_(id))
 
+    if fields is not None:
+        query = project_query(query, fields)
+
     count = query.count()
     response.headers['X-Total-Count'] = str(count)
+    if fields is not None:
+        return sparse_response(MetadataModel, fields,
+                               [decode_bytes(item._asdict()) for item in query.offset(_start).limit(_end - _start).all()],
+                               count)
     result: List[MetadataModel] = [
         MetadataModel.model_validate(sa_model_to_pydandic_model(item, MetadataModel)) for item in query.offset(_start).limit(_end - _start).all()]
     return result
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 import datetime
 from enum import Enum, StrEnum
-from typing import Optional, Literal, List, Generic, TypeVar, Set, cast
+from typing import Optional, Literal, List, Generic, TypeVar, Set, Dict, cast
 import hashlib
 
 from arxiv.auth.user_claims import ArxivUserClaims
@@ -14,7 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Response,
 from sqlalchemy.exc import IntegrityError
 
 from sqlalchemy.orm import Session, Query as OrmQuery
-from sqlalchemy import insert, Row, and_
+from sqlalchemy import insert, update, bindparam, Row, and_
 from pydantic import BaseModel, Field, ConfigDict
 
 from arxiv.base import logging
@@ -24,7 +24,8 @@ from arxiv.db.models import OwnershipRequest, t_arXiv_ownership_requests_papers,
 from . import get_db, is_any_user, get_current_user, datetime_to_epoch, VERY_OLDE, get_client_host, get_tapir_session, \
     TapirSessionData, get_tracking_cookie
 from .documents import DocumentModel
-from .paper_owners import ownership_combo_key
+from .audit import record_admin_audit_events
+from .paper_owners import ownership_combo_key, existing_ownerships, OWNERSHIP_BATCH_SIZE
 
 T = TypeVar('T')
 class Partial(Generic[T]):
@@ -93,6 +94,13 @@ class OwnershipRequestModel(BaseModel):
         populate_document_ids(validated_data, session)
         return validated_data
 
+    @classmethod
+    def to_models(cls, records: List[Row], session: Session) -> List[OwnershipRequestModel]:
+        """to_model for the rows of base_query_with_audit, with the document ids of all of them at once."""
+        models = [cls.model_validate(record._asdict()) for record in records]
+        populate_document_ids_of_requests(models, session)
+        return models
+
 
 class CreateOwnershipRequestModel(BaseModel):
     user_id: Optional[str] = None
@@ -161,15 +169,50 @@ class OwnershipRequestNavi(BaseModel):
 
 
 def populate_document_ids(data: OwnershipRequestModel, session: Session):
-    data.document_ids = [
-        requested.document_id for requested in session.query(
+    populate_document_ids_of_requests([data], session)
+
+
+def populate_document_ids_of_requests(requests: List[OwnershipRequestModel], session: Session):
+    """Requested document ids and their paper ids for all of the requests, with two queries."""
+    if not requests:
+        return
+    requested: Dict[int, List[int]] = {int(data.id): [] for data in requests}
+    for row in session.query(
+            t_arXiv_ownership_requests_papers.c.request_id,
             t_arXiv_ownership_requests_papers.c.document_id
-        ).filter(
-            t_arXiv_ownership_requests_papers.c.request_id == int(data.id)
-        ).all()]
+    ).filter(
+        t_arXiv_ownership_requests_papers.c.request_id.in_(list(requested.keys()))
+    ).all():
+        requested[row.request_id].append(row.document_id)
+
+    all_document_ids = {document_id for document_ids in requested.values() for document_id in document_ids}
+    paper_ids: Dict[int, str] = {}
+    if all_document_ids:
+        paper_ids = {doc.document_id: doc.paper_id for doc in session.query(
+            Document.document_id, Document.paper_id).filter(Document.document_id.in_(all_document_ids)).all()}
 
-    doc: Document
-    data.paper_ids = [doc.paper_id for doc in session.query(Document).filter(Document.document_id.in_(data.document_ids)).all() ]
+    for data in requests:
+        data.document_ids = requested[int(data.id)]
+        data.paper_ids = [paper_ids[document_id] for document_id in data.document_ids if document_id in paper_ids]
+
+
+def paper_owner_tracking_cookie(tracking_cookie: Optional[str]) -> Optional[str]:
+    """The requester's tracking cookie as it fits in arXiv_paper_owners."""
+    tracking_cookie_col = PaperOwner.__table__.columns["tracking_cookie"]
+    tracking_cookie_max_len = getattr(tracking_cookie_col.type, "length", 32) or 32
+    if tracking_cookie and len(tracking_cookie) > tracking_cookie_max_len:
+        # ntai: 2025-03-30
+        # When the tracking cookie is longer than the column size (32), adding tracking cookie
+        # to the record fails as it is too long.
+        # There are two options - one is to chop it, or hash it. I chose to hash it since the original
+        # value cannot match anyway, and by hashing it, it has a chance to match it to the original
+        # value.
+        # The root cause is that the tapir_users' tracking_cookie has 255, and somehow, PaperOwner
+        # does not follow the original design, which is a mistake.
+        # I checked the database and 110+k tapir_users has the tracking cookie longer than 32 and thus,
+        # I don't understand how this has been working.
+        tracking_cookie = hashlib.md5(tracking_cookie.encode()).hexdigest()
+    return tracking_cookie
 
 
 @router.get("/")
@@ -290,7 +333,7 @@ def list_ownership_requests(
 
     if _end is None:
         _end = 100
-    result = [OwnershipRequestModel.to_model(item, session) for item in query.offset(_start).limit(_end - _start).all()]
+    result = OwnershipRequestModel.to_models(query.offset(_start).limit(_end - _start).all(), session)
     return result
 
 
@@ -598,21 +641,7 @@ if ($_SERVER["REQUEST_METHOD"]=="POST") {
     date = datetime_to_epoch(None, datetime.datetime.now(datetime.UTC))
     ownership_request.workflow_status = cast(Literal['pending', 'accepted', 'rejected'], workflow_status.value)
 
-    tracking_cookie = requester.tracking_cookie
-    tracking_cookie_col = PaperOwner.__table__.columns["tracking_cookie"]
-    tracking_cookie_max_len = getattr(tracking_cookie_col.type, "length", 32) or 32
-    if tracking_cookie and len(tracking_cookie) > tracking_cookie_max_len:
-        # ntai: 2025-03-30
-        # When the tracking cookie is longer than the column size (32), adding tracking cookie
-        # to the record fails as it is too long.
-        # There are two options - one is to chop it, or hash it. I chose to hash it since the original
-        # value cannot match anyway, and by hashing it, it has a chance to match it to the original
-        # value.
-        # The root cause is that the tapir_users' tracking_cookie has 255, and somehow, PaperOwner
-        # does not follow the original design, which is a mistake.
-        # I checked the database and 110+k tapir_users has the tracking cookie longer than 32 and thus,
-        # I don't understand how this has been working.
-        tracking_cookie = hashlib.md5(tracking_cookie.encode()).hexdigest()
+    tracking_cookie = paper_owner_tracking_cookie(requester.tracking_cookie)
 
     authored_documents = set(payload.authored_documents) if payload.authored_documents else set()
 
@@ -673,6 +702,175 @@ if ($_SERVER["REQUEST_METHOD"]=="POST") {
     except IntegrityError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The database operation failed due to integrity error. " + str(exc)) from exc
 
+
+class OwnershipRequestDecision(BaseModel):
+    request_id: int
+    workflow_status: Literal[WorkflowStatus.ACCEPTED, WorkflowStatus.REJECTED] = WorkflowStatus.ACCEPTED
+    document_ids: List[int] = Field([], description="The accepted documents. Ignored when rejected.")
+    authored_documents: Optional[List[int]] = Field(
+        None, description="Accepted document IDs that the requester is the author."
+    )
+
+
+class OwnershipRequestDecisionResult(BaseModel):
+    request_id: int
+    ok: bool
+    detail: Optional[str] = None
+    workflow_status: Optional[WorkflowStatus] = None
+    added_document_ids: List[int] = []
+    owned_document_ids: List[int] = []  # Already owned, skipped
+
+
+@router.post("/decisions")
+async def decide_ownership_requests(
+        decisions: List[OwnershipRequestDecision],
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        remote_ip: str = Depends(get_client_host),
+        remote_host: str = Depends(get_client_host_name),
+        session: Session = Depends(get_db)) -> List[OwnershipRequestDecisionResult]:
+    """Accept or reject many ownership requests in one transaction.
+
+    Each request is checked the same way as update_ownership_request. A request that fails a check
+    is reported and left alone; the rest are applied together, with one multi-row insert for the
+    ownerships, one for the admin audit records and one each for the request audits and statuses.
+    """
+    current_tapir_session_id = current_user.tapir_session_id
+
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can update ownership requests.")
+
+    request_ids = [decision.request_id for decision in decisions]
+    if len(set(request_ids)) != len(request_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ownership request ids must be unique.")
+
+    if not decisions:
+        return []
+    results: Dict[int, OwnershipRequestDecisionResult] = {
+        decision.request_id: OwnershipRequestDecisionResult(request_id=decision.request_id, ok=False)
+        for decision in decisions}
+
+    requests: Dict[int, Row] = {row.request_id: row for row in session.query(
+        OwnershipRequest.request_id, OwnershipRequest.user_id, OwnershipRequest.workflow_status).filter(
+        OwnershipRequest.request_id.in_(request_ids)).all()}
+    requested_document_ids = {document_id for decision in decisions for document_id in decision.document_ids}
+    existing_document_ids: Set[int] = set()
+    if requested_document_ids:
+        existing_document_ids = {doc.document_id for doc in session.query(Document.document_id).filter(
+            Document.document_id.in_(list(requested_document_ids))).all()}
+    requesters: Dict[int, Optional[str]] = {user.user_id: user.tracking_cookie for user in session.query(
+        TapirUser.user_id, TapirUser.tracking_cookie).filter(
+        TapirUser.user_id.in_(list({row.user_id for row in requests.values()}))).all()}
+
+    # The decisions that pass the checks
+    decided: List[OwnershipRequestDecision] = []
+    for decision in decisions:
+        result = results[decision.request_id]
+        ownership_request = requests.get(decision.request_id)
+        if ownership_request is None:
+            result.detail = "Ownership request id %s does not exist." % decision.request_id
+        elif ownership_request.workflow_status != WorkflowStatus.PENDING.value:
+            result.detail = f"Ownership request id {decision.request_id} has been decided as {ownership_request.workflow_status}."
+        elif ownership_request.user_id not in requesters:
+            result.detail = f"User {ownership_request.user_id} not found."
+        elif decision.workflow_status == WorkflowStatus.ACCEPTED and set(decision.document_ids) - existing_document_ids:
+            bads = sorted(set(decision.document_ids) - existing_document_ids)
+            result.detail = f"Ownership request id {decision.request_id} - the documents {bads!r} do not exist."
+        else:
+            decided.append(decision)
+
+    # Existing ownerships - Ignore them, as update_ownership_request does.
+    keys = list(dict.fromkeys(
+        (requests[decision.request_id].user_id, document_id)
+        for decision in decided if decision.workflow_status == WorkflowStatus.ACCEPTED
+        for document_id in decision.document_ids))
+    owned = existing_ownerships(session, keys)
+
+    date = datetime_to_epoch(None, datetime.datetime.now(datetime.UTC))
+    new_ownerships: List[dict] = []
+    audit_events = []
+    for decision in decided:
+        result = results[decision.request_id]
+        user_id = requests[decision.request_id].user_id
+        result.ok = True
+        result.workflow_status = decision.workflow_status
+        if decision.workflow_status != WorkflowStatus.ACCEPTED:
+            continue
+        tracking_cookie = paper_owner_tracking_cookie(requesters[user_id])
+        authored_documents = set(decision.authored_documents) if decision.authored_documents else set()
+        for document_id in dict.fromkeys(decision.document_ids):
+            if (user_id, document_id) in owned:
+                result.owned_document_ids.append(document_id)
+                continue
+            # Another request of the same user may have added it already
+            owned[(user_id, document_id)] = {}
+            result.added_document_ids.append(document_id)
+            new_ownerships.append(dict(
+                document_id=document_id,
+                user_id=user_id,
+                date=date,
+                added_by=int(current_user.user_id),
+                remote_addr=remote_ip,
+                remote_host=remote_host,
+                tracking_cookie=tracking_cookie,
+                valid=1,
+                flag_author=1 if document_id in authored_documents else 0,
+                flag_auto=0,
+            ))
+            audit_events.append(
+                AdminAudit_AddPaperOwner2(
+                    str(current_user.user_id),
+                    str(user_id),
+                    str(current_tapir_session_id),
+                    str(document_id),
+                    remote_ip=remote_ip,
+                    remote_hostname=remote_host,
+                    tracking_cookie=tracking_cookie,
+                ))
+
+    if not decided:
+        return list(results.values())
+
+    decided_ids = [decision.request_id for decision in decided]
+    audit_values = dict(session_id=int(current_tapir_session_id or 0), remote_addr=remote_ip,
+                        remote_host=remote_host, date=date)
+    audited_ids = {audit.request_id for audit in session.query(OwnershipRequestsAudit.request_id).filter(
+        OwnershipRequestsAudit.request_id.in_(decided_ids)).all()}
+    audit_table = OwnershipRequestsAudit.__table__
+
+    try:
+        for offset in range(0, len(new_ownerships), OWNERSHIP_BATCH_SIZE):
+            session.execute(insert(PaperOwner), new_ownerships[offset:offset + OWNERSHIP_BATCH_SIZE])
+        record_admin_audit_events(session, audit_events)
+
+        new_audits = [dict(request_id=request_id, tracking_cookie=requesters[requests[request_id].user_id] or "",
+                           **audit_values) for request_id in decided_ids if request_id not in audited_ids]
+        if new_audits:
+            session.execute(insert(OwnershipRequestsAudit), new_audits)
+        if audited_ids:
+            # The judgement has been made but the status is still pending - update the audit to match
+            session.execute(
+                update(audit_table).where(audit_table.c.request_id == bindparam("b_request_id")).values(
+                    tracking_cookie=bindparam("b_tracking_cookie"), **audit_values),
+                [dict(b_request_id=request_id, b_tracking_cookie=requesters[requests[request_id].user_id] or "")
+                 for request_id in decided_ids if request_id in audited_ids])
+
+        for workflow_status in (WorkflowStatus.ACCEPTED, WorkflowStatus.REJECTED):
+            ids = [decision.request_id for decision in decided if decision.workflow_status == workflow_status]
+            if ids:
+                session.execute(
+                    update(OwnershipRequest)
+                    .where(OwnershipRequest.request_id.in_(ids),
+                           OwnershipRequest.workflow_status == WorkflowStatus.PENDING.value)
+                    .values(workflow_status=workflow_status.value)
+                    .execution_options(synchronize_session=False))
+
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The database operation failed due to integrity error. " + str(exc)) from exc
+
+    return list(results.values())
+
 #
 # @router.post('/{request_id:int}/documents/')
 # async def post_ownership_request_decision(
@@ -1,10 +1,12 @@
 """arXiv ownership routes."""
 import base64
+import io
 import json
 import time
 from datetime import timedelta, datetime, date, UTC
+from enum import StrEnum
 from hashlib import sha256
-from typing import Optional, List, Tuple, Dict
+from typing import Any, Optional, List, Tuple, Dict, Iterator, Set
 import re
 
 from arxiv.auth.user_claims import ArxivUserClaims
@@ -18,7 +20,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response,
 from fastapi.responses import RedirectResponse
 from sqlalchemy.exc import IntegrityError
 
-from sqlalchemy import literal_column, func, and_  # , update, case, Select, distinct, exists, alias,  select, update
+from sqlalchemy import literal_column, func, and_, case, insert, select, tuple_, update  # Select, distinct, exists, alias
 
 from sqlalchemy.orm import Session  # , joinedload
 
@@ -27,6 +29,7 @@ from arxiv.base import logging
 from arxiv.db.models import PaperOwner, PaperPw, Document, DocumentCategory
 
 from . import get_db, datetime_to_epoch, VERY_OLDE, get_current_user, is_any_user, gate_admin_user, get_tracking_cookie
+from .audit import record_admin_audit_events
 from .biz.paper_owner_biz import generate_paper_pw
 from .dao.react_admin import ReactAdminUpdateResult
 from .helpers.db_compat import from_unixtime_compat
@@ -103,6 +106,38 @@ def ownership_combo_key(user_id: int, document_id: int):
     return f"user_{user_id}-doc_{document_id}"
 
 
+# Composite keys per tuple-IN query
+OWNERSHIP_BATCH_SIZE = 1000
+
+
+def ownership_key_column():
+    """(user_id, document_id), for tuple-IN"""
+    return tuple_(PaperOwner.user_id, PaperOwner.document_id)
+
+
+def existing_ownerships(session: Session, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], dict]:
+    """The ownership rows of the (user_id, document_id) keys, as dicts, with one query per batch of keys."""
+    found: Dict[Tuple[int, int], dict] = {}
+    for offset in range(0, len(keys), OWNERSHIP_BATCH_SIZE):
+        rows = session.execute(
+            select(
+                PaperOwner.document_id,
+                PaperOwner.user_id,
+                PaperOwner.date,
+                PaperOwner.added_by,
+                PaperOwner.remote_addr,
+                PaperOwner.remote_host,
+                PaperOwner.tracking_cookie,
+                PaperOwner.valid,
+                PaperOwner.flag_author,
+                PaperOwner.flag_auto,
+            ).where(ownership_key_column().in_(keys[offset:offset + OWNERSHIP_BATCH_SIZE]))
+        ).all()
+        for row in rows:
+            found[(row.user_id, row.document_id)] = row._asdict()
+    return found
+
+
 def to_ids(one_id: str) -> Tuple[Optional[int], Optional[int]]:
     """
     PaperOwnerModel ID -> (user_id, document_id)
@@ -284,8 +319,8 @@ async def list_ownerships(
 
     if with_document:
         doc_ids = [doc.document_id for doc in result]
-        docs_map = {d.id: d for d in [DocumentModel.model_validate(doc).populate_remaining_fields(session) for doc in
-                                  DocumentModel.base_select(session).filter(Document.document_id.in_(doc_ids)).all()]}
+        docs_map = {d.id: d for d in DocumentModel.to_models(
+            session, DocumentModel.base_select(session).filter(Document.document_id.in_(doc_ids)).all())}
         for onwnership in result:
             onwnership.document = docs_map.get(onwnership.document_id)
     return result
@@ -703,142 +738,127 @@ async def update_authorship(
 
     timestamp: int = datetime_to_epoch(datetime.fromisoformat(body.timestamp), datetime.now(UTC)) if body.timestamp else datetime_to_epoch(None, datetime.now(UTC))
 
-    existing_docs: Dict[str, PaperOwner] = {}
-    for doc__list in [body.not_authored, body.authored]:
+    # (user_id, document_id) -> flag_author, in the order given. An id in both lists ends up authored.
+    targets: Dict[Tuple[int, int], int] = {}
+    for flag, doc__list in enumerate([body.not_authored, body.authored]):
         for po_primary_key in doc__list:
             uid, did = to_ids(po_primary_key)
-            if uid is None:
+            if uid is None or did is None:
                 raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
                                     detail=f"Invalid id {po_primary_key}")
 
             if not current_user.is_admin and str(uid) != str(current_user.user_id):
                 raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN,
                                     detail="You can only work on your own.")
+            targets[(uid, did)] = flag
+
+    existing_docs = existing_ownerships(session, list(targets.keys()))
+
+    auto = 1 if body.auto else 0
+    valid = 1 if body.valid or body.valid is None else 0
+    new_ownerships: List[dict] = []
+    changed_keys: List[Tuple[int, int]] = []
+    audit_events = []
+    for (uid, did), flag in targets.items():
+        po_primary_key = ownership_combo_key(uid, did)
+        valid_changed = False
+        flag_changed = False
+
+        existing_ownership = existing_docs.get((uid, did))
+        if existing_ownership is None:
+            if action == "update":
+                logger.warning(f"New paper ownership record for {po_primary_key} is not created as action is update")
+                continue
+
+            if not current_user.is_admin:
+                logger.warning(f"New paper ownership record for {po_primary_key} is not created as non-admin user")
+                raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN,
+                                    detail="Only admin can create ownership/authorship records.")
+
+            if current_user.tapir_session_id is None:
+                raise HTTPException(status_code=http_status.HTTP_401_UNAUTHORIZED, detail="There is no Tapir session ID")
+
+            if current_user.user_id is None:
+                raise HTTPException(status_code=http_status.HTTP_401_UNAUTHORIZED, detail="User ID not found")
+
+            new_ownerships.append(dict(
+                document_id=did,
+                user_id=uid,
+                date=timestamp,
+                added_by=int(current_user.user_id),
+                remote_addr=remote_addr or "",
+                remote_host=remote_host or "",
+                tracking_cookie=tracking_cookie,
+                valid=valid,
+                flag_author=flag,
+                flag_auto=auto,
+            ))
+            audit_events.append(
+                AdminAudit_AddPaperOwner(
+                    str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
+                    remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
+            valid_changed = True
+            flag_changed = True
+        else:
+            changed = False
+            if existing_ownership["flag_author"] != flag:
+                existing_ownership["flag_author"] = flag
+                flag_changed = True
+                changed = True
 
-            po = session.query(PaperOwner).filter(PaperOwner.user_id == uid, PaperOwner.document_id == did).one_or_none()
-            if po:
-                existing_docs[po_primary_key] = po
+            if body.auto is not None and existing_ownership["flag_auto"] != auto:
+                existing_ownership["flag_auto"] = auto
+                changed = True
 
-    new_ownerships = []
-    for flag, doc__list in enumerate([body.not_authored, body.authored]):
-        if not doc__list:
-            continue
-        for po_primary_key in doc__list:
-            uid, did = to_ids(po_primary_key)
-            if uid is None or did is None:
-                raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
-                                    detail=f"Invalid id {po_primary_key}")
-            auto = 1 if body.auto else 0
-            valid = 1 if body.valid or body.valid is None else 0
-            valid_changed = False
-            flag_changed = False
-
-            if po_primary_key not in existing_docs:
-                if action == "update":
-                    logger.warning(f"New paper ownership record for {po_primary_key} is not created as action is update")
-                    continue
-
-                if not current_user.is_admin:
-                    logger.warning(f"New paper ownership record for {po_primary_key} is not created as non-admin user")
-                    raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN,
-                                        detail="Only admin can create ownership/authorship records.")
-
-                if current_user.tapir_session_id is None:
-                    raise HTTPException(status_code=http_status.HTTP_401_UNAUTHORIZED, detail="There is no Tapir session ID")
-
-                if current_user.user_id is None:
-                    raise HTTPException(status_code=http_status.HTTP_401_UNAUTHORIZED, detail="User ID not found")
-
-                new_ownership = PaperOwner(
-                    document_id=did,
-                    user_id=uid,
-                    date=timestamp,
-                    added_by=int(current_user.user_id),
-                    remote_addr=remote_addr or "",
-                    remote_host=remote_host or "",
-                    tracking_cookie=tracking_cookie,
-                    valid=valid,
-                    flag_author=flag,
-                    flag_auto=auto,
-                )
-                new_ownerships.append(new_ownership)
-                session.add(new_ownership)
-
-                admin_audit(
-                    session,
-                    AdminAudit_AddPaperOwner(
-                        str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
-                        remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
-                session.flush()
+            if body.valid is not None and existing_ownership["valid"] != valid:
+                existing_ownership["valid"] = valid
                 valid_changed = True
-                flag_changed = True
-                pass
-
-            if po_primary_key in existing_docs:
-                existing_ownership = existing_docs[po_primary_key]
-                if existing_ownership.flag_author != flag:
-                    existing_ownership.flag_author = flag
-                    flag_changed = True
-                    pass
-
-                if body.auto is not None:
-                    auto = 1 if body.auto else 0
-                    if auto != existing_ownership.flag_auto:
-                        existing_ownership.flag_auto = auto
-                        pass
-                    pass
-
-                if body.valid is not None:
-                    if existing_ownership.valid != valid:
-                        existing_ownership.valid = valid
-                        valid_changed = True
-                        pass
-                    pass
-                pass
-
-            #
-            if current_user.is_admin:
-                if flag_changed:
-                    if flag:
-                        admin_audit(
-                            session,
-                            AdminAudit_AdminMakeAuthor(
-                                str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
-                                remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
-                    else:
-                        admin_audit(
-                            session,
-                            AdminAudit_AdminMakeNonauthor(
-                                str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
-                                remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
-                        pass
-                    pass
-
-                if valid_changed:
-                    if valid:
-                        admin_audit(
-                            session,
-                            AdminAudit_AdminUnrevokePaperOwner(
-                                str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
-                                remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
-                    else:
-                        admin_audit(
-                            session,
-                            AdminAudit_AdminRevokePaperOwner(
-                                str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did),
-                                remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie, timestamp=timestamp))
-                        pass
-                    pass
-                pass
-            pass
-        pass
+                changed = True
+
+            if changed:
+                changed_keys.append((uid, did))
+
+        if current_user.is_admin:
+            audit_args = (str(current_user.user_id), str(uid), str(current_user.tapir_session_id), str(did))
+            audit_kwargs = dict(remote_ip=remote_addr, remote_hostname=remote_host, tracking_cookie=tracking_cookie,
+                                timestamp=timestamp)
+            if flag_changed:
+                if flag:
+                    audit_events.append(AdminAudit_AdminMakeAuthor(*audit_args, **audit_kwargs))
+                else:
+                    audit_events.append(AdminAudit_AdminMakeNonauthor(*audit_args, **audit_kwargs))
+
+            if valid_changed:
+                if valid:
+                    audit_events.append(AdminAudit_AdminUnrevokePaperOwner(*audit_args, **audit_kwargs))
+                else:
+                    audit_events.append(AdminAudit_AdminRevokePaperOwner(*audit_args, **audit_kwargs))
+
+    # One UPDATE per batch of the changed ownerships - flag_author per row, auto and valid are the same for all
+    for offset in range(0, len(changed_keys), OWNERSHIP_BATCH_SIZE):
+        batch = changed_keys[offset:offset + OWNERSHIP_BATCH_SIZE]
+        authored_keys = [key for key in batch if targets[key]]
+        values: Dict[str, Any] = {"flag_author": case((ownership_key_column().in_(authored_keys), 1), else_=0)}
+        if body.auto is not None:
+            values["flag_auto"] = auto
+        if body.valid is not None:
+            values["valid"] = valid
+        session.execute(
+            update(PaperOwner)
+            .where(ownership_key_column().in_(batch))
+            .values(**values)
+            .execution_options(synchronize_session=False))
+
+    if new_ownerships:
+        session.execute(insert(PaperOwner), new_ownerships)
+    record_admin_audit_events(session, audit_events)
 
     session.commit()
-    rec: PaperOwner
-    all_po = [OwnershipModel.rec_to_dict(rec) for rec in list(existing_docs.values()) + new_ownerships]
+    all_po = [existing_docs[key] for key in targets if key in existing_docs] + new_ownerships
     return ReactAdminUpdateResult(
         id=action,
-        data={"data":[OwnershipModel.model_validate(po) for po in all_po]}
+        data={"data":[OwnershipModel.model_validate({"id": ownership_combo_key(po["user_id"], po["document_id"]), **po})
+                      for po in all_po]}
     )
 
 
@@ -943,17 +963,85 @@ def renew_paper_password(
     return PaperPwModel.model_validate(data)
 
 
+class BulkUploadLineStatus(StrEnum):
+    ADDED = "added"  # In the authored list of the result
+    OWNED = "owned"  # The user already has a valid ownership
+    DUPLICATE = "duplicate"  # Same paper on an earlier line
+    ILL_FORMED = "ill_formed"
+    NOT_FOUND = "not_found"
+
+
+class BulkUploadLineResult(BaseModel):
+    line: int  # 1-based
+    paper_id: str
+    status: BulkUploadLineStatus
+    document_id: Optional[int] = None
+
+
+class PaperOwnershipBulkUploadResult(PaperOwnershipUpdateRequest):
+    report: List[BulkUploadLineResult] = []
+
+
+# Paper ids per IN query
+BULK_UPLOAD_BATCH_SIZE = 1000
+
+
+def _iter_upload_lines(file: Optional[UploadFile], content: Optional[str]) -> Iterator[str]:
+    if file:
+        # Decoded as it is read, not loaded whole
+        yield from io.TextIOWrapper(file.file, encoding="utf-8", newline=None)
+    elif content:
+        yield from content.splitlines()
+
+
+def _resolve_upload_batch(session: Session, user_id: int, batch: List[BulkUploadLineResult],
+                          squashed_ids: List[str], seen: Set[str]) -> None:
+    """Set the status of the lines of a batch, with one Document and one PaperOwner query."""
+    wanted = sorted({squashed_id for squashed_id in squashed_ids if squashed_id not in seen})
+    documents: Dict[str, int] = {}
+    if wanted:
+        documents = {row.paper_id: row.document_id for row in session.query(
+            Document.paper_id, Document.document_id).filter(Document.paper_id.in_(wanted)).all()}
+    owned: Set[int] = set()
+    if documents:
+        owned = {row.document_id for row in session.query(PaperOwner.document_id).filter(
+            PaperOwner.user_id == user_id,
+            PaperOwner.document_id.in_(list(documents.values())),
+            PaperOwner.valid == 1).all()}
+
+    for result, squashed_id in zip(batch, squashed_ids):
+        if squashed_id in seen:
+            result.status = BulkUploadLineStatus.DUPLICATE
+            continue
+        seen.add(squashed_id)
+        document_id = documents.get(squashed_id)
+        if document_id is None:
+            result.status = BulkUploadLineStatus.NOT_FOUND
+            continue
+        result.document_id = document_id
+        result.status = BulkUploadLineStatus.OWNED if document_id in owned else BulkUploadLineStatus.ADDED
+
+
 @router.post("/user/{user_id:str}")
-async def bulk_upload_ownership_request(
+def bulk_upload_ownership_request(
         user_id: int,
         file: Optional[UploadFile] = File(None),
         content: Optional[str] = Form(None),
         file_format: str = Form("csv"),
+        strict: bool = Form(True, description="Fail when any line is ill-formed or not found"),
         current_user: ArxivUserClaims = Depends(get_authn_user),
         remote_addr: str = Depends(get_client_host),
         remote_host: str = Depends(get_client_host_name),
         tracking_cookie: Optional[str] = Depends(get_tracking_cookie),
-        session: Session = Depends(get_db)) -> PaperOwnershipUpdateRequest:
+        session: Session = Depends(get_db)) -> PaperOwnershipBulkUploadResult:
+    """
+    Turn a list of paper ids, one per line, into an authorship upsert request for the user.
+
+    Each line is reported. When strict, any ill-formed or unknown paper id fails the whole
+    upload with all of the bad lines listed; otherwise those lines are left out of the request.
+    The file is read and the papers looked up as it goes, so this is a sync endpoint, run in the
+    threadpool.
+    """
 
     user = UserModel.one_user(session, str(user_id))
     if user is None:
@@ -964,57 +1052,61 @@ async def bulk_upload_ownership_request(
         raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, 
                            detail="You can only create ownership requests for yourself")
 
-    # Get content from either file upload or direct content
     if file:
         if file.content_type and not file.content_type.startswith('text/'):
             raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
                                detail="File must be a text file")
-        
-        file_content = await file.read()
-        try:
-            paper_content = file_content.decode('utf-8')
-        except UnicodeDecodeError:
-            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
-                               detail="File must be UTF-8 encoded")
-    elif content:
-        paper_content = content
-    else:
+    elif not content:
         raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
                            detail="Either file or content must be provided")
 
-    lines = paper_content.splitlines()
-    authored_ids = []
-    
-    for line in lines:
-        paper_id = line.strip()
-        if not paper_id:
-            continue
-            
-        # Normalize the paper ID
-        squashed_id = arxiv_squash_id(paper_id)
-        if not squashed_id:
-            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
-                               detail=f"Paper ID '{paper_id}' is ill-formed")
-        
-        # Find the document
-        document = session.query(Document).filter(Document.paper_id == squashed_id).one_or_none()
-        if not document:
-            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
-                               detail=f"Paper with ID '{paper_id}' does not exist")
-        
-        # Create ownership ID for this user and document
-        ownership: PaperOwner | None = session.query(PaperOwner).filter(and_(PaperOwner.document_id == document.document_id,
-                                                                             PaperOwner.user_id == user_id)).one_or_none()
-        if not ownership or not ownership.valid:
-            ownership_id = ownership_combo_key(user_id, document.document_id)
-            authored_ids.append(ownership_id)
-    
+    report: List[BulkUploadLineResult] = []
+    seen: Set[str] = set()
+    batch: List[BulkUploadLineResult] = []
+    squashed_ids: List[str] = []
+    try:
+        for line_number, line in enumerate(_iter_upload_lines(file, content), start=1):
+            paper_id = line.strip()
+            if not paper_id:
+                continue
+
+            # Normalize the paper ID
+            squashed_id = arxiv_squash_id(paper_id)
+            if not squashed_id:
+                report.append(BulkUploadLineResult(line=line_number, paper_id=paper_id,
+                                                   status=BulkUploadLineStatus.ILL_FORMED))
+                continue
+
+            result = BulkUploadLineResult(line=line_number, paper_id=paper_id, status=BulkUploadLineStatus.NOT_FOUND)
+            report.append(result)
+            batch.append(result)
+            squashed_ids.append(squashed_id)
+            if len(batch) >= BULK_UPLOAD_BATCH_SIZE:
+                _resolve_upload_batch(session, user_id, batch, squashed_ids, seen)
+                batch, squashed_ids = [], []
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
+                           detail="File must be UTF-8 encoded")
+    _resolve_upload_batch(session, user_id, batch, squashed_ids, seen)
+
+    if strict:
+        bad_lines = [result for result in report
+                     if result.status in (BulkUploadLineStatus.ILL_FORMED, BulkUploadLineStatus.NOT_FOUND)]
+        if bad_lines:
+            details = "; ".join(
+                f"line {result.line}: Paper ID '{result.paper_id}' "
+                + ("is ill-formed" if result.status == BulkUploadLineStatus.ILL_FORMED else "does not exist")
+                for result in bad_lines[:100])
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=details)
+
     # Return single PaperOwnershipUpdateRequest with all papers
-    return PaperOwnershipUpdateRequest(
-        authored=authored_ids,
+    return PaperOwnershipBulkUploadResult(
+        authored=[ownership_combo_key(user_id, result.document_id) for result in report
+                  if result.status == BulkUploadLineStatus.ADDED and result.document_id is not None],
         not_authored=[],
         valid=True,
-        auto=False
+        auto=False,
+        report=report,
     )
 
 
@@ -1,5 +1,5 @@
 """arXiv submission routes."""
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
@@ -29,6 +29,24 @@ class SubmissionCategoryModel(BaseModel):
             SubmissionCategory.is_published
         )
 
+    @staticmethod
+    def for_submissions(db: Session, submission_ids: Iterable[int]) -> Dict[int, List["SubmissionCategoryModel"]]:
+        """Categories of each submission, primary first, with one query for all of them."""
+        ids = sorted(set(submission_ids))
+        categories: Dict[int, List[SubmissionCategoryModel]] = {submission_id: [] for submission_id in ids}
+        if not ids:
+            return categories
+        rows = db.query(
+            SubmissionCategory.submission_id,
+            SubmissionCategory.category,
+            SubmissionCategory.is_primary,
+            SubmissionCategory.is_published
+        ).filter(SubmissionCategory.submission_id.in_(ids)).order_by(
+            SubmissionCategory.submission_id, SubmissionCategory.is_primary.desc()).all()
+        for row in rows:
+            categories[row.submission_id].append(SubmissionCategoryModel.model_validate(row))
+        return categories
+
 
 class SubmissionCategoryResultModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,11 @@
 """arXiv paper display routes."""
+import asyncio
+import hashlib
+import json
 import re
 from datetime import datetime, date, timedelta
 from enum import Enum, IntEnum
-from typing import Optional, List, Union
+from typing import Any, AsyncIterator, NamedTuple, Optional, List, Union, Dict, Tuple
 
 from arxiv.auth.user_claims import ArxivUserClaims
 from arxiv.base import logging
@@ -10,16 +13,19 @@ from arxiv.db.models import Submission, SubmissionCategory
 from arxiv_bizlogic.fastapi_helpers import get_authn, get_authn_user
 from arxiv_bizlogic.latex_helpers import convert_latex_accents
 from arxiv_bizlogic.sqlalchemy_helper import update_model_fields
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status as http_status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status as http_status
 from google.protobuf.internal.wire_format import INT32_MAX
 from pydantic import BaseModel, field_validator, ConfigDict
-from sqlalchemy import text, cast, LargeBinary, Row, and_  # select, update, func, case, Select, distinct, exists, and_
+from sqlalchemy import text, cast, LargeBinary, Row, and_, or_, select, func  # update, case, Select, distinct, exists
 from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 from . import get_db, VERY_OLDE, is_any_user
+from .helpers.bounded_cache import BoundedCache
 from .helpers.db_compat import cast_for_encoding
 from .helpers.mui_datagrid import MuiDataGridFilter
+from .helpers.sparse_fields import parse_fields, project_query, sparse_response, sparse_dicts
+from .biz.change_feed import ChangeFeed
 from .submission_categories import SubmissionCategoryModel
 import os
 
@@ -115,6 +121,10 @@ class IsAuthorEnum(IntEnum):
     proxy_submitter = 2
 
 
+# latin1 columns that are decoded and de-LaTeXed
+SUBMISSION_TEXT_FIELDS = ["submitter_name", "title", "authors", "comments", "abstract"]
+
+
 class SubmissionModel(BaseModel):
     id: int  # submission_id: intpk]
     document_id: Optional[int] = None #  = mapped_column(ForeignKey('arXiv_documents.document_id', ondelete='CASCADE', onupdate='CASCADE'), index=True)
@@ -239,20 +249,52 @@ class SubmissionModel(BaseModel):
         )
 
     @staticmethod
-    def to_model(sub: Submission | Row, session: Session) -> "SubmissionModel":
+    def to_model(sub: Submission | Row, session: Session,
+                 categories: Optional[List[SubmissionCategoryModel]] = None) -> "SubmissionModel":
+        """
+        When the categories are not given, they are queried. Use to_models for a page of
+        submissions.
+        """
         if hasattr(sub, "_asdict"):  # It's a Row
             row = sub._asdict()
         else:  # It's a model instance
             row = sub.__dict__.copy()
-        for field in ["submitter_name", "title", "authors", "comments", "abstract"]:
+        for field in SUBMISSION_TEXT_FIELDS:
             row[field] = convert_latex_accents(row[field].decode("utf-8")) if row[field] else None
         sub_id = row.get("id")
         subm = SubmissionModel.model_validate(row)
-        subm.submission_categories = [SubmissionCategoryModel.model_validate(cat) for cat in
-                                      SubmissionCategoryModel.base_select(session).filter(
-                                      SubmissionCategory.submission_id == sub_id).all()]
+        if categories is None:
+            categories = [SubmissionCategoryModel.model_validate(cat) for cat in
+                          SubmissionCategoryModel.base_select(session).filter(
+                          SubmissionCategory.submission_id == sub_id).all()]
+        subm.submission_categories = categories
         return subm
 
+    @staticmethod
+    def to_models(subs: List[Row], session: Session) -> List["SubmissionModel"]:
+        """to_model for the rows of base_select, with the categories of all of them in one query."""
+        categories = SubmissionCategoryModel.for_submissions(session, [sub.id for sub in subs])
+        return [SubmissionModel.to_model(sub, session, categories=categories[sub.id]) for sub in subs]
+
+    @staticmethod
+    def to_sparse_response(subs: List[Row], session: Session, fields: Tuple[str, ...], total: int) -> JSONResponse:
+        """The rows of a projected base_select, decoding and validating only the requested fields."""
+        return sparse_response(SubmissionModel, fields, SubmissionModel.to_sparse_rows(subs, session, fields), total)
+
+    @staticmethod
+    def to_sparse_rows(subs: List[Row], session: Session, fields: Tuple[str, ...]) -> List[dict]:
+        """Decoded row dicts of a projected base_select, with the categories when asked for."""
+        rows = [sub._asdict() for sub in subs]
+        for row in rows:
+            for field in SUBMISSION_TEXT_FIELDS:
+                if field in row:
+                    row[field] = convert_latex_accents(row[field].decode("utf-8")) if row[field] else None
+        if "submission_categories" in fields:
+            categories = SubmissionCategoryModel.for_submissions(session, [row["id"] for row in rows])
+            for row in rows:
+                row["submission_categories"] = categories[row["id"]]
+        return rows
+
     @field_validator('is_author')
     @classmethod
     def validate_is_author(cls, value):
@@ -267,35 +309,168 @@ class SubmissionModel(BaseModel):
         return value
 
 
-@router.get('/')
+class SubmissionListFilters:
+    """The filters of the submission list, shared with navigate so prev/next stay within the list."""
+
+    def __init__(
+            self,
+            preset: Optional[str] = Query(None),
+            start_date: Optional[date] = Query(None, description="Start date for filtering"),
+            end_date: Optional[date] = Query(None, description="End date for filtering"),
+            stage: Optional[List[int]] = Query(None, description="Stage"),
+            submission_status: Optional[Union[int,List[int]]] = Query(
+                None, description="Submission status"),
+            submission_status_group: Optional[Union[str,List[str]]] = Query(
+                None, description="Submission status group [current|processing|accepted|expired]"),
+            title: Optional[str]= Query(None, description="Title"),
+            type: Optional[List[str]] = Query(None, description="Submission Type list"),
+            document_id: Optional[int] = Query(None, description="Document ID"),
+            submitter_id: Optional[int] = Query(None, description="Submitter ID"),
+            filter: Optional[str] = Query(None, description="MUI DataGrid Filter"),
+            start_submission_id: Optional[int] = Query(None, description="Start Submission ID"),
+            end_submission_id: Optional[int] = Query(None, description="End Submission ID"),
+    ):
+        self.preset = preset
+        self.start_date = start_date
+        self.end_date = end_date
+        self.stage = stage
+        self.submission_status = submission_status
+        self.submission_status_group = submission_status_group
+        self.title = title
+        self.type = type
+        self.document_id = document_id
+        self.submitter_id = submitter_id
+        self.filter = filter
+        self.start_submission_id = start_submission_id
+        self.end_submission_id = end_submission_id
+
+
+def resolve_status_list(submission_status: Optional[Union[int, List[int]]],
+                        submission_status_group: Optional[Union[str, List[str]]]) -> Optional[List[int]]:
+    """
+    The status ids named by the status and status group filters (ids, names or groups). None
+    when there is no status filter or "all" is asked for.
+    """
+    if submission_status is None and submission_status_group is None:
+        return None
+    status_list: List[int] = []
+    status_codes: List[int|str] = []
+    if isinstance(submission_status, list):
+        status_codes.extend(submission_status)
+    if isinstance(submission_status, int):
+        status_codes.append(submission_status)
+    if isinstance(submission_status_group, list):
+        status_codes.extend(submission_status_group)
+    if isinstance(submission_status_group, str):
+        status_codes.append(submission_status_group)
+
+    for status_code in status_codes:
+        if isinstance(status_code, int):
+            status_list.append(status_code)
+            continue
+        if not isinstance(status_code, str):
+            continue
+
+        if status_code == "all":
+            return None
+        for status_def in _VALID_STATUS_LIST:
+            if status_def.name == status_code or status_def.group == status_code:
+                status_list.append(status_def.id)
+    return status_list
+
+
+def filter_submissions(query, filters: SubmissionListFilters, current_user: ArxivUserClaims):
+    """Apply the list filters to a query on Submission."""
+    datagrid_filter = MuiDataGridFilter(filters.filter) if filters.filter else None
+    t0 = datetime.now()
+    start_submission_id = filters.start_submission_id
+    end_submission_id = filters.end_submission_id
+    submission_status = filters.submission_status
+    submission_status_group = filters.submission_status_group
+
+    if start_submission_id is not None:
+        if end_submission_id is not None:
+            query = query.filter(Submission.submission_id.between(start_submission_id, end_submission_id))
+        else:
+            query = query.filter(Submission.submission_id >= start_submission_id)
+    elif end_submission_id is not None:
+        query = query.filter(Submission.submission_id <= end_submission_id)
+
+    if filters.stage is not None:
+        query = query.filter(Submission.stage.in_(filters.stage))
+
+    status_list = resolve_status_list(submission_status, submission_status_group)
+    if status_list is not None:
+        if status_list:
+            query = query.filter(Submission.status.in_(status_list))
+        else:
+            logger.warning("No valid status codes provided")
+
+    if filters.title is not None:
+        # Bound in place rather than with .params() so the filter also works inside navigate's subqueries
+        query = query.filter(Submission.title.like(f"%{filters.title}%", escape='\\'))
+
+    if filters.document_id is not None:
+        query = query.filter(Submission.document_id == filters.document_id)
+
+    if filters.submitter_id is not None:
+        query = query.filter(Submission.submitter_id == filters.submitter_id)
+    else:
+        if not current_user.is_admin:
+            query = query.filter(Submission.submitter_id == current_user.user_id)
+
+    t_begin: datetime
+    t_end: datetime
+
+    if filters.preset is not None:
+        matched = re.search(r"last_(\d+)_days", filters.preset)
+        if matched:
+            t_begin = t0 - timedelta(days=int(matched.group(1)))
+            t_end = t0
+            query = query.filter(Submission.submit_time.between(t_begin, t_end))
+        else:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
+                                detail="Invalid preset format")
+    else:
+        if filters.start_date or filters.end_date:
+            t_begin = datetime.combine(filters.start_date, datetime.min.time()) if filters.start_date else VERY_OLDE
+            t_end = datetime.combine(filters.end_date, datetime.max.time()) if filters.end_date else datetime.now()
+            query = query.filter(Submission.submit_time.between(t_begin, t_end))
+
+    if filters.type is not None:
+        if isinstance(filters.type, list):
+            query = query.filter(Submission.type.in_(filters.type))
+        else:
+            query = query.filter(Submission.type == filters.type)
+
+    if datagrid_filter:
+        field_name = datagrid_filter.field_name
+        if field_name == "id":
+            field_name = "submission_id"
+        if field_name:
+            if hasattr(Submission, field_name):
+                field = getattr(Submission, field_name)
+                query = datagrid_filter.to_query(query, field)
+            else:
+                logger.warning(f"{field_name} field not found on Submission, skipping")
+    return query
+
+
+@router.get('/', response_model=List[SubmissionModel])
 async def list_submissions(
         response: Response,
         _sort: Optional[str] = Query("id", description="sort by"),
         _order: Optional[str] = Query("ASC", description="sort order"),
         _start: int = Query(0, alias="_start"),
         _end: int = Query(100, alias="_end"),
-        preset: Optional[str] = Query(None),
-        start_date: Optional[date] = Query(None, description="Start date for filtering"),
-        end_date: Optional[date] = Query(None, description="End date for filtering"),
-        stage: Optional[List[int]] = Query(None, description="Stage"),
-        submission_status: Optional[Union[int,List[int]]] = Query(
-            None, description="Submission status"),
-        submission_status_group: Optional[Union[str,List[str]]] = Query(
-            None, description="Submission status group [current|processing|accepted|expired]"),
-        title: Optional[str]= Query(None, description="Title"),
-        type: Optional[List[str]] = Query(None, description="Submission Type list"),
         id: Optional[List[int]] = Query(None, description="List of user IDs to filter by"),
-        document_id: Optional[int] = Query(None, description="Document ID"),
-        submitter_id: Optional[int] = Query(None, description="Submitter ID"),
-        filter: Optional[str] = Query(None, description="MUI DataGrid Filter"),
-        start_submission_id: Optional[int] = Query(None, description="Start Submission ID"),
-        end_submission_id: Optional[int] = Query(None, description="End Submission ID"),
+        _fields: Optional[str] = Query(None, description="Comma separated fields to return. All when not given."),
+        filters: SubmissionListFilters = Depends(),
         db: Session = Depends(get_db),
         current_user: ArxivUserClaims = Depends(get_authn_user),
-    ) -> List[SubmissionModel]:
-    datagrid_filter = MuiDataGridFilter(filter) if filter else None
+    ) -> List[SubmissionModel] | JSONResponse:
+    fields = parse_fields(_fields, SubmissionModel)
     query = SubmissionModel.base_select(db)
-    t0 = datetime.now()
 
     order_columns = []
     if _sort:
@@ -317,96 +492,7 @@ async def list_submissions(
         if not current_user.is_admin:
             query = query.filter(Submission.submitter_id == current_user.user_id)
     else:
-        if start_submission_id is not None:
-            if end_submission_id is not None:
-                query = query.filter(Submission.submission_id.between(start_submission_id, end_submission_id))
-            else:
-                query = query.filter(Submission.submission_id >= start_submission_id)
-        elif end_submission_id is not None:
-            query = query.filter(Submission.submission_id <= end_submission_id)
-
-        if stage is not None:
-            query = query.filter(Submission.stage.in_(stage))
-
-        if submission_status is not None or submission_status_group is not None:
-            status_list: List[int] = []
-            status_codes: List[int|str] = []
-            if isinstance(submission_status, list):
-                status_codes.extend(submission_status)
-            if isinstance(submission_status, int):
-                status_codes.append(submission_status)
-            if isinstance(submission_status_group, list):
-                status_codes.extend(submission_status_group)
-            if isinstance(submission_status_group, str):
-                status_codes.append(submission_status_group)
-
-            status_all = False
-            for status_code in status_codes:
-                if isinstance(status_code, int):
-                    status_list.append(status_code)
-                    continue
-                if not isinstance(status_code, str):
-                    continue
-
-                if status_code == "all":
-                    status_all = True
-                    break
-                for status_def in _VALID_STATUS_LIST:
-                    if status_def.name == status_code or status_def.group == status_code:
-                        status_list.append(status_def.id)
-            if not status_all:
-                if status_list:
-                    query = query.filter(Submission.status.in_(status_list))
-                else:
-                    logger.warning("No valid status codes provided")
-
-        if title is not None:
-            # query = query.filter(Submission.title.like("%" + title_like + "%"))
-            query = query.filter(Submission.title.like(text(":title"), escape='\\')).params(title=f"%{title}%")
-
-        if document_id is not None:
-            query = query.filter(Submission.document_id == document_id)
-
-        if submitter_id is not None:
-            query = query.filter(Submission.submitter_id == submitter_id)
-        else:
-            if not current_user.is_admin:
-                query = query.filter(Submission.submitter_id == current_user.user_id)
-
-        t_begin: datetime
-        t_end: datetime
-
-        if preset is not None:
-            matched = re.search(r"last_(\d+)_days", preset)
-            if matched:
-                t_begin = t0 - timedelta(days=int(matched.group(1)))
-                t_end = t0
-                query = query.filter(Submission.submit_time.between(t_begin, t_end))
-            else:
-                raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST,
-                                    detail="Invalid preset format")
-        else:
-            if start_date or end_date:
-                t_begin = datetime.combine(start_date, datetime.min.time()) if start_date else VERY_OLDE
-                t_end = datetime.combine(end_date, datetime.max.time()) if end_date else datetime.now()
-                query = query.filter(Submission.submit_time.between(t_begin, t_end))
-
-        if type is not None:
-            if isinstance(type, list):
-                query = query.filter(Submission.type.in_(type))
-            else:
-                query = query.filter(Submission.type == type)
-
-        if datagrid_filter:
-            field_name = datagrid_filter.field_name
-            if field_name == "id":
-                field_name = "submission_id"
-            if field_name:
-                if hasattr(Submission, field_name):
-                    field = getattr(Submission, field_name)
-                    query = datagrid_filter.to_query(query, field)
-                else:
-                    logger.warning(f"{field_name} field not found on Submission, skipping")
+        query = filter_submissions(query, filters, current_user)
 
     for column in order_columns:
         if _order == "DESC":
@@ -414,13 +500,18 @@ async def list_submissions(
         else:
             query = query.order_by(column.asc())
 
+    if fields is not None:
+        query = project_query(query, fields)
+
     count = query.count()
     response.headers['X-Total-Count'] = str(count)
     if _start is None:
         _start = 0
     if _end is None:
         _end = 100
-    result = [SubmissionModel.to_model(item, db) for item in query.offset(_start).limit(_end - _start).all()]
+    if fields is not None:
+        return SubmissionModel.to_sparse_response(query.offset(_start).limit(_end - _start).all(), db, fields, count)
+    result = SubmissionModel.to_models(query.offset(_start).limit(_end - _start).all(), db)
     return result
 
 
@@ -453,7 +544,6 @@ async def get_submission(
     if not sub:
         raise HTTPException(status_code=404, detail="Submission not found")
     submission: SubmissionModel = SubmissionModel.to_model(sub, session)
-    submission.submission_categories = [SubmissionCategoryModel.model_validate(cat) for cat in SubmissionCategoryModel.base_select(session).filter(SubmissionCategory.submission_id == id).all()]
     return submission
 
 
@@ -476,6 +566,7 @@ async def delete_submission(
     sub.status = 10 if str(current_user.user_id) == str(sub.submitter_id) else 9
     sub.is_withdrawn = True
     session.commit()
+    invalidate_submission_summary()
     
     return JSONResponse({"id": str(id)})
 
@@ -560,97 +651,275 @@ async def list_submission_status() -> List[SubmissionStatusModel]:
 class SubmissionNavi(BaseModel):
     prev_id: Optional[int]
     next_id: Optional[int]
+    first_id: Optional[int] = None
+    last_id: Optional[int] = None
 
 
 @router.get("/navigate")
 async def navigate(
         id: int,
-        submission_status: Optional[List[int]] = Query(None, description="Submission status list"),
+        filters: SubmissionListFilters = Depends(),
+        current_user: ArxivUserClaims = Depends(get_authn_user),
         session: Session = Depends(get_db),
     ) -> SubmissionNavi:
-
-    if submission_status is None:
-        status_list = [0, 1, 2]
-    else:
-        status_list = submission_status
-
-    quota = 10000
-    qr = session.query(Submission.submission_id).order_by(Submission.submission_id.desc()).first()
-    if qr is None:
-        raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="No submission found")
-    largest_id = qr[0]
-
-    def submission_walker(idx: int, step: int) -> int | None:
-        nonlocal quota, largest_id, session, status_list
-        idx += step
-        while 0 < idx <= largest_id:
-            sub = session.query(Submission).filter(Submission.submission_id == idx).one_or_none()
-            if sub is None:
-                return None
-            if sub.status in status_list:
-                return idx
-            idx += step
-            quota -= 1
-            if quota <= 0:
-                break
-        return None
+    """
+    The neighbours of the submission in the list with the same filters, ordered by id, in one
+    round trip. Without a status filter, the working and current submissions (status 0, 1, 2) are
+    navigated.
+    """
+    if filters.submission_status is None and filters.submission_status_group is None:
+        filters.submission_status = [0, 1, 2]
+
+    ids = filter_submissions(session.query(Submission.submission_id), filters, current_user)
+    submission_id = Submission.submission_id
+    row = session.execute(select(
+        ids.filter(submission_id < id).with_entities(func.max(submission_id)).scalar_subquery().label("prev_id"),
+        ids.filter(submission_id > id).with_entities(func.min(submission_id)).scalar_subquery().label("next_id"),
+        ids.with_entities(func.min(submission_id)).scalar_subquery().label("first_id"),
+        ids.with_entities(func.max(submission_id)).scalar_subquery().label("last_id"),
+    )).one()
 
     return SubmissionNavi(
-        next_id=submission_walker(id, 1),
-        prev_id=submission_walker(id, -1),
+        prev_id=row.prev_id,
+        next_id=row.next_id,
+        first_id=row.first_id,
+        last_id=row.last_id,
     )
 
 
-class SubmissionSummaryModel(BaseModel):
+class SubmissionWatermark(BaseModel):
+    """Where the queue stream is: the largest id and updated seen, what was sent of the submissions
+    in the lookback window (id -> fingerprint), and the last status seen of every submission read
+    since the poller started (id -> status)."""
+    submission_id: int
+    updated: Optional[datetime] = None
+    sent: Dict[int, str] = {}
+    statuses: Dict[int, int] = {}
+
+
+class SubmissionChange(NamedTuple):
+    """A changed submission, with its status before the change.
+
+    previous_status is None for a submission created since the last poll (created is True) and for
+    one the poller had not read before.
+    """
+    change: Dict[str, Any]
+    previous_status: Optional[int]
+    created: bool
+
+
+SUBMISSION_STREAM_POLL_SECONDS = float(os.environ.get("SUBMISSION_STREAM_POLL_SECONDS", "5"))
+SUBMISSION_STREAM_KEEPALIVE_SECONDS = 15.0
+SUBMISSION_STREAM_LOOKBACK_SECONDS = 60.0
+
+# What the moderation queue shows of a submission
+SUBMISSION_STREAM_FIELDS = ("id", "status", "created", "updated", "submit_time", "title", "submitter_id",
+                            "submitter_name", "type", "is_locked", "sticky_status", "auto_hold",
+                            "submission_categories")
+
+submission_change_feed: ChangeFeed[SubmissionWatermark] = \
+    ChangeFeed("submission_change_feed", interval=SUBMISSION_STREAM_POLL_SECONDS)
+
+
+def _change_fingerprint(change: Dict[str, Any]) -> str:
+    return hashlib.blake2b(json.dumps(change, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def poll_submission_changes(engine, watermark: Optional[SubmissionWatermark]) -> Tuple[List[SubmissionChange], SubmissionWatermark]:
+    """Submissions created or updated since the watermark, with one query, and the next watermark."""
+    with Session(engine) as session:
+        starting = watermark is None
+        if watermark is None:
+            # Start from the latest, with the lookback window taken as sent
+            head = session.execute(select(func.max(Submission.submission_id), func.max(Submission.updated))).one()
+            watermark = SubmissionWatermark(submission_id=head[0] or 0, updated=head[1])
+
+        # updated is stamped before the transaction commits and has a resolution of a second, so an
+        # update can show up with an updated older than the watermark, or in the watermark's second.
+        # The last SUBMISSION_STREAM_LOOKBACK_SECONDS are read again, and a submission is sent when
+        # it differs from what was sent for it.
+        changed = Submission.submission_id > watermark.submission_id
+        if watermark.updated is not None:
+            lookback = watermark.updated - timedelta(seconds=SUBMISSION_STREAM_LOOKBACK_SECONDS)
+            changed = or_(changed, Submission.updated >= lookback)
+        query = project_query(SubmissionModel.base_select(session).filter(changed)
+                              .order_by(Submission.updated, Submission.submission_id), SUBMISSION_STREAM_FIELDS)
+        rows = SubmissionModel.to_sparse_rows(query.all(), session, SUBMISSION_STREAM_FIELDS)
+
+    next_watermark = SubmissionWatermark(submission_id=watermark.submission_id, updated=watermark.updated,
+                                         statuses=dict(watermark.statuses))
+    for row in rows:
+        next_watermark.submission_id = max(next_watermark.submission_id, row["id"])
+        updated: Optional[datetime] = row["updated"]
+        if updated is not None and (next_watermark.updated is None or updated > next_watermark.updated):
+            next_watermark.updated = updated
+
+    changes = []
+    for row, change in zip(rows, sparse_dicts(SubmissionModel, SUBMISSION_STREAM_FIELDS, rows)):
+        fingerprint = _change_fingerprint(change)
+        if watermark.sent.get(row["id"]) != fingerprint:
+            changes.append(SubmissionChange(change, watermark.statuses.get(row["id"]),
+                                            row["id"] > watermark.submission_id))
+        next_watermark.statuses[row["id"]] = row["status"]
+        # Remember the submissions the next poll reads again
+        if next_watermark.updated is not None and row["updated"] is not None and \
+                row["updated"] >= next_watermark.updated - timedelta(seconds=SUBMISSION_STREAM_LOOKBACK_SECONDS):
+            next_watermark.sent[row["id"]] = fingerprint
+    return [] if starting else changes, next_watermark
+
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _submission_change_event(submission_change: SubmissionChange, status_list: Optional[List[int]]) -> Optional[str]:
+    """The event a stream with the status filter sends for the change, if any."""
+    change, previous_status, created = submission_change
+    if status_list is None or change["status"] in status_list:
+        return _sse_event("submission", change)
+    if (previous_status is None and not created) or previous_status in status_list:
+        return _sse_event("removed", {"id": change["id"]})
+    return None
+
+
+@router.get("/stream")
+async def stream_submission_changes(
+        request: Request,
+        submission_status: Optional[List[int]] = Query(None, description="Submission status"),
+        submission_status_group: Optional[List[str]] = Query(
+            None, description="Submission status group [current|processing|accepted|expired]"),
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+    ) -> StreamingResponse:
+    """
+    Server-sent events of the submissions that change from now on.
+
+    A "submission" event carries a submission that is in the status filter. A "removed" event
+    carries the id of one that changed from a status in the filter to one outside of it; a
+    submission the poller had not read before (changed before the stream's poller started) is
+    also reported as removed, so the client should ignore ids it does not list. Submissions
+    created outside of the filter are not reported. "reset" means the stream fell behind; reload
+    the list and reconnect. All streams of a worker share one poller.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    status_list = resolve_status_list(submission_status, submission_status_group)
+    engine = request.app.extra["arxiv_db_engine"]
+
+    def poll(watermark: Optional[SubmissionWatermark]) -> Tuple[List[SubmissionChange], SubmissionWatermark]:
+        return poll_submission_changes(engine, watermark)
+
+    async def events() -> AsyncIterator[str]:
+        queue = submission_change_feed.subscribe(poll)
+        try:
+            yield f"retry: {int(SUBMISSION_STREAM_POLL_SECONDS * 1000)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    changes = await asyncio.wait_for(queue.get(), timeout=SUBMISSION_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if changes is None:
+                    yield _sse_event("reset", {})
+                    break
+                for submission_change in changes:
+                    event = _submission_change_event(submission_change, status_list)
+                    if event is not None:
+                        yield event
+        finally:
+            submission_change_feed.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+class SubmissionStatusCountsModel(BaseModel):
     total: int
     active: int
     submitted: int
     rejected: int
     unknown: int
+    status_counts: Dict[int, int] = {}  # status -> number of submissions
+
+
+class SubmissionSummaryModel(SubmissionStatusCountsModel):
     max_active_submissions: int
     submission_permitted: bool
 
-@router.get("/user/{user_id:str}/summary")
-async def get_submission_summary_of_user(
-        user_id: str,
-        current_user: ArxivUserClaims = Depends(get_authn_user),
-        session: Session = Depends(get_db),
-    ) -> SubmissionSummaryModel:
 
-    if not current_user.is_admin and str(current_user.user_id) != str(user_id):
-        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Not authorized")
+SITE_SUMMARY_KEY = "*"
 
-    submissions_by_user = session.query(Submission.status).filter(Submission.submitter_id == user_id).all()
+# The site-wide summary is read by the queue dashboards, so a few seconds of staleness is traded for
+# load. 0 turns the cache off. A submitter's summary is not cached: submissions are made by the submit
+# app, not through this API, and submission_permitted has to see them.
+SUBMISSION_SUMMARY_CACHE_TTL = float(os.environ.get("SUBMISSION_SUMMARY_CACHE_TTL", "10"))
 
-    result = SubmissionSummaryModel(
-        total=len(submissions_by_user),
-        active=0,
-        submitted=0,
-        rejected=0,
-        unknown=0,
-        max_active_submissions=MAX_ACTIVE_SUBMISSIONS,
-        submission_permitted = True
-    )
+submission_summary_cache: BoundedCache[str, SubmissionStatusCountsModel] = \
+    BoundedCache("submission_summary", maxsize=1, ttl=SUBMISSION_SUMMARY_CACHE_TTL or None)
 
+
+def submission_status_counts(session: Session, submitter_id: Optional[str] = None) -> SubmissionStatusCountsModel:
+    """Counts by status and by status classification, from one GROUP BY query."""
+    use_cache = submitter_id is None and SUBMISSION_SUMMARY_CACHE_TTL > 0
+    if use_cache:
+        cached = submission_summary_cache.get(SITE_SUMMARY_KEY)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+    stmt = select(Submission.status, func.count().label("count")).group_by(Submission.status)
+    if submitter_id is not None:
+        stmt = stmt.where(Submission.submitter_id == submitter_id)
+
+    result = SubmissionStatusCountsModel(total=0, active=0, submitted=0, rejected=0, unknown=0)
     status_list: dict[int, SubmissionStatusModel] = {entry.id: entry for entry in _VALID_STATUS_LIST}
 
-    submission_status: int
-    for a_submission in submissions_by_user:
-        submission_status = a_submission[0]
+    for submission_status, count in session.execute(stmt).all():
+        result.total += count
+        result.status_counts[submission_status] = count
         if submission_status not in status_list:
             continue
-        ssm = status_list[submission_status]
-        match ssm.classification:
+        match status_list[submission_status].classification:
             case SubmissionStatusClassification.active:
-                result.active += 1
+                result.active += count
             case SubmissionStatusClassification.submitted:
-                result.submitted += 1
+                result.submitted += count
             case SubmissionStatusClassification.rejected:
-                result.rejected += 1
+                result.rejected += count
             case SubmissionStatusClassification.unknown:
-                result.unknown += 1
-                pass
-        pass
+                result.unknown += count
 
-    result.submission_permitted = result.active < MAX_ACTIVE_SUBMISSIONS
+    if use_cache:
+        submission_summary_cache.set(SITE_SUMMARY_KEY, result.model_copy(deep=True))
     return result
+
+
+def invalidate_submission_summary() -> None:
+    submission_summary_cache.invalidate(SITE_SUMMARY_KEY)
+
+
+@router.get("/summary")
+async def get_submission_summary(
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        session: Session = Depends(get_db),
+    ) -> SubmissionStatusCountsModel:
+    """Site-wide submission counts by status, for the queue dashboards."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return submission_status_counts(session)
+
+
+@router.get("/user/{user_id:str}/summary")
+async def get_submission_summary_of_user(
+        user_id: str,
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        session: Session = Depends(get_db),
+    ) -> SubmissionSummaryModel:
+
+    if not current_user.is_admin and str(current_user.user_id) != str(user_id):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    counts = submission_status_counts(session, user_id)
+    return SubmissionSummaryModel(
+        **counts.model_dump(),
+        max_active_submissions=MAX_ACTIVE_SUBMISSIONS,
+        submission_permitted=counts.active < MAX_ACTIVE_SUBMISSIONS,
+    )
@@ -18,6 +18,7 @@ from arxiv_admin_api.apis.modapi.modapi_client import (
     ApiClient,
     Configuration
 )
+from arxiv_admin_api.helpers.bounded_cache import BoundedCache, CacheStats, registered_caches
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,8 @@ async def report_cookie_names(
         "ng": request.app.extra[COOKIE_ENV_NAMES.ng_cookie_env],
     })
 
-SHARED_NAV_HEADER_URL: Optional[List[SharedNavSection]] = None
+shared_nav_header_cache: BoundedCache[str, List[SharedNavSection]] = \
+    BoundedCache("shared_nav_header", maxsize=4, ttl=3600)
 
 @router.get('/navigation_urls')
 async def get_navigation_urls(
@@ -79,11 +81,10 @@ async def get_navigation_urls(
     prod:      modapi.arxiv.org/admin/shared_nav_header
     dev: services.dev.arxiv.org/admin/shared_nav_header
     """
-    global SHARED_NAV_HEADER_URL
-    if SHARED_NAV_HEADER_URL is None:
-        # Get the modapi URL from app config
-        modapi_url = request.app.extra["MODAPI_URL"]
-
+    # Get the modapi URL from app config
+    modapi_url = request.app.extra["MODAPI_URL"]
+    shared_nav_header = shared_nav_header_cache.get(modapi_url)
+    if shared_nav_header is None:
         # Configure the API client
         configuration = Configuration(host=modapi_url)
 
@@ -105,9 +106,10 @@ async def get_navigation_urls(
         with ApiClient(configuration) as api_client:
             api_instance = AdminApi(api_client)
             try:
-                SHARED_NAV_HEADER_URL = api_instance.status_admin_shared_nav_header_get(
+                shared_nav_header = api_instance.status_admin_shared_nav_header_get(
                     _headers=headers
                 )
+                shared_nav_header_cache.set(modapi_url, shared_nav_header)
             except Exception as exc:
                 logger.error("Failed to fetch navigation URLs from modapi", exc_info=exc)
                 raise HTTPException(
@@ -115,7 +117,13 @@ async def get_navigation_urls(
                     detail="shared_nav_header endpoint is not available"
                 )
 
-    return SHARED_NAV_HEADER_URL
+    return shared_nav_header
+
+
+@router.get('/caches')
+async def report_cache_stats() -> List[CacheStats]:
+    """Size and hit/miss/eviction counters of the in-process caches of this worker."""
+    return [cache.stats() for cache in registered_caches()]
 
 
 @router.get('/navigations_url')
@@ -1,17 +1,22 @@
 """arXiv user routes."""
 from __future__ import annotations
+import asyncio
+import csv
+import io
+import json
 import re
-from typing import Optional, List, Type
+from typing import Any, Callable, Iterable, Iterator, Optional, List, Sequence, Type
 from datetime import date, timedelta, datetime, timezone
 
 from arxiv.auth.user_claims import ArxivUserClaims
 from arxiv_bizlogic.audit_event import AdminAudit_ChangeStatus, AdminAudit_AddComment, admin_audit
 from arxiv_bizlogic.user_status import UserVetoStatus
+from arxiv_bizlogic.latex_helpers import convert_latex_accents
 
 from arxiv_bizlogic.fastapi_helpers import get_current_user, get_authn, get_client_host, get_client_host_name, \
     get_tapir_tracking_cookie, get_authn_user
 from fastapi import APIRouter, Query, status, Depends, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from fastapi.exceptions import HTTPException
 from pydantic import BaseModel, ConfigDict, field_validator
 
@@ -25,10 +30,16 @@ from arxiv_bizlogic.bizmodels.user_model import UserModel, VetoStatusEnum, _tapi
 from arxiv_bizlogic.sqlalchemy_helper import update_model_fields
 
 from . import is_admin_user, get_db, VERY_OLDE, datetime_to_epoch, check_authnz
-from .helpers.db_compat import cast_for_encoding
-from .audit import record_user_prop_admin_action
+from .helpers.bounded_cache import BoundedCache
+from .helpers.db_compat import cast_for_encoding, load_id_set
+from .audit import record_user_prop_admin_action, make_user_prop_audit_event, record_admin_audit_events, \
+    user_prop_audit_registry
 from .biz import canonicalize_category
 from .biz.document_biz import document_summary
+from .biz.user_dashboard import dashboard_change_token, activity_counts, paper_counts
+from .biz.user_autocomplete import UserAutocompleteModel, UserAutocompleteIndex, user_autocomplete_index
+from .biz.user_changes import record_user_changes, user_changes_since, latest_change_id
+from .biz.user_search_index import index_users, user_search_index_available, user_search_subquery
 from .biz.endorsement_biz import can_user_submit_to, can_user_endorse_for, EndorsementAccessor
 from .dao.react_admin import ReactAdminUpdateResult, ReactAdminCreateResult
 from logging import getLogger
@@ -153,6 +164,92 @@ class UserCommentRequest(BaseModel):
     comment: str
 
 
+class UserChangeModel(BaseModel):
+    id: int  # change id
+    user_id: int
+    changed_at: datetime
+
+
+class UserChangesResponse(BaseModel):
+    since: int
+    next_since: int  # pass as since to continue
+    has_more: bool
+    changes: List[UserChangeModel]
+
+
+class UserBulkUpdateItem(BaseModel):
+    user_id: int
+    property_name: str
+    property_value: str | int | bool | None
+
+
+class UserBulkUpdateRequest(BaseModel):
+    updates: List[UserBulkUpdateItem]
+    comment: Optional[str] = None
+
+
+class UserBulkUpdateResult(BaseModel):
+    user_id: int
+    property_name: str
+    status: str  # updated, unchanged, invalid or not_found
+    detail: Optional[str] = None
+
+
+class UserBulkUpdateResponse(BaseModel):
+    updated_count: int
+    audit_count: int
+    results: List[UserBulkUpdateResult]
+
+
+def users_changed(session: Session, user_ids: Iterable[int]) -> None:
+    """Keep the search index and the change feed up to date, in the caller's transaction"""
+    user_ids = list(user_ids)
+    index_users(session, user_ids)
+    record_user_changes(session, user_ids)
+
+
+@router.get("/changes")
+def list_user_changes(
+        since: Optional[int] = Query(None, description="Watermark from the previous response. Omit to get the current one."),
+        limit: int = Query(1000, ge=1, le=10000),
+        _is_admin: bool = Depends(is_admin_user),
+        db: Session = Depends(get_db),
+) -> UserChangesResponse:
+    """Users changed by the admin API after the watermark, oldest first. A change is listed once it
+    is a minute old, so that one committed late is not skipped.
+
+    Without since, returns no changes and the current watermark, so a consumer can take a full
+    snapshot and then follow the feed from that point.
+    """
+    if since is None:
+        head = latest_change_id(db)
+        return UserChangesResponse(since=head, next_since=head, has_more=False, changes=[])
+    rows, next_since, has_more = user_changes_since(db, since, limit)
+    return UserChangesResponse(
+        since=since,
+        next_since=next_since,
+        has_more=has_more,
+        changes=[UserChangeModel(id=change_id, user_id=user_id, changed_at=changed_at)
+                 for change_id, user_id, changed_at in rows])
+
+
+@router.get("/autocomplete")
+def autocomplete_users(
+        prefix: str = Query(..., min_length=1, description="Start of a username or an email"),
+        limit: int = Query(10, ge=1, le=100),
+        _is_admin: bool = Depends(is_admin_user),
+        db: Session = Depends(get_db),
+) -> List[UserAutocompleteModel]:
+    """Users whose username or email starts with the prefix, from the in-memory index.
+
+    Until the poller has built the index, the same search runs as prefix queries.
+    """
+    if not user_autocomplete_index.is_built:
+        # The poller has not finished the first build yet
+        return UserAutocompleteIndex.search_database(db, prefix, limit)
+    return user_autocomplete_index.search(prefix, limit)
+
+
 @router.get("/{user_id:int}")
 def get_one_user(user_id:int,
                  current_user: ArxivUserClaims = Depends(get_authn_user),
@@ -231,44 +328,89 @@ def get_user_by_username(username: str,
     return UserModel.to_model(user)
 
 
-@router.get("/")
-async def list_users(
-        request: Request,
-        response: Response,
-        _sort: Optional[str] = Query("last_name,first_name", description="sort by"),
-        _order: Optional[str] = Query("ASC", description="sort order"),
-        _start: int = Query(0, alias="_start"),
-        _end: int = Query(100, alias="_end"),
-        user_class: Optional[str] = Query(None, description="None for all, 'admin|owner'"),
-        flag_is_mod: Optional[bool] = Query(None, description="moderator"),
-        is_non_academic: Optional[bool] = Query(None, description="non-academic"),
-        username: Optional[str] = Query(None),
-        email: Optional[str] = Query(None),
-        name: Optional[str] = Query(None),
-        last_name: Optional[str] = Query(None),
-        first_name: Optional[str] = Query(None),
-        flag_edit_users: Optional[bool] = Query(None),
-        flag_email_verified: Optional[bool] = Query(None),
-        flag_proxy: Optional[bool] = Query(None),
-        flag_veto: Optional[bool] = Query(None),
-        email_bouncing: Optional[bool] = Query(None),
-        clue: Optional[str] = Query(None),
-        suspect: Optional[bool] = Query(None),
-        endorsing_categories: Optional[List[str]] = Query(None),
-        start_joined_date: Optional[date] = Query(None, description="Start date for filtering"),
-        end_joined_date: Optional[date] = Query(None, description="End date for filtering"),
-        id: Optional[List[int]] = Query(None, description="List of user IDs to filter by"),
-        q: Optional[str] = Query(None, description="Query string"),
-        db: Session = Depends(get_db),
-        current_user: ArxivUserClaims = Depends(get_authn_user),
-) -> List[UserModel]:
-    """
-    List users
-    """
-    if _start < 0 or _end < _start:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail="Invalid start or end index")
+# Above this many candidates, the endorsing_categories filter joins a temporary table instead of IN (...)
+ENDORSING_USER_IDS_IN_LIST_LIMIT = 1000
+
 
+def user_models_for_page(session: Session, rows: List[Row]) -> List[UserModel]:
+    """UserModel.to_model(row, session=session) for a page of rows, with a fixed number of queries.
+
+    to_model with a session looks up the moderated categories and archives of each user one by one.
+    Here they come from one IN query over the page's user ids instead.
+    """
+    users = [UserModel.to_model(row) for row in rows]
+    user_ids = [user.id for user in users]
+    moderated: dict[int, tuple[list[str], list[str]]] = {}
+    if user_ids:
+        for user_id, archive, subject_class in session.execute(
+                select(t_arXiv_moderators.c.user_id, t_arXiv_moderators.c.archive, t_arXiv_moderators.c.subject_class)
+                .where(t_arXiv_moderators.c.user_id.in_(user_ids))
+                .order_by(t_arXiv_moderators.c.user_id, t_arXiv_moderators.c.archive,
+                          t_arXiv_moderators.c.subject_class)):
+            categories, archives = moderated.setdefault(user_id, ([], []))
+            if subject_class:
+                categories.append(f"{archive}.{subject_class}")
+            else:
+                archives.append(archive)
+    for user in users:
+        categories, archives = moderated.get(user.id, ([], []))
+        user.flag_is_mod = user.id in moderated
+        user.moderated_categories = categories
+        user.moderated_archives = archives
+    return users
+
+
+class UserListFilters:
+    """Filter parameters shared by list_users and export_users"""
+
+    def __init__(self,
+                 user_class: Optional[str] = Query(None, description="None for all, 'admin|owner'"),
+                 flag_is_mod: Optional[bool] = Query(None, description="moderator"),
+                 is_non_academic: Optional[bool] = Query(None, description="non-academic"),
+                 username: Optional[str] = Query(None),
+                 email: Optional[str] = Query(None),
+                 name: Optional[str] = Query(None),
+                 last_name: Optional[str] = Query(None),
+                 first_name: Optional[str] = Query(None),
+                 flag_edit_users: Optional[bool] = Query(None),
+                 flag_email_verified: Optional[bool] = Query(None),
+                 flag_proxy: Optional[bool] = Query(None),
+                 flag_veto: Optional[bool] = Query(None),
+                 email_bouncing: Optional[bool] = Query(None),
+                 clue: Optional[str] = Query(None),
+                 suspect: Optional[bool] = Query(None),
+                 endorsing_categories: Optional[List[str]] = Query(None),
+                 start_joined_date: Optional[date] = Query(None, description="Start date for filtering"),
+                 end_joined_date: Optional[date] = Query(None, description="End date for filtering"),
+                 id: Optional[List[int]] = Query(None, description="List of user IDs to filter by"),
+                 q: Optional[str] = Query(None, description="Query string"),
+                 search: Optional[str] = Query(None, description="Free-text search over names, emails and usernames"),
+                 ) -> None:
+        self.user_class = user_class
+        self.flag_is_mod = flag_is_mod
+        self.is_non_academic = is_non_academic
+        self.username = username
+        self.email = email
+        self.name = name
+        self.last_name = last_name
+        self.first_name = first_name
+        self.flag_edit_users = flag_edit_users
+        self.flag_email_verified = flag_email_verified
+        self.flag_proxy = flag_proxy
+        self.flag_veto = flag_veto
+        self.email_bouncing = email_bouncing
+        self.clue = clue
+        self.suspect = suspect
+        self.endorsing_categories = endorsing_categories
+        self.start_joined_date = start_joined_date
+        self.end_joined_date = end_joined_date
+        self.id = id
+        self.q = q
+        self.search = search
+
+
+def user_sort_columns(_sort: Optional[str]) -> tuple[list, Optional[TapirNickname]]:
+    """Order columns for the _sort keys, and the nickname alias to join when sorting by username"""
     order_columns = []
     sort_nickname_alias = None
     if _sort:
@@ -287,16 +429,36 @@ async def list_users(
                 except AttributeError:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                         detail="Invalid sort field")
+    return order_columns, sort_nickname_alias
 
-    # Horay, base query no longer uses subqueries.
-    query = UserModel.base_select(db)
-    
-    if not current_user.is_admin:
-        query = query.filter(TapirUser.user_id == current_user.user_id)
 
-    # Join with TapirNickname if needed for sorting by username
-    if sort_nickname_alias is not None:
-        query = query.join(sort_nickname_alias, TapirUser.user_id == sort_nickname_alias.user_id)
+def filter_users(query, request: Request, db: Session, current_user: ArxivUserClaims,
+                 filters: UserListFilters) -> tuple[Any, bool]:
+    """Apply the list filters to a UserModel.base_select query.
+
+    Returns the query and whether it still selects all users, which lets the count skip the filters.
+    """
+    user_class = filters.user_class
+    flag_is_mod = filters.flag_is_mod
+    is_non_academic = filters.is_non_academic
+    username = filters.username
+    email = filters.email
+    name = filters.name
+    last_name = filters.last_name
+    first_name = filters.first_name
+    flag_edit_users = filters.flag_edit_users
+    flag_email_verified = filters.flag_email_verified
+    flag_proxy = filters.flag_proxy
+    flag_veto = filters.flag_veto
+    email_bouncing = filters.email_bouncing
+    clue = filters.clue
+    suspect = filters.suspect
+    endorsing_categories = filters.endorsing_categories
+    start_joined_date = filters.start_joined_date
+    end_joined_date = filters.end_joined_date
+    id = filters.id
+    q = filters.q
+    search = filters.search
 
     all_users = True
     if id is not None:
@@ -313,6 +475,18 @@ async def list_users(
             else:
                 query = query.filter(TapirUser.last_name == q)
 
+        if search:
+            all_users = False
+            search_subquery = user_search_subquery(db, search) if user_search_index_available(db) else None
+            if search_subquery is not None:
+                query = query.filter(TapirUser.user_id.in_(search_subquery))
+            else:
+                # No index yet (or a term too short for it) - every term prefix-matches one of the columns
+                for term in search.split():
+                    query = query.filter(or_(TapirUser.last_name.startswith(term, autoescape=True),
+                                             TapirUser.first_name.startswith(term, autoescape=True),
+                                             TapirUser.email.startswith(term, autoescape=True)))
+
         if suspect:
             all_users = False
             dgfx = aliased(Demographic)
@@ -455,8 +629,48 @@ async def list_users(
             all_users = False
             engine = endorsing_db.endorsing_db_get_cached_db(request)
             candidates = endorsing_db.endorsing_db_query_users_in_categories(engine, endorsing_categories)
-            user_ids = [candidate.id for candidate in candidates] if candidates else []
-            query = query.filter(TapirUser.user_id.in_(user_ids))
+            user_ids = {candidate.user_id for candidate in candidates} if candidates else set()
+            if len(user_ids) > ENDORSING_USER_IDS_IN_LIST_LIMIT:
+                endorsing_user_ids = load_id_set(db, "tmp_endorsing_user_ids", user_ids)
+                query = query.join(endorsing_user_ids, endorsing_user_ids.c.id == TapirUser.user_id)
+            else:
+                query = query.filter(TapirUser.user_id.in_(sorted(user_ids)))
+
+    return query, all_users
+
+
+@router.get("/")
+async def list_users(
+        request: Request,
+        response: Response,
+        _sort: Optional[str] = Query("last_name,first_name", description="sort by"),
+        _order: Optional[str] = Query("ASC", description="sort order"),
+        _start: int = Query(0, alias="_start"),
+        _end: int = Query(100, alias="_end"),
+        filters: UserListFilters = Depends(),
+        db: Session = Depends(get_db),
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+) -> List[UserModel]:
+    """
+    List users
+    """
+    if _start < 0 or _end < _start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid start or end index")
+
+    order_columns, sort_nickname_alias = user_sort_columns(_sort)
+
+    # Horay, base query no longer uses subqueries.
+    query = UserModel.base_select(db)
+    
+    if not current_user.is_admin:
+        query = query.filter(TapirUser.user_id == current_user.user_id)
+
+    # Join with TapirNickname if needed for sorting by username
+    if sort_nickname_alias is not None:
+        query = query.join(sort_nickname_alias, TapirUser.user_id == sort_nickname_alias.user_id)
+
+    query, all_users = filter_users(query, request, db, current_user, filters)
 
     for column in order_columns:
         if _order == "DESC":
@@ -469,8 +683,83 @@ async def list_users(
     else:
         count = query.count()
     response.headers['X-Total-Count'] = str(count)
-    result = [UserModel.to_model(user, session=db) for user in query.offset(_start).limit(_end - _start).all()]
-    return result
+    return user_models_for_page(db, query.offset(_start).limit(_end - _start).all())
+
+
+USER_EXPORT_FIELDS = [
+    "id", "username", "email", "first_name", "last_name", "suffix_name", "joined_date",
+    "country", "affiliation", "url", "type", "archive", "subject_class",
+    "flag_email_verified", "flag_edit_users", "flag_edit_system", "flag_deleted", "flag_banned",
+    "email_bouncing", "flag_proxy", "flag_suspect", "veto_status", "orcid_id",
+]
+USER_EXPORT_TEX_FIELDS = ["first_name", "last_name", "suffix_name", "affiliation"]
+USER_EXPORT_CHUNK_SIZE = 1000
+
+
+def _user_export_records(rows: Sequence[Row]) -> Iterator[dict]:
+    """Export fields of a chunk of base_select rows, with the TeX accents in names turned into unicode"""
+    for row in rows:
+        record = UserModel.to_model(row).model_dump(mode="json", include=set(USER_EXPORT_FIELDS))
+        for field in USER_EXPORT_TEX_FIELDS:
+            if record.get(field):
+                record[field] = convert_latex_accents(record[field])
+        yield record
+
+
+def _user_export_lines(records: Iterator[dict], format: str, header: bool) -> str:
+    if format == "ndjson":
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=USER_EXPORT_FIELDS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+@router.get("/export")
+def export_users(
+        request: Request,
+        format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+        _sort: Optional[str] = Query("user_id", description="sort by"),
+        _order: Optional[str] = Query("ASC", description="sort order"),
+        filters: UserListFilters = Depends(),
+        _is_admin: bool = Depends(is_admin_user),
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+) -> StreamingResponse:
+    """Export the users matching the list_users filters as CSV or NDJSON.
+
+    The rows come through a server-side cursor in chunks and are written out as they arrive, so
+    memory does not grow with the size of the export. The response outlives the request's db session,
+    so the export runs in its own session.
+    """
+    order_columns, sort_nickname_alias = user_sort_columns(_sort)
+    engine = request.app.extra["arxiv_db_engine"]
+
+    def generate() -> Iterator[str]:
+        with Session(engine) as session:
+            query = UserModel.base_select(session)
+            if sort_nickname_alias is not None:
+                query = query.join(sort_nickname_alias, TapirUser.user_id == sort_nickname_alias.user_id)
+            query, _all_users = filter_users(query, request, session, current_user, filters)
+            for column in order_columns:
+                query = query.order_by(column.desc() if _order == "DESC" else column.asc())
+
+            result = session.execute(query.statement.execution_options(yield_per=USER_EXPORT_CHUNK_SIZE))
+            count = 0
+            for rows in result.partitions():
+                yield _user_export_lines(_user_export_records(rows), format, header=count == 0)
+                count += len(rows)
+            if count == 0 and format == "csv":
+                yield _user_export_lines(iter([]), format, header=True)
+            logger.info(f"Exported {count} users as {format}")
+
+    filename = f"users_{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 def sanitize_user_update_data(update_data: dict) -> dict:
@@ -559,6 +848,7 @@ async def update_user_demographic(
         remote_ip,
         remote_hostname,
         tracking_cookie)
+    users_changed(session, [user_id])
     session.commit()
     result = UserModel.one_user(session, str(user_id))
     if result is None:
@@ -628,12 +918,108 @@ async def update_user(
                         tracking_cookie)
                 else:
                     setattr(target, field, new_value)
+    users_changed(session, [user_id])
     session.commit()
+    if user_autocomplete_index.is_built:
+        user_autocomplete_index.update_users(session, [user_id])
     result = UserModel.one_user(session, str(user_id))
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found after update")
     return result
 
+# Fields PATCH /users/bulk can change: only those with an audit event, so every change is recorded. The account
+# management fields need to go through the account management API, as in update_user.
+BULK_TAPIR_USER_FIELDS = {field for field in TAPIR_USER_FIELDS | ADMIN_TAPIR_USER_FIELDS | ADMIN_AUDIT_TAPIR_USER_FIELDS
+                          if field in user_prop_audit_registry and field not in ACCOUNT_MANAGEMENT_FIELDS}
+BULK_DEMOGRAPHIC_FIELDS = {field for field in DEMOGRAPHIC_FIELDS | ADMIN_DEMOGRAPHIC_FIELDS | ADMIN_AUDIT_DEMOGRAPHIC_FIELDS
+                           if field in user_prop_audit_registry and field not in ACCOUNT_MANAGEMENT_FIELDS}
+
+
+@router.patch('/bulk')
+async def bulk_update_users(
+        body: UserBulkUpdateRequest,
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        remote_ip: Optional[str] = Depends(get_client_host),
+        remote_hostname: Optional[str] = Depends(get_client_host_name),
+        tracking_cookie: Optional[str] = Depends(get_tapir_tracking_cookie),
+        session: Session = Depends(get_db)) -> UserBulkUpdateResponse:
+    """Apply property changes to many users in one transaction.
+
+    Users and demographics are loaded with one query each, and the audit records of all the
+    changes go in with multi-row inserts. Each change gets its own result; invalid ones are
+    skipped and do not stop the others.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can update user properties")
+
+    user_ids = {item.user_id for item in body.updates}
+    tapir_users = {user.user_id: user for user in
+                   session.query(TapirUser).filter(TapirUser.user_id.in_(user_ids)).all()} if user_ids else {}
+    demographics = {demographic.user_id: demographic for demographic in
+                    session.query(Demographic).filter(Demographic.user_id.in_(user_ids)).all()} if user_ids else {}
+
+    results: List[UserBulkUpdateResult] = []
+    audit_events = []
+    updated_user_ids = set()
+    for item in body.updates:
+        def result(item_status: str, detail: Optional[str] = None) -> None:
+            results.append(UserBulkUpdateResult(user_id=item.user_id, property_name=item.property_name,
+                                                status=item_status, detail=detail))
+
+        field = item.property_name
+        if field in BULK_TAPIR_USER_FIELDS:
+            target = tapir_users.get(item.user_id)
+        elif field in BULK_DEMOGRAPHIC_FIELDS:
+            target = demographics.get(item.user_id)
+        else:
+            result("invalid", f"{field} cannot be changed here")
+            continue
+        if target is None:
+            result("not_found", "User not found")
+            continue
+
+        old_value = getattr(target, field)
+        new_value = item.property_value
+        if isinstance(new_value, bool) and isinstance(old_value, int):
+            # column is boolean but shows up as int
+            new_value = 1 if new_value else 0
+        elif isinstance(new_value, str) and isinstance(old_value, int):
+            try:
+                new_value = int(new_value)
+            except ValueError:
+                result("invalid", f"{field} needs an integer")
+                continue
+
+        if old_value == new_value:
+            result("unchanged")
+            continue
+
+        setattr(target, field, new_value)
+        audit_events.append(make_user_prop_audit_event(
+            str(current_user.user_id), str(current_user.tapir_session_id), field, str(item.user_id),
+            old_value, new_value, comment=body.comment, remote_ip=remote_ip,
+            remote_hostname=remote_hostname, tracking_cookie=tracking_cookie))
+        updated_user_ids.add(item.user_id)
+        result("updated")
+
+    try:
+        session.flush()
+        audit_count = record_admin_audit_events(session, audit_events)
+        users_changed(session, updated_user_ids)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error("bulk_update_users: failed", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+
+    if user_autocomplete_index.is_built:
+        user_autocomplete_index.update_users(session, updated_user_ids)
+    return UserBulkUpdateResponse(
+        updated_count=sum(1 for item_result in results if item_result.status == "updated"),
+        audit_count=audit_count,
+        results=results)
+
+
 @router.post('/{user_id:int}/comment', status_code=status.HTTP_201_CREATED)
 async def create_user_comment(
         user_id: int,
@@ -701,6 +1087,7 @@ async def update_user_veto_status(
                 status_after=UserVetoStatus(body.status_after.value),
                 comment=body.comment,
         ))
+        users_changed(session, [user_id])
         session.commit()
     else:
         raise HTTPException(status_code=status.HTTP_208_ALREADY_REPORTED, detail="No change")
@@ -726,6 +1113,7 @@ async def create_user(request: Request,
             setattr(user, key, value)
     session.add(user)
     session.flush()  # Ensure user_id is populated
+    users_changed(session, [user.user_id])
     result = UserModel.one_user(session, str(user.user_id))
     if result is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
@@ -742,6 +1130,7 @@ def delete_user(response: Response,
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     user.flag_deleted = True
+    users_changed(session, [user_id])
 
     session.commit()
     session.refresh(user)  # Refresh the instance with the updated data
@@ -789,14 +1178,9 @@ def from_submit_to_to_category_yes_no(accessor: EndorsementAccessor, cat: Catego
     )
 
 
-@router.get("/{user_id:int}/can-submit-to")
-def get_user_can_submit_to(
-        response: Response,
-        user_id:int,
-        current_user: ArxivUserClaims = Depends(get_authn_user),
-        session: Session = Depends(get_db)) -> List[CategoryYesNo]:
+def categories_user_can_submit_to(session: Session, user_id: int) -> Optional[List[CategoryYesNo]]:
+    """Yes/no for each canonical category. None when the user does not exist."""
     from .biz.endorsement_io import EndorsementDBAccessor
-    check_authnz(None, current_user, user_id)
 
     categories = session.query(Category).all()
     accessor = EndorsementDBAccessor(session)
@@ -804,7 +1188,7 @@ def get_user_can_submit_to(
     result = []
     user = accessor.get_user(str(user_id))
     if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return None
     covered: dict[str, bool] = {}
 
     cat: Category
@@ -815,7 +1199,19 @@ def get_user_can_submit_to(
             continue
         covered[tag] = True
         result.append(from_submit_to_to_category_yes_no(accessor, cat, user))
+    return result
+
 
+@router.get("/{user_id:int}/can-submit-to")
+def get_user_can_submit_to(
+        response: Response,
+        user_id:int,
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        session: Session = Depends(get_db)) -> List[CategoryYesNo]:
+    check_authnz(None, current_user, user_id)
+    result = categories_user_can_submit_to(session, user_id)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     response.headers['X-Total-Count'] = str(len(result))
     return result
 
@@ -832,13 +1228,8 @@ def from_can_endorse_for_to_category_yes_no(accessor: EndorsementAccessor, cat:
     )
 
 
-@router.get("/{user_id:int}/can-endorse-for")
-def get_user_can_endorse_for(
-        response: Response,
-        user_id: int,
-        current_user: ArxivUserClaims = Depends(get_authn_user),
-        session: Session = Depends(get_db)) -> List[CategoryYesNo]:
-    check_authnz(None, current_user, user_id)
+def categories_user_can_endorse_for(session: Session, user_id: int) -> Optional[List[CategoryYesNo]]:
+    """Yes/no for each canonical category. None when the user does not exist."""
     categories: List[Category] = session.query(Category).all()
     from .biz.endorsement_io import EndorsementDBAccessor
     accessor = EndorsementDBAccessor(session)
@@ -846,7 +1237,7 @@ def get_user_can_endorse_for(
     result = []
     user = accessor.get_user(str(user_id))
     if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return None
     covered: dict[str, bool] = {}
 
     cat: Category
@@ -857,7 +1248,19 @@ def get_user_can_endorse_for(
             continue
         covered[tag] = True
         result.append(from_can_endorse_for_to_category_yes_no(accessor, cat, user))
+    return result
+
 
+@router.get("/{user_id:int}/can-endorse-for")
+def get_user_can_endorse_for(
+        response: Response,
+        user_id: int,
+        current_user: ArxivUserClaims = Depends(get_authn_user),
+        session: Session = Depends(get_db)) -> List[CategoryYesNo]:
+    check_authnz(None, current_user, user_id)
+    result = categories_user_can_endorse_for(session, user_id)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     response.headers['X-Total-Count'] = str(len(result))
     return result
 
@@ -1115,3 +1518,67 @@ def get_user_activity_summary(user_id:int,
         tapir_sessions_count=tapir_sessions_count,
         admin_log_count=admin_log_count,
     )
+
+
+class UserOwnershipSummary(BaseModel):
+    total: int
+    author: int
+
+
+class UserDashboard(BaseModel):
+    id: int
+    change_token: str
+    activity: UserActivitySummary
+    documents: UserDocumentSummary
+    ownership: UserOwnershipSummary
+    can_submit_to: List[CategoryYesNo]
+    can_endorse_for: List[CategoryYesNo]
+
+
+user_dashboard_cache: BoundedCache[tuple[int, str], UserDashboard] = \
+    BoundedCache("user_dashboard", maxsize=1024, ttl=30)
+
+
+def _in_own_session(engine: Any, fn: Callable[..., Any], *args: Any) -> Any:
+    # A session is not thread safe - each concurrent part gets its own
+    with Session(engine) as session:
+        return fn(session, *args)
+
+
+@router.get("/{user_id:int}/dashboard")
+async def get_user_dashboard(
+        request: Request,
+        user_id: int,
+        current_user: ArxivUserClaims = Depends(get_authn_user)) -> UserDashboard:
+    """Everything the user page shows, in one request.
+
+    The counts are one aggregate query per table, the parts run concurrently, and the result is
+    cached for a short while under the user id and a change token.
+    """
+    check_authnz(None, current_user, user_id)
+    engine = request.app.extra["arxiv_db_engine"]
+
+    change_token = await asyncio.to_thread(_in_own_session, engine, dashboard_change_token, user_id)
+    if change_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    dashboard = user_dashboard_cache.get((user_id, change_token))
+    if dashboard is not None:
+        return dashboard
+
+    activity, papers, can_submit_to, can_endorse_for = await asyncio.gather(
+        asyncio.to_thread(_in_own_session, engine, activity_counts, user_id),
+        asyncio.to_thread(_in_own_session, engine, paper_counts, user_id),
+        asyncio.to_thread(_in_own_session, engine, categories_user_can_submit_to, user_id),
+        asyncio.to_thread(_in_own_session, engine, categories_user_can_endorse_for, user_id),
+    )
+    dashboard = UserDashboard(
+        id=user_id,
+        change_token=change_token,
+        activity=UserActivitySummary.model_validate(activity),
+        documents=UserDocumentSummary.model_validate(papers),
+        ownership=UserOwnershipSummary(total=papers["ownership_total"], author=papers["ownership_author"]),
+        can_submit_to=can_submit_to or [],
+        can_endorse_for=can_endorse_for or [],
+    )
+    user_dashboard_cache.set((user_id, change_token), dashboard)
+    return dashboard
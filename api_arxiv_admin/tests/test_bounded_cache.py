@@ -0,0 +1,66 @@
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from arxiv_admin_api.helpers.bounded_cache import BoundedCache, registered_caches
+
+
+def test_bounded_cache_lru_eviction() -> None:
+    cache: BoundedCache[int, str] = BoundedCache("test_lru", maxsize=2, ttl=None)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    assert cache.get(1) == "one"  # 2 is now the least recently used
+    cache.set(3, "three")
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+    stats = cache.stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert cache in registered_caches()
+
+
+def test_bounded_cache_ttl_and_sweep() -> None:
+    cache: BoundedCache[str, int] = BoundedCache("test_ttl", maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.sweep() == 1
+    assert len(cache) == 0
+    assert cache.stats().expirations == 2
+
+
+def test_bounded_cache_invalidation_hooks() -> None:
+    cache: BoundedCache[str, int] = BoundedCache("test_hooks", maxsize=10, ttl=60)
+    invalidated = []
+    cache.on_invalidate(invalidated.append)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    assert "a" not in cache
+    cache.clear()
+    assert invalidated == ["a", None]
+    assert cache.stats().invalidations == 2
+
+
+def test_bounded_cache_registry_same_name() -> None:
+    first: BoundedCache[str, int] = BoundedCache("test_same_name", maxsize=10, ttl=60)
+    second: BoundedCache[str, int] = BoundedCache("test_same_name", maxsize=10, ttl=60)
+    assert sum(1 for cache in registered_caches() if cache is first or cache is second) == 2
+
+    del second
+    gc.collect()
+    assert [cache for cache in registered_caches() if cache.name == "test_same_name"] == [first]
+
+
+def test_bounded_cache_one_sweeper() -> None:
+    """Caches created from several threads at once share one sweeper thread"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        caches = list(executor.map(lambda i: BoundedCache(f"test_sweeper_{i}", maxsize=1), range(32)))
+    assert len(caches) == 32
+    assert [thread.name for thread in threading.enumerate()].count("bounded_cache_sweeper") == 1
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from arxiv_admin_api.helpers.db_compat import load_id_set, ID_SET_INSERT_BATCH_SIZE
+
+
+def test_load_id_set() -> None:
+    engine = create_engine("sqlite://")
+    users = Table("users", MetaData(), Column("user_id", Integer, primary_key=True))
+    users.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(users), [{"user_id": user_id} for user_id in range(1, 30001)])
+
+        # More than one insert batch, with duplicates
+        ids = list(range(2, 30001, 2)) + list(range(2, 2001, 2))
+        assert len(set(ids)) > ID_SET_INSERT_BATCH_SIZE
+        id_table = load_id_set(session, "tmp_test_ids", ids)
+        joined = session.execute(
+            select(users.c.user_id).join(id_table, id_table.c.id == users.c.user_id).order_by(users.c.user_id)
+        ).scalars().all()
+        assert joined == sorted(set(ids))
+
+        # Emptied on every call
+        id_table = load_id_set(session, "tmp_test_ids", [3, 5, 40000])
+        assert session.execute(
+            select(users.c.user_id).join(id_table, id_table.c.id == users.c.user_id)
+        ).scalars().all() == [3, 5]
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+
+def test_demographic_stats(admin_api_sqlite_client: TestClient,
+                           admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/demographics/stats?group_by=country&group_by=type&limit=5",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] > 0
+    assert [histogram["field"] for histogram in data["histograms"]] == ["country", "type"]
+    for histogram in data["histograms"]:
+        counts = [bucket["count"] for bucket in histogram["buckets"]]
+        assert len(counts) <= 5
+        assert counts == sorted(counts, reverse=True)
+        assert sum(counts) + histogram["other_count"] == data["total"]
+
+
+def test_demographic_stats_filtered(admin_api_sqlite_client: TestClient,
+                                    admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/demographics/stats?group_by=country",
+                                           headers=admin_api_admin_user_headers)
+    top_country = response.json()["histograms"][0]["buckets"][0]
+
+    response = admin_api_sqlite_client.get(f"/v1/demographics/stats?group_by=country&country={top_country['value']}",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == top_country["count"]
+    assert data["histograms"][0]["buckets"] == [top_country]
+
+
+def test_demographic_stats_invalid_field(admin_api_sqlite_client: TestClient,
+                                         admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/demographics/stats?group_by=url",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 400
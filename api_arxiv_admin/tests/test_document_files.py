@@ -0,0 +1,157 @@
+import asyncio
+import base64
+import hashlib
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import google_crc32c
+import pytest
+from arxiv.identifier import Identifier as arXivID
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from arxiv_admin_api.accessors import LocalPathAccessor, GCPBlobAccessor, UploadDigest
+from arxiv_admin_api.accessors import accessors as accessors_module
+from arxiv_admin_api.documents import local_file_response, copy_upload
+
+PAPER_ID = "2301.00001"
+
+
+def test_local_file_response(tmp_path: Path) -> None:
+    content = bytes(range(256)) * 64
+    path = tmp_path / "2301.00001v1.pdf"
+    path.write_bytes(content)
+    blob = LocalPathAccessor(arXivID(PAPER_ID), path=path)
+
+    app = FastAPI()
+
+    @app.get("/file")
+    def get_file():
+        return local_file_response(blob, "application/pdf", "2301.00001v1.pdf")
+
+    client = TestClient(app)
+    response = client.get("/file")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-length"] == str(len(content))
+    assert response.headers["content-disposition"] == 'attachment; filename="2301.00001v1.pdf"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+    response = client.get("/file", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == content[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+
+
+def test_copy_upload() -> None:
+    content = b"%PDF-1.5 " * 300000
+    fd_to = io.BytesIO()
+    digest = asyncio.run(copy_upload(UploadFile(file=io.BytesIO(content), filename="x.pdf"), fd_to))
+    assert fd_to.getvalue() == content
+    assert digest.size == len(content)
+    assert digest.md5_base64 == base64.b64encode(hashlib.md5(content).digest()).decode("ascii")
+    assert digest.crc32c_base64 == base64.b64encode(google_crc32c.Checksum(content).digest()).decode("ascii")
+
+
+class _FakeBlob:
+    """Records the calls. reload() sets the crc32c that "GCS" reports."""
+
+    def __init__(self, name: str, bucket: "_FakeBucket"):
+        self.name = name
+        self.bucket = bucket
+        self.crc32c: Optional[str] = None
+        self.uploads: List[str] = []
+
+    def upload_from_filename(self, filename: str, **_kwargs: Any) -> None:
+        self.uploads.append("single")
+
+    def reload(self, client: Any = None) -> None:
+        self.crc32c = self.bucket.stored_crc32c
+
+    def rewrite(self, source: "_FakeBlob", token: Any = None, **_kwargs: Any) -> tuple:
+        self.uploads.append(f"rewrite {'resumed' if token else 'from'} {source.name}")
+        # Two calls, as for a large object
+        return (None if token else "token"), 0, 0
+
+    def delete(self, client: Any = None) -> None:
+        self.bucket.deleted.append(self.name)
+
+
+class _FakeBucket:
+    def __init__(self, stored_crc32c: str):
+        self.stored_crc32c = stored_crc32c
+        self.blobs: Dict[str, _FakeBlob] = {}
+        self.deleted: List[str] = []
+
+    def blob(self, name: str) -> _FakeBlob:
+        return self.blobs.setdefault(name, _FakeBlob(name, self))
+
+
+class _TestBlobAccessor(GCPBlobAccessor):
+    @property
+    def blob_name(self) -> str:
+        return "ftp/arxiv/papers/2301/2301.00001.tar.gz"
+
+
+def _blob_accessor(bucket: _FakeBucket) -> _TestBlobAccessor:
+    storage = SimpleNamespace(client=object(), bucket_name="test-bucket", bucket=bucket)
+    return _TestBlobAccessor(arXivID(PAPER_ID), storage=storage)
+
+
+def _spool(tmp_path: Path, content: bytes) -> tuple[str, UploadDigest]:
+    path = tmp_path / "upload.tar.gz"
+    path.write_bytes(content)
+    digest = UploadDigest()
+    digest.update(content)
+    return str(path), digest
+
+
+def _staging(bucket: _FakeBucket, accessor: _TestBlobAccessor) -> _FakeBlob:
+    [staging] = [blob for name, blob in bucket.blobs.items() if name != accessor.blob_name]
+    return staging
+
+
+def test_upload_large_from_filename_parts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    filename, digest = _spool(tmp_path, b"0123456789" * 10)
+    calls = []
+
+    def upload_chunks_concurrently(filename: str, blob: Any, **kwargs: Any) -> None:
+        calls.append((blob.name, kwargs))
+
+    monkeypatch.setattr(accessors_module.transfer_manager, "upload_chunks_concurrently", upload_chunks_concurrently)
+    bucket = _FakeBucket(digest.crc32c_base64)
+    accessor = _blob_accessor(bucket)
+    asyncio.run(accessor.upload_large_from_filename(filename, digest, part_size=32, max_workers=3))
+    staging = _staging(bucket, accessor)
+    assert staging.name.startswith(accessor.blob_name + ".upload-")
+    assert len(calls) == 1
+    assert calls[0][0] == staging.name
+    assert calls[0][1]["chunk_size"] == 32 and calls[0][1]["max_workers"] == 3
+    # Rewritten into place, then the staging object is gone
+    assert accessor.blob.uploads == [f"rewrite from {staging.name}", f"rewrite resumed {staging.name}"]
+    assert bucket.deleted == [staging.name]
+
+    # Fits in one part
+    bucket = _FakeBucket(digest.crc32c_base64)
+    accessor = _blob_accessor(bucket)
+    asyncio.run(accessor.upload_large_from_filename(filename, digest, part_size=1024))
+    assert _staging(bucket, accessor).uploads == ["single"]
+
+
+def test_upload_large_from_filename_crc32c_mismatch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    filename, digest = _spool(tmp_path, b"0123456789" * 10)
+    other = UploadDigest()
+    other.update(b"something else")
+    bucket = _FakeBucket(other.crc32c_base64)
+    monkeypatch.setattr(accessors_module.transfer_manager, "upload_chunks_concurrently",
+                        lambda *_args, **_kwargs: None)
+
+    accessor = _blob_accessor(bucket)
+    with pytest.raises(ValueError, match="CRC32C mismatch"):
+        asyncio.run(accessor.upload_large_from_filename(filename, digest, part_size=32))
+    # The live object is not touched, and the staging object is deleted
+    assert accessor.blob.uploads == []
+    assert bucket.deleted == [_staging(bucket, accessor).name]
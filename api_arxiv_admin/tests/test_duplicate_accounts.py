@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+from arxiv_admin_api.biz.duplicate_accounts import (canonical_email, soundex, find_candidates, UserKeySource,
+                                                    detect_duplicate_accounts)
+
+
+def test_canonical_email() -> None:
+    assert canonical_email("J.Watt+arxiv@GoogleMail.com") == "jwatt@gmail.com"
+    assert canonical_email("j.watt+arxiv@cornell.edu") == "j.watt@cornell.edu"
+    assert canonical_email("not-an-email") is None
+
+
+def test_soundex() -> None:
+    assert soundex("Robert") == "R163"
+    assert soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Tymczak") == "T522"
+    assert soundex("Müller") == soundex("Muller")
+    assert soundex("") is None
+
+
+def test_find_candidates() -> None:
+    users = [
+        UserKeySource(1, "jwatt@gmail.com", "Jacques", "Watt", "Cornell", None),
+        UserKeySource(2, "j.watt+old@gmail.com", "J", "Wat", "Cornell ", None),
+        UserKeySource(3, "someone@example.org", "Mary", "Wott", "cornell", None),
+        UserKeySource(4, "other@example.org", "Ann", "Other", "", "shared-cookie"),
+        UserKeySource(5, "another@example.org", "Bob", "Else", "", "shared-cookie"),
+        UserKeySource(6, "third@example.org", "Cy", "Third", "", "shared-cookie"),
+    ]
+    candidates = find_candidates(iter(users), max_bucket_size=2)
+    assert candidates[0].user_id == 1 and candidates[0].other_user_id == 2
+    assert candidates[0].reasons == ("email", "name")
+    # The shared cookie is on three users, over the limit
+    assert [(candidate.user_id, candidate.other_user_id) for candidate in candidates] == [(1, 2)]
+
+
+def test_list_duplicate_accounts(admin_api_sqlite_client: TestClient,
+                                 admin_api_admin_user_headers: dict,
+                                 sqlite_session) -> None:
+    with sqlite_session() as session:
+        count = detect_duplicate_accounts(session)
+
+    response = admin_api_sqlite_client.get("/v1/duplicate_accounts/?_start=0&_end=10",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == str(count)
+    scores = [item["score"] for item in response.json()]
+    assert scores == sorted(scores, reverse=True)
+    for item in response.json():
+        assert item["user_id"] < item["other_user_id"]
+
+
+def test_list_duplicate_accounts_no_auth(admin_api_sqlite_client: TestClient) -> None:
+    response = admin_api_sqlite_client.get("/v1/duplicate_accounts/")
+    assert response.status_code == 401
@@ -4,8 +4,9 @@ from pydantic import TypeAdapter
 
 import pytest
 from arxiv.auth.user_claims import ArxivUserClaims
-from arxiv.db.models import OwnershipRequest, OwnershipRequestsAudit, t_arXiv_ownership_requests_papers, TapirAdminAudit
-from sqlalchemy import and_
+from arxiv.db.models import OwnershipRequest, OwnershipRequestsAudit, t_arXiv_ownership_requests_papers, TapirAdminAudit, \
+    Document, PaperOwner, Submission, Metadata, Demographic
+from sqlalchemy import and_, func
 
 from arxiv_admin_api.ownership_requests import CreateOwnershipRequestModel, OwnershipRequestModel, \
     OwnershipRequestSubmit, WorkflowStatus
@@ -20,6 +21,21 @@ class _TestParams:
     SESSION_ID: int = 8788860
 
 
+def _last_audit_entry_id(db_session: Session) -> int:
+    return db_session.query(func.max(TapirAdminAudit.entry_id)).scalar() or 0
+
+
+def _delete_ownerships(sqlite_session, user_id: int, doc_ids: list[int], last_audit_entry_id: int) -> None:
+    """Remove the ownerships a test added to the shared database, and the admin audits written since"""
+    with sqlite_session() as db_session:
+        db_session.query(PaperOwner).filter(PaperOwner.user_id == user_id, PaperOwner.document_id.in_(doc_ids)) \
+            .delete(synchronize_session=False)
+        db_session.query(TapirAdminAudit).filter(TapirAdminAudit.entry_id > last_audit_entry_id,
+                                                 TapirAdminAudit.affected_user == user_id) \
+            .delete(synchronize_session=False)
+        db_session.commit()
+
+
 def test_create_ownership_request(admin_api_sqlite_client,
                                   sqlite_session, test_env_sqlite,
                                   admin_api_admin_user_headers,
@@ -161,3 +177,162 @@ def test_create_ownership_request(admin_api_sqlite_client,
         # Verify all new doc_ids are present in results
         result_doc_ids = set(item['document_id'] for item in result31)
         assert doc_ids.issubset(result_doc_ids)
+
+
+def test_list_ownership_requests_document_ids(admin_api_sqlite_client, admin_api_admin_user_headers):
+    response = admin_api_sqlite_client.get("/v1/ownership_requests/?_start=0&_end=20",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    listed = [OwnershipRequestModel.model_validate(item) for item in response.json()]
+    for item in listed[:5]:
+        single = OwnershipRequestModel.model_validate(admin_api_sqlite_client.get(
+            f"/v1/ownership_requests/{item.id}", headers=admin_api_admin_user_headers).json())
+        assert sorted(item.document_ids or []) == sorted(single.document_ids or [])
+        assert sorted(item.paper_ids or []) == sorted(single.paper_ids or [])
+
+
+def test_update_authorship_bulk(admin_api_sqlite_client, sqlite_session, admin_api_admin_user_headers):
+    user_id = _TestParams.USER_ID
+    with sqlite_session() as db_session:
+        owned = db_session.query(PaperOwner.document_id).filter(PaperOwner.user_id == user_id)
+        doc_ids = [doc.document_id for doc in db_session.query(Document.document_id).filter(
+            ~Document.document_id.in_(owned)).order_by(Document.document_id).limit(3).all()]
+        audit_count = db_session.query(TapirAdminAudit).filter(TapirAdminAudit.affected_user == user_id).count()
+        last_audit_entry_id = _last_audit_entry_id(db_session)
+    keys = [f"user_{user_id}-doc_{doc_id}" for doc_id in doc_ids]
+    try:
+        response = admin_api_sqlite_client.put("/v1/paper_owners/authorship/upsert",
+                                               headers=admin_api_admin_user_headers,
+                                               json={"authored": keys[:2], "not_authored": keys[2:], "auto": False})
+        assert response.status_code == 200
+        assert {item["id"] for item in response.json()["data"]["data"]} == set(keys)
+
+        response = admin_api_sqlite_client.put("/v1/paper_owners/authorship/update",
+                                               headers=admin_api_admin_user_headers,
+                                               json={"authored": keys[2:], "not_authored": keys[:2], "valid": False})
+        assert response.status_code == 200
+
+        with sqlite_session() as db_session:
+            rows = {po.document_id: po for po in db_session.query(PaperOwner).filter(
+                PaperOwner.user_id == user_id, PaperOwner.document_id.in_(doc_ids)).all()}
+            assert [bool(rows[doc_id].flag_author) for doc_id in doc_ids] == [False, False, True]
+            assert not any(rows[doc_id].valid for doc_id in doc_ids)
+            # add + author flag + valid for each new one; author flag + revoke for each updated one
+            new_audits = db_session.query(TapirAdminAudit).filter(TapirAdminAudit.affected_user == user_id).count()
+            assert new_audits - audit_count == 3 * 3 + 3 * 2
+    finally:
+        _delete_ownerships(sqlite_session, user_id, doc_ids, last_audit_entry_id)
+
+
+def test_bulk_upload_ownership_request_report(admin_api_sqlite_client, sqlite_session, admin_api_admin_user_headers):
+    user_id = _TestParams.USER_ID
+    with sqlite_session() as db_session:
+        owned = db_session.query(PaperOwner.document_id).filter(PaperOwner.user_id == user_id)
+        free, taken = db_session.query(Document).filter(~Document.document_id.in_(owned)).order_by(
+            Document.document_id).limit(2).all()
+        free_id, taken_id = free.document_id, taken.document_id
+        lines = [free.paper_id, "not a paper id", free.paper_id, "0704.99999", taken.paper_id]
+        last_audit_entry_id = _last_audit_entry_id(db_session)
+    try:
+        response = admin_api_sqlite_client.put("/v1/paper_owners/authorship/upsert",
+                                               headers=admin_api_admin_user_headers,
+                                               json={"authored": [f"user_{user_id}-doc_{taken_id}"]})
+        assert response.status_code == 200
+        content = "\n".join(lines)
+        url = f"/v1/paper_owners/user/{user_id}"
+
+        response = admin_api_sqlite_client.post(url, headers=admin_api_admin_user_headers, data={"content": content})
+        assert response.status_code == 400
+        assert "line 2" in response.json()["detail"]
+
+        response = admin_api_sqlite_client.post(url, headers=admin_api_admin_user_headers,
+                                                data={"content": content, "strict": "false"})
+        assert response.status_code == 200
+        result = response.json()
+        assert result["authored"] == [f"user_{user_id}-doc_{free_id}"]
+        statuses = [(line["line"], line["status"]) for line in result["report"]]
+        assert statuses == [(1, "added"), (2, "ill_formed"), (3, "duplicate"), (4, "not_found"), (5, "owned")]
+    finally:
+        _delete_ownerships(sqlite_session, user_id, [free_id, taken_id], last_audit_entry_id)
+
+
+def test_list_ownerships_with_document(admin_api_sqlite_client, sqlite_session, admin_api_admin_user_headers):
+    response = admin_api_sqlite_client.get("/v1/paper_owners/", headers=admin_api_admin_user_headers,
+                                           params={"with_document": "true", "_start": 0, "_end": 20})
+    assert response.status_code == 200
+    ownerships = response.json()
+    assert ownerships
+    with sqlite_session() as db_session:
+        for ownership in ownerships:
+            document = ownership["document"]
+            doc_id = ownership["document_id"]
+            assert document["id"] == doc_id
+            last_submission_id = db_session.query(func.max(Submission.submission_id)).filter(
+                Submission.document_id == doc_id).scalar()
+            assert document["last_submission_id"] == last_submission_id
+            current = db_session.query(Metadata.abs_categories).filter(
+                Metadata.document_id == doc_id, Metadata.is_current == 1, Metadata.is_withdrawn == 0
+            ).order_by(Metadata.metadata_id.desc()).first()
+            assert document["abs_categories"] == (current.abs_categories if current else None)
+            authors = db_session.query(PaperOwner.user_id).join(
+                Demographic, Demographic.user_id == PaperOwner.user_id).filter(
+                PaperOwner.document_id == doc_id, Demographic.flag_proxy == 0).all()
+            assert sorted(document["author_ids"]) == sorted(author.user_id for author in authors)
+
+
+def test_decide_ownership_requests(admin_api_sqlite_client, sqlite_session, admin_api_admin_user_headers):
+    user_id = _TestParams.USER_ID
+    with sqlite_session() as db_session:
+        owned = db_session.query(PaperOwner.document_id).filter(PaperOwner.user_id == user_id)
+        doc_ids = [doc.document_id for doc in db_session.query(Document.document_id).filter(
+            ~Document.document_id.in_(owned)).order_by(Document.document_id.desc()).limit(2).all()]
+        owned_doc_id = owned.first().document_id
+        accepted = OwnershipRequest(user_id=user_id, workflow_status="pending")
+        rejected = OwnershipRequest(user_id=user_id, workflow_status="pending")
+        db_session.add_all([accepted, rejected])
+        db_session.commit()
+        accepted_id, rejected_id = accepted.request_id, rejected.request_id
+        last_audit_entry_id = _last_audit_entry_id(db_session)
+    try:
+        decisions = [
+            {"request_id": accepted_id, "document_ids": doc_ids + [owned_doc_id],
+             "authored_documents": doc_ids[:1]},
+            {"request_id": rejected_id, "workflow_status": "rejected"},
+            {"request_id": 999999999, "document_ids": doc_ids},
+        ]
+        response = admin_api_sqlite_client.post("/v1/ownership_requests/decisions",
+                                                headers=admin_api_admin_user_headers, json=decisions)
+        assert response.status_code == 200
+        results = {result["request_id"]: result for result in response.json()}
+        assert results[accepted_id]["ok"] and results[accepted_id]["workflow_status"] == "accepted"
+        assert results[accepted_id]["added_document_ids"] == doc_ids
+        assert results[accepted_id]["owned_document_ids"] == [owned_doc_id]
+        assert results[rejected_id]["ok"] and results[rejected_id]["added_document_ids"] == []
+        assert not results[999999999]["ok"]
+
+        with sqlite_session() as db_session:
+            statuses = dict(db_session.query(OwnershipRequest.request_id, OwnershipRequest.workflow_status).filter(
+                OwnershipRequest.request_id.in_([accepted_id, rejected_id])).all())
+            assert statuses == {accepted_id: "accepted", rejected_id: "rejected"}
+            assert db_session.query(OwnershipRequestsAudit).filter(
+                OwnershipRequestsAudit.request_id.in_([accepted_id, rejected_id])).count() == 2
+            flags = dict(db_session.query(PaperOwner.document_id, PaperOwner.flag_author).filter(
+                PaperOwner.user_id == user_id, PaperOwner.document_id.in_(doc_ids)).all())
+            assert flags == {doc_ids[0]: 1, doc_ids[1]: 0}
+
+        # Decided already
+        response = admin_api_sqlite_client.post("/v1/ownership_requests/decisions",
+                                                headers=admin_api_admin_user_headers, json=decisions[:1])
+        assert response.status_code == 200
+        assert not response.json()[0]["ok"]
+    finally:
+        _delete_ownerships(sqlite_session, user_id, doc_ids, last_audit_entry_id)
+        request_ids = [accepted_id, rejected_id]
+        with sqlite_session() as db_session:
+            db_session.query(OwnershipRequestsAudit).filter(OwnershipRequestsAudit.request_id.in_(request_ids)) \
+                .delete(synchronize_session=False)
+            db_session.execute(t_arXiv_ownership_requests_papers.delete().where(
+                t_arXiv_ownership_requests_papers.c.request_id.in_(request_ids)))
+            db_session.query(OwnershipRequest).filter(OwnershipRequest.request_id.in_(request_ids)) \
+                .delete(synchronize_session=False)
+            db_session.commit()
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine
+from sqlalchemy.orm import Session
+
+from arxiv_admin_api.helpers.provisioned_table import ProvisionedTable
+
+
+def test_provisioned_table() -> None:
+    metadata = MetaData()
+    Table("tmp_provisioned", metadata, Column("id", Integer, primary_key=True))
+    provisioned = ProvisionedTable.from_metadata("tmp_provisioned", metadata, "tmp_provisioned_available")
+    with Session(create_engine("sqlite://")) as session:
+        assert not provisioned.available(session)
+
+        # ensure() drops the cached answer
+        provisioned.ensure(session)
+        session.commit()
+        assert provisioned.available(session)
+
+        # Creating again is a no-op
+        provisioned.ensure(session)
+        assert provisioned.available(session)
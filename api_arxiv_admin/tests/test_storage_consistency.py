@@ -0,0 +1,33 @@
+from arxiv_admin_api.biz.storage_consistency import Artifact, parse_blob_name, merge_join
+
+
+def test_parse_blob_name() -> None:
+    assert parse_blob_name("ps_cache/arxiv/pdf/2301/", "ps_cache/arxiv/pdf/2301/2301.00001v2.pdf") == \
+           Artifact("2301.00001", "pdf", 2)
+    assert parse_blob_name("ps_cache/arxiv/pdf/2301/", "ps_cache/arxiv/pdf/2301/2301.00001v2.outcome.tar.gz") is None
+    assert parse_blob_name("ftp/arxiv/papers/2301/", "ftp/arxiv/papers/2301/2301.00001.abs") == \
+           Artifact("2301.00001", "abs", 0)
+    assert parse_blob_name("ftp/arxiv/papers/2301/", "ftp/arxiv/papers/2301/2301.00001.tar.gz") == \
+           Artifact("2301.00001", "source", 0)
+    assert parse_blob_name("orig/arxiv/papers/2301/", "orig/arxiv/papers/2301/2301.00001v1.gz") == \
+           Artifact("2301.00001", "source", 1)
+    assert parse_blob_name("orig/arxiv/papers/2301/", "orig/arxiv/papers/2301/README") is None
+
+
+def test_merge_join() -> None:
+    expected = sorted([
+        Artifact("2301.00001", "abs", 0),
+        Artifact("2301.00001", "pdf", 1),
+        Artifact("2301.00002", "abs", 0),
+        Artifact("2301.00002", "pdf", 1),
+    ])
+    listed = sorted([
+        Artifact("2301.00001", "abs", 0),
+        Artifact("2301.00001", "pdf", 1),
+        Artifact("2301.00002", "pdf", 1),
+        Artifact("2301.00003", "pdf", 1),
+    ])
+    missing, extra = merge_join(expected, listed)
+    assert missing == [Artifact("2301.00002", "abs", 0)]
+    assert extra == [Artifact("2301.00003", "pdf", 1)]
+    assert merge_join([], listed) == ([], listed)
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from arxiv.db.models import Submission
+from fastapi.testclient import TestClient
+
+from arxiv_admin_api.submissions import poll_submission_changes, SubmissionChange, _submission_change_event
+
+
+def test_navigate_submissions(admin_api_sqlite_client: TestClient,
+                              admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get(
+        "/v1/submissions/?submission_status_group=accepted&_sort=id&_order=ASC&_start=0&_end=3",
+        headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    ids = [submission["id"] for submission in response.json()]
+    assert len(ids) == 3
+
+    response = admin_api_sqlite_client.get(
+        f"/v1/submissions/navigate?id={ids[1]}&submission_status_group=accepted",
+        headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    navi = response.json()
+    assert navi["prev_id"] == ids[0]
+    assert navi["next_id"] == ids[2]
+    assert navi["first_id"] == ids[0]
+    assert navi["last_id"] >= ids[2]
+
+    response = admin_api_sqlite_client.get(
+        f"/v1/submissions/navigate?id={ids[0]}&submission_status_group=accepted",
+        headers=admin_api_admin_user_headers)
+    assert response.json()["prev_id"] is None
+
+
+def test_list_submissions_categories(admin_api_sqlite_client: TestClient,
+                                     admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/submissions/?_sort=id&_order=DESC&_start=0&_end=20",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    for submission in response.json()[:5]:
+        single = admin_api_sqlite_client.get(f"/v1/submissions/{submission['id']}",
+                                             headers=admin_api_admin_user_headers).json()
+        key = lambda cat: (cat["category"], cat["is_primary"])
+        assert sorted(submission["submission_categories"], key=key) == sorted(single["submission_categories"], key=key)
+        if submission["submission_categories"]:
+            assert submission["submission_categories"][0]["is_primary"] == max(
+                cat["is_primary"] for cat in submission["submission_categories"])
+
+
+def test_submission_summary(admin_api_sqlite_client: TestClient,
+                            admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/submissions/summary", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    summary = response.json()
+    listed = admin_api_sqlite_client.get("/v1/submissions/?_start=0&_end=1", headers=admin_api_admin_user_headers)
+    assert summary["total"] == int(listed.headers["X-Total-Count"])
+    assert sum(summary["status_counts"].values()) == summary["total"]
+    assert summary["active"] == summary["status_counts"].get("0", 0)
+
+
+def test_submission_summary_of_user(admin_api_sqlite_client: TestClient,
+                                    admin_api_admin_user_headers: dict) -> None:
+    submission = admin_api_sqlite_client.get("/v1/submissions/?_start=0&_end=1",
+                                             headers=admin_api_admin_user_headers).json()[0]
+    user_id = submission["submitter_id"]
+    response = admin_api_sqlite_client.get(f"/v1/submissions/user/{user_id}/summary",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    summary = response.json()
+    listed = admin_api_sqlite_client.get(f"/v1/submissions/?submitter_id={user_id}&_start=0&_end=1",
+                                         headers=admin_api_admin_user_headers)
+    assert summary["total"] == int(listed.headers["X-Total-Count"])
+    assert summary["submission_permitted"] == (summary["active"] < summary["max_active_submissions"])
+
+
+def test_submission_summary_of_user_not_stale(admin_api_sqlite_client: TestClient,
+                                              admin_api_admin_user_headers: dict,
+                                              sqlite_session) -> None:
+    """A submission made outside of this API shows up in the submitter's summary right away"""
+    with sqlite_session() as session:
+        submission = session.query(Submission).filter(Submission.status != 0).first()
+        submission_id, user_id, status = submission.submission_id, submission.submitter_id, submission.status
+
+    before = admin_api_sqlite_client.get(f"/v1/submissions/user/{user_id}/summary",
+                                         headers=admin_api_admin_user_headers).json()
+    try:
+        with sqlite_session() as session:
+            session.query(Submission).filter(Submission.submission_id == submission_id).update({"status": 0})
+            session.commit()
+        after = admin_api_sqlite_client.get(f"/v1/submissions/user/{user_id}/summary",
+                                            headers=admin_api_admin_user_headers).json()
+        assert after["active"] == before["active"] + 1
+    finally:
+        with sqlite_session() as session:
+            session.query(Submission).filter(Submission.submission_id == submission_id).update({"status": status})
+            session.commit()
+
+
+def test_list_submissions_sparse_fields(admin_api_sqlite_client: TestClient,
+                                        admin_api_admin_user_headers: dict) -> None:
+    full = admin_api_sqlite_client.get("/v1/submissions/?_sort=id&_start=0&_end=10",
+                                       headers=admin_api_admin_user_headers)
+    sparse = admin_api_sqlite_client.get("/v1/submissions/?_sort=id&_start=0&_end=10&_fields=title,status",
+                                         headers=admin_api_admin_user_headers)
+    assert sparse.status_code == 200
+    assert sparse.headers["X-Total-Count"] == full.headers["X-Total-Count"]
+    assert sparse.json() == [{"id": item["id"], "title": item["title"], "status": item["status"]}
+                             for item in full.json()]
+
+    response = admin_api_sqlite_client.get("/v1/submissions/?_fields=no_such_field",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 400
+
+
+def test_poll_submission_changes(sqlite_session) -> None:
+    with sqlite_session() as session:
+        engine = session.get_bind()
+        changes, watermark = poll_submission_changes(engine, None)
+        assert changes == []
+        changes, watermark = poll_submission_changes(engine, watermark)
+        assert changes == []
+
+        submissions = session.query(Submission).order_by(Submission.submission_id).limit(2).all()
+        saved = {sub.submission_id: (sub.updated, sub.status) for sub in submissions}
+        first_id, second_id = saved
+    try:
+        now = (watermark.updated or datetime.now()) + timedelta(seconds=1)
+        with sqlite_session() as session:
+            session.query(Submission).filter(Submission.submission_id == first_id).update({"updated": now})
+            session.commit()
+        changes, watermark = poll_submission_changes(engine, watermark)
+        assert [change.change["id"] for change in changes] == [first_id]
+        assert set(changes[0].change.keys()) >= {"id", "status", "title", "submission_categories"}
+        assert not changes[0].created
+        changes, watermark = poll_submission_changes(engine, watermark)
+        assert changes == []
+
+        # Committed after the watermark moved past its updated, and updated again in the same second
+        with sqlite_session() as session:
+            session.query(Submission).filter(Submission.submission_id == second_id).update(
+                {"updated": now - timedelta(seconds=10)})
+            session.query(Submission).filter(Submission.submission_id == first_id).update(
+                {"status": saved[first_id][1] + 1})
+            session.commit()
+        changes, watermark = poll_submission_changes(engine, watermark)
+        assert sorted(change.change["id"] for change in changes) == sorted([first_id, second_id])
+        # The status the previous poll saw, for the stream to tell an in->out transition
+        previous = {change.change["id"]: change.previous_status for change in changes}
+        assert previous[first_id] == saved[first_id][1]
+        changes, watermark = poll_submission_changes(engine, watermark)
+        assert changes == []
+    finally:
+        with sqlite_session() as session:
+            for submission_id, (updated, status) in saved.items():
+                session.query(Submission).filter(Submission.submission_id == submission_id).update(
+                    {"updated": updated, "status": status})
+            session.commit()
+
+
+def test_submission_change_event() -> None:
+    """removed is sent only for a submission that was in the filter, or may have been"""
+    def event(status: int, previous_status: Optional[int], created: bool = False) -> Optional[str]:
+        sse = _submission_change_event(SubmissionChange({"id": 1, "status": status}, previous_status, created), [1, 2])
+        return sse.split("\n", 1)[0] if sse else None
+
+    assert event(1, None, created=True) == "event: submission"
+    assert event(2, 1) == "event: submission"
+    assert event(5, 1) == "event: removed"
+    assert event(5, 4) is None
+    assert event(5, None, created=True) is None
+    # Not read since the poller started - the client ignores it if it does not list it
+    assert event(5, None) == "event: removed"
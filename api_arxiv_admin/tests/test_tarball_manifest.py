@@ -0,0 +1,172 @@
+import asyncio
+import io
+import os
+import tarfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from arxiv.db.models import Metadata
+from arxiv.identifier import Identifier as arXivID
+from google.api_core.exceptions import NotFound
+
+from arxiv_admin_api import documents as documents_module
+from arxiv_admin_api.accessors import LocalPathAccessor, GCPBlobAccessor
+from arxiv_admin_api.biz.tarball_manifest import read_tarball_members, get_tarball_manifest, tarball_manifest_cache, \
+    TarballChangedError
+
+PAPER_ID = "2301.00001"
+
+
+def _write_tarball(path: Path, files: dict[str, bytes]) -> None:
+    with tarfile.open(path, "w:gz") as tar:
+        directory = tarfile.TarInfo("figures")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = 1700000000
+            tar.addfile(info, io.BytesIO(content))
+        link = tarfile.TarInfo("main.tex.link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "main.tex"
+        tar.addfile(link)
+
+
+class _TarballAccessor(LocalPathAccessor):
+    """A local tarball that counts how many times it is opened."""
+
+    opened = 0
+
+    def open(self, **kwargs: Any):
+        self.opened += 1
+        return super().open(**kwargs)
+
+    @property
+    def flavor(self) -> str:
+        return "tarball"
+
+
+def test_read_tarball_members(tmp_path: Path) -> None:
+    path = tmp_path / "2301.00001.tar.gz"
+    _write_tarball(path, {"main.tex": b"\\documentclass{article}", "figures/a.png": b"png" * 10})
+    with path.open("rb") as fd:
+        members = read_tarball_members(fd)
+    assert [(member.name, member.type, member.size) for member in members] == [
+        ("figures", "dir", 0),
+        ("main.tex", "file", 23),
+        ("figures/a.png", "file", 30),
+        ("main.tex.link", "symlink", 0),
+    ]
+    assert members[1].mtime is not None
+    assert members[3].linkname == "main.tex"
+
+
+def test_get_tarball_manifest_cached_by_generation(tmp_path: Path) -> None:
+    tarball_manifest_cache.clear()
+    path = tmp_path / "2301.00001.tar.gz"
+    _write_tarball(path, {"main.tex": b"\\documentclass{article}"})
+    accessor = _TarballAccessor(arXivID(PAPER_ID), path=path)
+
+    generation = asyncio.run(accessor.generation)
+    assert generation is not None
+    manifest = asyncio.run(get_tarball_manifest(accessor, generation))
+    assert manifest.member_count == 3
+    assert manifest.total_size == 23
+    assert asyncio.run(get_tarball_manifest(accessor, generation)) == manifest
+    assert accessor.opened == 1
+
+    # A new upload is a new generation
+    _write_tarball(path, {"main.tex": b"\\documentclass{article}", "refs.bib": b"@article{}"})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    new_generation = asyncio.run(accessor.generation)
+    assert new_generation != generation
+    assert asyncio.run(get_tarball_manifest(accessor, new_generation)).member_count == 4
+    assert accessor.opened == 2
+
+
+class _ReplacedTarballAccessor(_TarballAccessor):
+    """A local tarball that is replaced while it is open."""
+
+    def open(self, **kwargs: Any):
+        fd = super().open(**kwargs)
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        return fd
+
+
+def test_get_tarball_manifest_replaced_while_read(tmp_path: Path) -> None:
+    tarball_manifest_cache.clear()
+    path = tmp_path / "2301.00001.tar.gz"
+    _write_tarball(path, {"main.tex": b"\\documentclass{article}"})
+    accessor = _ReplacedTarballAccessor(arXivID(PAPER_ID), path=path)
+
+    generation = asyncio.run(accessor.generation)
+    with pytest.raises(TarballChangedError):
+        asyncio.run(get_tarball_manifest(accessor, generation))
+    assert tarball_manifest_cache.get((accessor.canonical_name, generation)) is None
+
+
+class _Blob:
+    def __init__(self, generation: int | None):
+        self.generation = generation
+        self.reload_clients: list[Any] = []
+
+    def reload(self, client: Any = None) -> None:
+        self.reload_clients.append(client)
+        if self.generation is None:
+            raise NotFound("gone")
+
+
+class _TestBlobAccessor(GCPBlobAccessor):
+    @property
+    def blob_name(self) -> str:
+        return "ftp/arxiv/papers/2301/2301.00001.tar.gz"
+
+
+def test_gcp_blob_generation() -> None:
+    client = object()
+    for generation, expected in [(1700000000123456, "1700000000123456"), (None, None)]:
+        blob = _Blob(generation)
+        storage = SimpleNamespace(client=client, bucket_name="test-bucket",
+                                  bucket=SimpleNamespace(blob=lambda _name: blob))
+        accessor = _TestBlobAccessor(arXivID(PAPER_ID), storage=storage)
+        assert asyncio.run(accessor.generation) == expected
+        # One metadata request, with the storage's client
+        assert blob.reload_clients == [client]
+
+
+def test_get_document_file_manifest(admin_api_sqlite_client, sqlite_session, admin_api_admin_user_headers,
+                                    tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    tarball_manifest_cache.clear()
+    with sqlite_session() as session:
+        document_id = session.query(Metadata.document_id).first().document_id
+    path = tmp_path / "2301.00001.tar.gz"
+    _write_tarball(path, {"main.tex": b"\\documentclass{article}"})
+    monkeypatch.setattr(documents_module, "list_related_files",
+                        lambda *_args: [_TarballAccessor(arXivID(PAPER_ID), path=path)])
+
+    response = admin_api_sqlite_client.get(f"/v1/documents/{document_id}/files/tarball/manifest",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    manifest = response.json()
+    assert manifest["member_count"] == 3
+    assert [member["name"] for member in manifest["members"]] == ["figures", "main.tex", "main.tex.link"]
+
+    # There is no outcome tarball
+    response = admin_api_sqlite_client.get(f"/v1/documents/{document_id}/files/outcome/manifest",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 404
+
+    response = admin_api_sqlite_client.get(f"/v1/documents/{document_id}/files/pdf/manifest",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 400
+
+    path.write_bytes(b"not a tarball")
+    tarball_manifest_cache.clear()
+    response = admin_api_sqlite_client.get(f"/v1/documents/{document_id}/files/tarball/manifest",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 422
@@ -158,4 +158,219 @@ def test_get_user_activity_summary(admin_api_sqlite_client: TestClient,
     assert isinstance(data["tapir_sessions_count"], int)
     assert isinstance(data["admin_log_count"], int)
     assert data["tapir_sessions_count"] >= 0
-    assert data["admin_log_count"] >= 0
\ No newline at end of file
+    assert data["admin_log_count"] >= 0
+
+
+# free-text search
+
+def test_search_users_without_index(admin_api_sqlite_client: TestClient,
+                                    admin_api_admin_user_headers: dict) -> None:
+    """Before the search index is built, search falls back to prefix matching"""
+    response = admin_api_sqlite_client.get("/v1/users/?search=jjw1133@cornell", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [person["id"] for person in data] == [1]
+
+
+def test_search_users_with_index(admin_api_sqlite_client: TestClient,
+                                 admin_api_admin_user_headers: dict,
+                                 sqlite_session) -> None:
+    """Search matches any part of a name, an email or a username"""
+    from arxiv_admin_api.biz.user_search_index import rebuild_user_search_index
+    with sqlite_session() as session:
+        assert rebuild_user_search_index(session) > 0
+
+    response = admin_api_sqlite_client.get("/v1/users/?search=jacques%20cornell", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert 1 in [person["id"] for person in response.json()]
+
+    response = admin_api_sqlite_client.get("/v1/users/?search=ookie_monst", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert 1129053 in [person["id"] for person in response.json()]
+
+
+def test_search_users_short_term(admin_api_sqlite_client: TestClient,
+                                 admin_api_admin_user_headers: dict,
+                                 sqlite_session) -> None:
+    """A term shorter than a trigram falls back to prefix matching"""
+    from arxiv_admin_api.biz.user_search_index import rebuild_user_search_index, user_search_subquery
+    with sqlite_session() as session:
+        rebuild_user_search_index(session)
+        assert user_search_subquery(session, "Li") is None
+        assert user_search_subquery(session, "li wei") is None
+        assert user_search_subquery(session, "cornell") is not None
+
+    # jjw1133@cornell...
+    response = admin_api_sqlite_client.get("/v1/users/?search=jj", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert 1 in [person["id"] for person in response.json()]
+
+    # Every term prefix-matches a name or the email
+    response = admin_api_sqlite_client.get("/v1/users/?search=Ja%20Watt", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert 1 in [person["id"] for person in response.json()]
+
+    response = admin_api_sqlite_client.get("/v1/users/?search=Ja%20%25", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert 1 not in [person["id"] for person in response.json()]
+
+
+def test_search_users_index_sync(sqlite_session) -> None:
+    """A user changed outside the admin API is re-indexed by the sync"""
+    from arxiv.db.models import TapirUser
+    from arxiv_admin_api.biz.user_search_index import (rebuild_user_search_index, sync_user_search_index,
+                                                       user_search_subquery)
+    with sqlite_session() as session:
+        rebuild_user_search_index(session)
+        user = session.get(TapirUser, 1)
+        first_name = user.first_name
+        try:
+            user.first_name = "Zebulon"
+            session.commit()
+            assert 1 not in session.execute(user_search_subquery(session, "zebulon")).scalars().all()
+
+            _count, written = sync_user_search_index(session)
+            assert written == 1
+            assert 1 in session.execute(user_search_subquery(session, "zebulon")).scalars().all()
+        finally:
+            user.first_name = first_name
+            session.commit()
+            sync_user_search_index(session)
+
+
+# autocomplete
+
+def test_autocomplete_users(admin_api_sqlite_client: TestClient,
+                            admin_api_admin_user_headers: dict) -> None:
+    """Prefix of a username or an email, case-insensitive"""
+    response = admin_api_sqlite_client.get("/v1/users/autocomplete?prefix=Cookie_Mon", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["id"] == 1129053
+    assert data[0]["matched"] == "username"
+
+    response = admin_api_sqlite_client.get("/v1/users/autocomplete?prefix=jjw1133@&limit=5", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert [person["id"] for person in response.json()] == [1]
+
+
+def test_autocomplete_users_database_matches_index(sqlite_session) -> None:
+    """Before the index is built, the prefix queries give what the index would"""
+    from arxiv_admin_api.biz.user_autocomplete import UserAutocompleteIndex
+    index = UserAutocompleteIndex()
+    with sqlite_session() as session:
+        index.build(session)
+        for prefix in ["Cookie_Mon", "jjw1133@", "%", "no-such-user"]:
+            assert UserAutocompleteIndex.search_database(session, prefix, 5) == index.search(prefix, 5)
+
+
+def test_autocomplete_users_no_auth(admin_api_sqlite_client: TestClient) -> None:
+    response = admin_api_sqlite_client.get("/v1/users/autocomplete?prefix=jjw")
+    assert response.status_code == 401
+
+
+# batched hydration
+
+def test_list_users_batched_hydration_matches_per_row(admin_api_sqlite_client: TestClient,
+                                                      admin_api_admin_user_headers: dict,
+                                                      sqlite_session) -> None:
+    """The page-level hydration gives the same users as converting each row with a session"""
+    from arxiv.db.models import TapirUser
+    from arxiv_bizlogic.bizmodels.user_model import UserModel
+
+    response = admin_api_sqlite_client.get("/v1/users/?flag_is_mod=true&_sort=id&_end=50",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    batched = response.json()
+    assert len(batched) > 0
+
+    user_ids = [person["id"] for person in batched]
+    with sqlite_session() as session:
+        rows = UserModel.base_select(session).filter(TapirUser.user_id.in_(user_ids)).order_by(TapirUser.user_id).all()
+        per_row = [UserModel.to_model(row, session=session).model_dump(mode="json") for row in rows]
+    assert batched == per_row
+
+
+# export
+
+def test_export_users_csv(admin_api_sqlite_client: TestClient,
+                          admin_api_admin_user_headers: dict) -> None:
+    import csv
+    import io
+    response = admin_api_sqlite_client.get("/v1/users/export?format=csv&email=jjw1133@cornell.edu",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["id"] == "1"
+    assert rows[0]["last_name"] == "Watt"
+
+
+def test_export_users_ndjson_matches_list(admin_api_sqlite_client: TestClient,
+                                          admin_api_admin_user_headers: dict) -> None:
+    import json
+    response = admin_api_sqlite_client.get("/v1/users/export?format=ndjson&flag_is_mod=true",
+                                           headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+
+    response = admin_api_sqlite_client.get("/v1/users/?flag_is_mod=true&_sort=id&_end=100000",
+                                           headers=admin_api_admin_user_headers)
+    assert [person["id"] for person in exported] == [person["id"] for person in response.json()]
+
+
+# dashboard
+
+def test_get_user_dashboard_matches_parts(admin_api_sqlite_client: TestClient,
+                                          admin_api_admin_user_headers: dict) -> None:
+    """The dashboard carries the same numbers as the individual summary endpoints"""
+    response = admin_api_sqlite_client.get(f"/v1/users/{TEST_USER_ID}/dashboard", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    dashboard = response.json()
+
+    def get(path: str):
+        part = admin_api_sqlite_client.get(path, headers=admin_api_admin_user_headers)
+        assert part.status_code == 200
+        return part.json()
+
+    assert dashboard["activity"] == get(f"/v1/users/{TEST_USER_ID}/activity-summary")
+    assert dashboard["documents"] == get(f"/v1/users/{TEST_USER_ID}/document-summary")
+    assert dashboard["ownership"] == get(f"/v1/paper_owners/user/{TEST_USER_ID}/summary")
+    assert dashboard["can_submit_to"] == get(f"/v1/users/{TEST_USER_ID}/can-submit-to")
+    assert dashboard["can_endorse_for"] == get(f"/v1/users/{TEST_USER_ID}/can-endorse-for")
+
+    # Served from the cache the second time
+    again = admin_api_sqlite_client.get(f"/v1/users/{TEST_USER_ID}/dashboard", headers=admin_api_admin_user_headers)
+    assert again.json() == dashboard
+
+
+def test_get_user_dashboard_not_found(admin_api_sqlite_client: TestClient,
+                                      admin_api_admin_user_headers: dict) -> None:
+    response = admin_api_sqlite_client.get("/v1/users/9999999/dashboard", headers=admin_api_admin_user_headers)
+    assert response.status_code == 404
+
+
+# endorsing categories
+
+def test_list_users_endorsing_categories(admin_api_sqlite_client: TestClient,
+                                         admin_api_admin_user_headers: dict,
+                                         monkeypatch: pytest.MonkeyPatch) -> None:
+    """Candidates are matched by user_id, not by their surrogate id, with or without the temporary table"""
+    from arxiv_admin_api import user as user_module
+    from arxiv_admin_api.endorsing.endorsing_models import EndorsementCandidate
+
+    def candidate(candidate_id: int, user_id: int) -> EndorsementCandidate:
+        return EndorsementCandidate(id=candidate_id, user_id=user_id, category="math.AG",
+                                    document_count=1, latest_document_id=1)
+
+    for extra in [0, user_module.ENDORSING_USER_IDS_IN_LIST_LIMIT + 1]:
+        # The surrogate id 1129053 is a user too - it must not match
+        candidates = [candidate(1129053, 1)] + [candidate(1, 900000000 + n) for n in range(extra)]
+        monkeypatch.setattr(user_module.endorsing_db, "endorsing_db_get_cached_db", lambda _request: None)
+        monkeypatch.setattr(user_module.endorsing_db, "endorsing_db_query_users_in_categories",
+                            lambda _engine, _categories: candidates)
+        response = admin_api_sqlite_client.get("/v1/users/?endorsing_categories=math.AG",
+                                               headers=admin_api_admin_user_headers)
+        assert response.status_code == 200
+        assert [person["id"] for person in response.json()] == [1]
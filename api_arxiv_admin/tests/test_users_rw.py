@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from arxiv.db.models import TapirAdminAudit, Demographic
 from fastapi.testclient import TestClient
+from sqlalchemy import insert, update
 
 
+from arxiv_admin_api.biz import user_changes as user_changes_module
 from arxiv_admin_api.user import UserCommentRequest, UserPropertyUpdateRequest, UserModel, UserVetoStatusRequest
 from arxiv_bizlogic.user_status import UserVetoStatus
 
@@ -143,3 +147,109 @@ def test_update_veto_status_no_change(admin_api_sqlite_client: TestClient,
                                            headers=admin_api_admin_user_headers)
     assert response.status_code == 208
 
+
+# bulk update
+
+def test_bulk_update_users(admin_api_sqlite_client: TestClient,
+                           admin_api_admin_user_headers,
+                           sqlite_session) -> None:
+    """Several changes in one request, one audit record per change, a result per change"""
+    with sqlite_session() as session:
+        audit_count_before = session.query(TapirAdminAudit).count()
+        demographic = session.query(Demographic).filter(Demographic.user_id == TEST_USER_ID).one()
+        flag_suspect = 1 if demographic.flag_suspect else 0
+        flag_group_test = 1 if demographic.flag_group_test else 0
+        country = demographic.country
+
+    response = admin_api_sqlite_client.patch("/v1/users/bulk", json={
+        "comment": "bulk test",
+        "updates": [
+            {"user_id": TEST_USER_ID, "property_name": "flag_suspect", "property_value": not flag_suspect},
+            {"user_id": TEST_USER_ID, "property_name": "flag_group_test", "property_value": not flag_group_test},
+            # No audit event
+            {"user_id": TEST_USER_ID, "property_name": "country", "property_value": "fr"},
+            {"user_id": TEST_USER_ID, "property_name": "password", "property_value": "nope"},
+            {"user_id": 9999999, "property_name": "flag_suspect", "property_value": True},
+        ]}, headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == ["updated", "updated", "invalid", "invalid", "not_found"]
+    assert data["updated_count"] == 2
+    assert data["audit_count"] == 2
+
+    with sqlite_session() as session:
+        assert session.query(TapirAdminAudit).count() == audit_count_before + 2
+        demographic = session.query(Demographic).filter(Demographic.user_id == TEST_USER_ID).one()
+        assert demographic.country == country
+        assert (1 if demographic.flag_suspect else 0) != flag_suspect
+        assert (1 if demographic.flag_group_test else 0) != flag_group_test
+
+
+def test_bulk_update_users_no_auth(admin_api_sqlite_client: TestClient) -> None:
+    response = admin_api_sqlite_client.patch("/v1/users/bulk", json={"updates": []})
+    assert response.status_code == 401
+
+# change feed
+
+def test_user_changes_feed(admin_api_sqlite_client: TestClient,
+                           admin_api_admin_user_headers,
+                           sqlite_session,
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changes made through the API show up after the watermark, once per user"""
+    from arxiv_admin_api.biz.user_changes import ensure_user_change_table
+    monkeypatch.setattr(user_changes_module, "SETTLE_SECONDS", 0)
+    with sqlite_session() as session:
+        ensure_user_change_table(session)
+        session.commit()
+
+    response = admin_api_sqlite_client.get("/v1/users/changes", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    since = response.json()["next_since"]
+
+    for country in ["de", "it"]:
+        body = UserPropertyUpdateRequest(property_name="country", property_value=country, comment=None)
+        response = admin_api_sqlite_client.put(f"/v1/users/{TEST_USER_ID}/demographic",
+                                               json=body.model_dump(), headers=admin_api_admin_user_headers)
+        assert response.status_code == 200
+
+    response = admin_api_sqlite_client.get(f"/v1/users/changes?since={since}", headers=admin_api_admin_user_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [change["user_id"] for change in data["changes"]] == [TEST_USER_ID]
+    assert data["next_since"] == since + 2
+    assert data["has_more"] is False
+
+    response = admin_api_sqlite_client.get(f"/v1/users/changes?since={data['next_since']}",
+                                           headers=admin_api_admin_user_headers)
+    assert response.json()["changes"] == []
+
+
+def test_user_changes_since_lower_id_commits_later(sqlite_session) -> None:
+    """A change committed after a higher change_id was written is not skipped"""
+    from arxiv_admin_api.biz.user_changes import (ensure_user_change_table, user_changes_table,
+                                                  latest_change_id, user_changes_since)
+    settled = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=user_changes_module.SETTLE_SECONDS + 10)
+    with sqlite_session() as session:
+        ensure_user_change_table(session)
+        since = latest_change_id(session)
+        # since + 2 commits first; since + 1 is still in its transaction
+        session.execute(insert(user_changes_table).values(
+            change_id=since + 2, user_id=2, changed_at=datetime.now(timezone.utc).replace(tzinfo=None)))
+        session.commit()
+        assert user_changes_since(session, since, 100) == ([], since, False)
+
+        # Until it settles, since + 2 also holds back the watermark for new consumers
+        assert latest_change_id(session) == since + 1
+
+        session.execute(insert(user_changes_table).values(change_id=since + 1, user_id=1, changed_at=settled))
+        session.commit()
+        changes, next_since, _has_more = user_changes_since(session, since, 100)
+        assert [user_id for _change_id, user_id, _changed_at in changes] == [1]
+        assert next_since == since + 1
+
+        session.execute(update(user_changes_table).where(user_changes_table.c.change_id == since + 2)
+                        .values(changed_at=settled))
+        session.commit()
+        changes, next_since, _has_more = user_changes_since(session, next_since, 100)
+        assert [user_id for _change_id, user_id, _changed_at in changes] == [2]
+        assert next_since == since + 2